@@ -0,0 +1,162 @@
+"""
+Benchmark the alias step of name resolution: resolve_alias_targets, a raw
+sqlite3 statement on the session's connection, against the same IN query
+built with the SQLAlchemy ORM.
+
+Usage:
+    python benchmarks/alias_resolution.py [--aliases N] [--iterations N]
+
+Prints JSON with the mean time per resolution, in microseconds, for:
+- orm_warm / sqlite3_warm: one identifier, on one open session
+- orm_batch / sqlite3_batch: ten identifiers at once, on one open session
+- orm_invocation / sqlite3_invocation: one identifier on a new engine and
+  session, as a single CLI invocation does
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+from sqlalchemy.orm import Session
+
+from slack_clacks.configuration.database import (
+    add_context,
+    get_engine,
+    get_session,
+    run_migrations,
+)
+from slack_clacks.rolodex.models import Alias
+from slack_clacks.rolodex.operations import import_aliases, resolve_alias_targets
+
+CONTEXT = "bench"
+
+
+def populate(config_dir: str, count: int) -> None:
+    engine = get_engine(config_dir=config_dir)
+    with engine.connect() as connection:
+        run_migrations(connection)
+    with Session(engine) as session:
+        add_context(
+            session,
+            name=CONTEXT,
+            access_token="fake-token",
+            user_id="U000000001",
+            workspace_id="T000000001",
+            app_type="clacks",
+        )
+        import_aliases(
+            session,
+            CONTEXT,
+            (
+                {"alias": f"user-{i}", "target_type": "user", "target_id": f"U{i:09d}"}
+                for i in range(count)
+            ),
+        )
+        session.commit()
+    engine.dispose()
+
+
+def orm_alias_targets(
+    session: Session, identifiers: list[str], context: str, target_type: str
+) -> dict[str, str]:
+    """resolve_alias_targets as an ORM query, for comparison."""
+    query = session.query(Alias.alias, Alias.target_id).filter(
+        Alias.context == context,
+        Alias.target_type == target_type,
+        Alias.alias.in_(set(identifiers)),
+        Alias.platform == "slack",
+    )
+    return {alias: target_id for alias, target_id in query}
+
+
+def mean_microseconds(run, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        run(i)
+    return round((time.perf_counter() - started) / iterations * 1e6, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--aliases", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    def names(i: int, count: int = 1) -> list[str]:
+        return [f"user-{((i + k) * 7919) % args.aliases}" for k in range(count)]
+
+    def check(targets: dict[str, str], count: int) -> None:
+        assert len(targets) == count
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        populate(config_dir, args.aliases)
+
+        def invocation(resolve):
+            def run(i: int) -> None:
+                with get_session(config_dir) as session:
+                    check(resolve(session, names(i), CONTEXT, "user"), 1)
+
+            return run
+
+        engine = get_engine(config_dir=config_dir)
+        with Session(engine) as session:
+            # Building an engine per lookup is slow; fewer iterations keep the
+            # run short.
+            invocations = max(args.iterations // 10, 1)
+            results = {
+                "aliases": args.aliases,
+                "orm_warm": mean_microseconds(
+                    lambda i: check(
+                        orm_alias_targets(session, names(i), CONTEXT, "user"), 1
+                    ),
+                    args.iterations,
+                ),
+                "sqlite3_warm": mean_microseconds(
+                    lambda i: check(
+                        resolve_alias_targets(
+                            session, names(i), CONTEXT, "user", "slack"
+                        ),
+                        1,
+                    ),
+                    args.iterations,
+                ),
+                "orm_batch": mean_microseconds(
+                    lambda i: check(
+                        orm_alias_targets(session, names(i, 10), CONTEXT, "user"),
+                        10,
+                    ),
+                    args.iterations,
+                ),
+                "sqlite3_batch": mean_microseconds(
+                    lambda i: check(
+                        resolve_alias_targets(
+                            session, names(i, 10), CONTEXT, "user", "slack"
+                        ),
+                        10,
+                    ),
+                    args.iterations,
+                ),
+                "orm_invocation": mean_microseconds(
+                    invocation(orm_alias_targets), invocations
+                ),
+                "sqlite3_invocation": mean_microseconds(
+                    invocation(
+                        lambda session, identifiers, context, target_type: (
+                            resolve_alias_targets(
+                                session, identifiers, context, target_type, "slack"
+                            )
+                        )
+                    ),
+                    invocations,
+                ),
+            }
+        engine.dispose()
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
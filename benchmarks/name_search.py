@@ -0,0 +1,135 @@
+"""
+Benchmark name search and "did you mean" suggestions over the trigram FTS5
+indexes in slack_clacks.rolodex.search.
+
+Usage:
+    python benchmarks/name_search.py [--entries N] [--iterations N]
+
+Fills the aliases, user directory and channel directory with N entries in
+total, then prints JSON with the mean time per call, in milliseconds, for:
+- substring: search_names for a fragment of an existing name
+- prefix_short: search_names for a two-character prefix
+- suggest_typo: suggest_names for a misspelled name
+- suggest_unknown: suggest_names for a name like nothing indexed
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+from itertools import batched
+
+from sqlalchemy.orm import Session
+
+from slack_clacks.configuration.database import add_context, get_engine, run_migrations
+from slack_clacks.rolodex.operations import (
+    import_aliases,
+    upsert_channel_directory,
+    upsert_user_directory,
+)
+from slack_clacks.rolodex.search import search_names, suggest_names
+
+CONTEXT = "bench"
+PAGE_SIZE = 1000
+
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12)))
+
+
+def populate(engine, count: int, rng: random.Random) -> list[str]:
+    third = count // 3
+    names = [f"{word(rng)}-{word(rng)}" for _ in range(count)]
+    with Session(engine) as session:
+        add_context(
+            session,
+            name=CONTEXT,
+            access_token="fake-token",
+            user_id="U000000001",
+            workspace_id="T000000001",
+            app_type="clacks",
+        )
+        import_aliases(
+            session,
+            CONTEXT,
+            (
+                {"alias": name, "target_type": "user", "target_id": f"U{i:09d}"}
+                for i, name in enumerate(names[:third])
+            ),
+        )
+        # Directory upserts take one users.list / conversations.list page
+        # at a time.
+        users = [
+            {"id": f"W{i:09d}", "name": name, "real_name": name.title()}
+            for i, name in enumerate(names[third : 2 * third])
+        ]
+        for page in batched(users, PAGE_SIZE):
+            upsert_user_directory(session, CONTEXT, list(page))
+        channels = [
+            {"id": f"C{i:09d}", "name": name}
+            for i, name in enumerate(names[2 * third :])
+        ]
+        for page in batched(channels, PAGE_SIZE):
+            upsert_channel_directory(session, CONTEXT, list(page))
+        session.commit()
+    return names
+
+
+def mean_milliseconds(run, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        run(i)
+    return round((time.perf_counter() - started) / iterations * 1e3, 3)
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    position = rng.randrange(1, len(name) - 1)
+    return name[:position] + name[position + 1 :]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as config_dir:
+        engine = get_engine(config_dir=config_dir)
+        with engine.connect() as connection:
+            run_migrations(connection)
+        names = populate(engine, args.entries, rng)
+        samples = [rng.choice(names) for _ in range(args.iterations)]
+        typos = [misspell(name, rng) for name in samples]
+
+        with Session(engine) as session:
+            results = {
+                "entries": args.entries,
+                "substring": mean_milliseconds(
+                    lambda i: search_names(session, samples[i][2:8], CONTEXT),
+                    args.iterations,
+                ),
+                "prefix_short": mean_milliseconds(
+                    lambda i: search_names(session, samples[i][:2], CONTEXT),
+                    args.iterations,
+                ),
+                "suggest_typo": mean_milliseconds(
+                    lambda i: suggest_names(session, typos[i], CONTEXT, "user"),
+                    args.iterations,
+                ),
+                "suggest_unknown": mean_milliseconds(
+                    lambda i: suggest_names(session, "zzqqxxjj", CONTEXT, "channel"),
+                    args.iterations,
+                ),
+            }
+        engine.dispose()
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""add aliases keyset index
+
+Revision ID: 4f2a8c6d9e1b
+Revises: e7d94b2a61c8
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a8c6d9e1b"
+down_revision: Union[str, Sequence[str], None] = "e7d94b2a61c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index aliases in listing order for keyset pagination."""
+    op.create_index(
+        "ix_aliases_context_alias",
+        "aliases",
+        ["context", "alias", "target_type"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the keyset pagination index."""
+    op.drop_index("ix_aliases_context_alias", table_name="aliases")
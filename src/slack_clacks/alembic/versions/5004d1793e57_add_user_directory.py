@@ -0,0 +1,67 @@
+"""add user directory
+
+Revision ID: 5004d1793e57
+Revises: 99ae13b5fc99
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5004d1793e57"
+down_revision: Union[str, Sequence[str], None] = "99ae13b5fc99"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create user_directory table with lookup indexes."""
+    op.create_table(
+        "user_directory",
+        sa.Column("context", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("real_name", sa.String(), nullable=True),
+        sa.Column("display_name", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["context"],
+            ["contexts.name"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "user_id"),
+    )
+    op.create_index(
+        "ix_user_directory_context_name",
+        "user_directory",
+        ["context", "name"],
+    )
+    op.create_index(
+        "ix_user_directory_context_real_name",
+        "user_directory",
+        ["context", "real_name"],
+    )
+    op.create_index(
+        "ix_user_directory_context_display_name",
+        "user_directory",
+        ["context", "display_name"],
+    )
+    op.create_index(
+        "ix_user_directory_context_email",
+        "user_directory",
+        ["context", "email"],
+    )
+
+
+def downgrade() -> None:
+    """Drop user_directory table."""
+    op.drop_index("ix_user_directory_context_email", table_name="user_directory")
+    op.drop_index("ix_user_directory_context_display_name", table_name="user_directory")
+    op.drop_index("ix_user_directory_context_real_name", table_name="user_directory")
+    op.drop_index("ix_user_directory_context_name", table_name="user_directory")
+    op.drop_table("user_directory")
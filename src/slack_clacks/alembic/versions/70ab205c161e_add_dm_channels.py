@@ -0,0 +1,39 @@
+"""add dm channels
+
+Revision ID: 70ab205c161e
+Revises: 8abcfd4a59e7
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "70ab205c161e"
+down_revision: Union[str, Sequence[str], None] = "8abcfd4a59e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create dm_channels table."""
+    op.create_table(
+        "dm_channels",
+        sa.Column("context", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("channel_id", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["context"],
+            ["contexts.name"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Drop dm_channels table."""
+    op.drop_table("dm_channels")
@@ -0,0 +1,40 @@
+"""add resolution misses
+
+Revision ID: 8abcfd4a59e7
+Revises: 5004d1793e57
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8abcfd4a59e7"
+down_revision: Union[str, Sequence[str], None] = "5004d1793e57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create resolution_misses table."""
+    op.create_table(
+        "resolution_misses",
+        sa.Column("context", sa.String(), nullable=False),
+        sa.Column("target_type", sa.String(), nullable=False),
+        sa.Column("identifier", sa.String(), nullable=False),
+        sa.Column("missed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["context"],
+            ["contexts.name"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "target_type", "identifier"),
+    )
+
+
+def downgrade() -> None:
+    """Drop resolution_misses table."""
+    op.drop_table("resolution_misses")
@@ -0,0 +1,62 @@
+"""add channel directory
+
+Revision ID: 99ae13b5fc99
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "99ae13b5fc99"
+down_revision: Union[str, Sequence[str], None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create channel_directory and directory_sync_state tables."""
+    op.create_table(
+        "channel_directory",
+        sa.Column("context", sa.String(), nullable=False),
+        sa.Column("channel_id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("channel_type", sa.String(), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["context"],
+            ["contexts.name"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "channel_id"),
+    )
+    op.create_index(
+        "ix_channel_directory_context_name",
+        "channel_directory",
+        ["context", "name"],
+    )
+    op.create_table(
+        "directory_sync_state",
+        sa.Column("context", sa.String(), nullable=False),
+        sa.Column("target_type", sa.String(), nullable=False),
+        sa.Column("cursor", sa.String(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["context"],
+            ["contexts.name"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "target_type"),
+    )
+
+
+def downgrade() -> None:
+    """Drop channel_directory and directory_sync_state tables."""
+    op.drop_table("directory_sync_state")
+    op.drop_index("ix_channel_directory_context_name", table_name="channel_directory")
+    op.drop_table("channel_directory")
@@ -0,0 +1,42 @@
+"""add listen checkpoints
+
+Revision ID: a7e3d5c9f1b8
+Revises: f2b7c9e1d4a6
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e3d5c9f1b8"
+down_revision: Union[str, Sequence[str], None] = "f2b7c9e1d4a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create listen_checkpoints table."""
+    op.create_table(
+        "listen_checkpoints",
+        sa.Column("context", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("channel_id", sa.String(), nullable=False),
+        sa.Column("thread_ts", sa.String(), nullable=False),
+        sa.Column("ts", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["context"],
+            ["contexts.name"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "name", "channel_id", "thread_ts"),
+    )
+
+
+def downgrade() -> None:
+    """Drop listen_checkpoints table."""
+    op.drop_table("listen_checkpoints")
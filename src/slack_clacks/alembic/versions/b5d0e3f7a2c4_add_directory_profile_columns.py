@@ -0,0 +1,56 @@
+"""add directory profile columns
+
+Revision ID: b5d0e3f7a2c4
+Revises: 4f2a8c6d9e1b
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d0e3f7a2c4"
+down_revision: Union[str, Sequence[str], None] = "4f2a8c6d9e1b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add profile and channel attribute columns to the directories."""
+    op.add_column(
+        "user_directory",
+        sa.Column(
+            "is_deleted", sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+    )
+    op.add_column(
+        "user_directory",
+        sa.Column("is_bot", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column("user_directory", sa.Column("title", sa.String(), nullable=True))
+    op.add_column("user_directory", sa.Column("timezone", sa.String(), nullable=True))
+    op.add_column(
+        "channel_directory", sa.Column("num_members", sa.Integer(), nullable=True)
+    )
+    op.add_column("channel_directory", sa.Column("topic", sa.String(), nullable=True))
+    op.add_column("channel_directory", sa.Column("purpose", sa.String(), nullable=True))
+    # Rows stored so far would be skipped for having an unchanged `updated`
+    # stamp, leaving the new columns empty. Forget the stamps and watermarks
+    # so that the next sync rewrites every row.
+    op.execute("UPDATE user_directory SET updated = NULL")
+    op.execute("UPDATE channel_directory SET updated = NULL")
+    op.execute("UPDATE directory_sync_state SET watermark = NULL")
+
+
+def downgrade() -> None:
+    """Drop profile and channel attribute columns from the directories."""
+    op.drop_column("channel_directory", "purpose")
+    op.drop_column("channel_directory", "topic")
+    op.drop_column("channel_directory", "num_members")
+    op.drop_column("user_directory", "timezone")
+    op.drop_column("user_directory", "title")
+    op.drop_column("user_directory", "is_bot")
+    op.drop_column("user_directory", "is_deleted")
@@ -0,0 +1,31 @@
+"""add sync_generation to aliases
+
+Revision ID: c3e1f0a9b7d2
+Revises: 70ab205c161e
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3e1f0a9b7d2"
+down_revision: Union[str, Sequence[str], None] = "70ab205c161e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add sync_generation column to aliases. NULL marks manual aliases."""
+    op.add_column(
+        "aliases",
+        sa.Column("sync_generation", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop sync_generation column from aliases."""
+    op.drop_column("aliases", "sync_generation")
@@ -0,0 +1,50 @@
+"""add github etags
+
+Revision ID: d8c1a6e4f0b3
+Revises: b5d0e3f7a2c4
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8c1a6e4f0b3"
+down_revision: Union[str, Sequence[str], None] = "b5d0e3f7a2c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create github_etags table."""
+    op.create_table(
+        "github_etags",
+        sa.Column("context", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("org", sa.String(), nullable=False),
+        sa.Column("target_type", sa.String(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=False),
+        sa.Column("next_url", sa.String(), nullable=True),
+        sa.Column("targets", sa.Text(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["context"],
+            ["contexts.name"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "url"),
+    )
+    op.create_index(
+        "ix_github_etags_context_org",
+        "github_etags",
+        ["context", "org", "target_type"],
+    )
+
+
+def downgrade() -> None:
+    """Drop github_etags table."""
+    op.drop_index("ix_github_etags_context_org", table_name="github_etags")
+    op.drop_table("github_etags")
@@ -0,0 +1,36 @@
+"""add directory updated watermarks
+
+Revision ID: e7d94b2a61c8
+Revises: c3e1f0a9b7d2
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7d94b2a61c8"
+down_revision: Union[str, Sequence[str], None] = "c3e1f0a9b7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add per-row updated stamps and a per-directory sync watermark."""
+    op.add_column("user_directory", sa.Column("updated", sa.Integer(), nullable=True))
+    op.add_column(
+        "channel_directory", sa.Column("updated", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "directory_sync_state", sa.Column("watermark", sa.Integer(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Drop updated stamps and sync watermark."""
+    op.drop_column("directory_sync_state", "watermark")
+    op.drop_column("channel_directory", "updated")
+    op.drop_column("user_directory", "updated")
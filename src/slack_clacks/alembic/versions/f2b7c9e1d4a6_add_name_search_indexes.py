@@ -0,0 +1,67 @@
+"""add name search indexes
+
+Revision ID: f2b7c9e1d4a6
+Revises: d8c1a6e4f0b3
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b7c9e1d4a6"
+down_revision: Union[str, Sequence[str], None] = "d8c1a6e4f0b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# FTS5 trigram indexes over the names rolodex search and "did you mean"
+# suggestions match against. Each is an external-content table keyed by the
+# source table's rowid and kept current by triggers.
+INDEXED_COLUMNS = {
+    "aliases": ["alias"],
+    "user_directory": ["name", "real_name", "display_name", "email"],
+    "channel_directory": ["name"],
+}
+
+
+def upgrade() -> None:
+    """Create trigram FTS5 indexes over alias and directory names."""
+    for table, columns in INDEXED_COLUMNS.items():
+        fts = f"{table}_fts"
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        insert = (
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values});"
+        )
+        delete = (
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+            f"VALUES ('delete', old.rowid, {old_values});"
+        )
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{column_list}, content='{table}', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN {insert} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN {delete} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {column_list} ON {table} "
+            f"BEGIN {delete} {insert} END"
+        )
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Drop the trigram FTS5 indexes and their triggers."""
+    for table in INDEXED_COLUMNS:
+        fts = f"{table}_fts"
+        for event in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER {fts}_{event}")
+        op.execute(f"DROP TABLE {fts}")
@@ -2,6 +2,7 @@
 Database initialization and management utilities.
 """
 
+import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator
@@ -80,6 +81,16 @@ def get_session(
         session.close()
 
 
+def get_sqlite_connection(session: Session) -> sqlite3.Connection:
+    """
+    The sqlite3 connection under the session's current transaction, for
+    statements where the ORM's per-statement overhead would dominate.
+    """
+    connection = session.connection().connection.driver_connection
+    assert isinstance(connection, sqlite3.Connection)
+    return connection
+
+
 def run_migrations(connection: Connection) -> None:
     """
     Run Alembic migrations programmatically to upgrade the database to the
@@ -184,8 +195,10 @@ def set_current_context(session: Session, context_name: str) -> CurrentContext:
     return current_context
 
 
-def list_contexts(session: Session, limit: int, offset: int) -> list[Context]:
-    """List contexts with pagination."""
+def list_contexts(
+    session: Session, limit: int | None = None, offset: int = 0
+) -> list[Context]:
+    """List contexts with pagination. Returns all contexts by default."""
     return (
         session.query(Context).order_by(Context.name).limit(limit).offset(offset).all()
     )
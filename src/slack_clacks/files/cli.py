@@ -22,7 +22,11 @@ from slack_clacks.files.operations import (
     get_file_info,
     list_files,
 )
-from slack_clacks.messaging.operations import resolve_channel_id, resolve_user_id
+from slack_clacks.messaging.operations import (
+    get_resolution_memo,
+    resolve_channel_id,
+    resolve_user_id,
+)
 from slack_clacks.upload.cli import generate_upload_parser
 
 
@@ -98,13 +102,16 @@ def handle_list(args: argparse.Namespace) -> None:
         client = create_client(context.access_token, context.app_type)
 
         # Resolve channel/user identifiers to IDs
+        memo = get_resolution_memo(context.name)
         channel_id = None
         if args.channel:
-            channel_id = resolve_channel_id(client, args.channel, session, context.name)
+            channel_id = resolve_channel_id(
+                client, args.channel, session, context.name, memo
+            )
 
         user_id = None
         if args.user:
-            user_id = resolve_user_id(client, args.user, session, context.name)
+            user_id = resolve_user_id(client, args.user, session, context.name, memo)
 
         result = list_files(
             client, channel=channel_id, user=user_id, limit=args.limit, page=args.page
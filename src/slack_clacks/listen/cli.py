@@ -5,6 +5,8 @@ CLI for listen command.
 import argparse
 import json
 import sys
+import time
+from typing import Any
 
 from slack_clacks.auth.client import create_client
 from slack_clacks.configuration.database import (
@@ -12,13 +14,40 @@ from slack_clacks.configuration.database import (
     get_current_context,
     get_session,
 )
-from slack_clacks.listen.operations import listen_channel
+from slack_clacks.listen.events_api import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    EventsAPIServer,
+    get_signing_secret,
+    listen_events_api,
+)
+from slack_clacks.listen.operations import (
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_REPLY_WINDOW,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    ListenTarget,
+    delete_old_thread_checkpoints,
+    listen_many,
+    load_checkpoints,
+    save_checkpoints,
+)
+from slack_clacks.listen.socket_mode import get_app_token, listen_socket_mode
 from slack_clacks.messaging.operations import (
+    get_resolution_memo,
+    is_message_link,
+    parse_message_link,
     resolve_channel_id,
     resolve_user_id,
 )
 
 
+def _target_key(target: ListenTarget) -> str:
+    """Status key for a target: the channel ID, or channel_id/thread_ts."""
+    if target.thread_ts:
+        return f"{target.channel_id}/{target.thread_ts}"
+    return target.channel_id
+
+
 def handle_listen(args: argparse.Namespace) -> None:
     ensure_db_updated(config_dir=args.config_dir)
     with get_session(args.config_dir) as session:
@@ -30,60 +59,188 @@ def handle_listen(args: argparse.Namespace) -> None:
 
         client = create_client(context.access_token, context.app_type)
 
-        # Resolve channel
-        channel_id = resolve_channel_id(client, args.channel, session, context.name)
+        memo = get_resolution_memo(context.name)
+
+        app_token = args.app_token or get_app_token()
+        if args.backend == "socket" and not app_token:
+            raise ValueError(
+                "--backend socket needs an app-level token (xapp-...): set "
+                "SLACK_APP_TOKEN or pass --app-token."
+            )
+        signing_secret = args.signing_secret or get_signing_secret()
+        if args.backend == "events" and not signing_secret:
+            raise ValueError(
+                "--backend events needs the app's signing secret: set "
+                "SLACK_SIGNING_SECRET or pass --signing-secret."
+            )
+
+        if args.with_replies and args.backend != "poll":
+            raise ValueError("--with-replies is only supported with --backend poll.")
+
+        if args.thread_ts and len(args.channels) > 1:
+            raise ValueError(
+                "--thread needs a single channel; pass thread links to listen to "
+                "several threads."
+            )
+
+        # Resolve channels; a message link targets that message's thread
+        targets: list[ListenTarget] = []
+        for channel in args.channels:
+            if is_message_link(channel):
+                link = parse_message_link(channel)
+                targets.append(ListenTarget(link.channel_id, link.thread_ts or link.ts))
+            else:
+                channel_id = resolve_channel_id(
+                    client, channel, session, context.name, memo
+                )
+                targets.append(ListenTarget(channel_id, args.thread_ts))
 
         # Resolve from_user if specified
         from_user_id: str | None = None
         if args.from_user:
             from_user_id = resolve_user_id(
-                client, args.from_user, session, context.name
+                client, args.from_user, session, context.name, memo
             )
 
-        messages_received = 0
+        # With a checkpoint, targets catch up from their saved position.
+        # New targets start from now, saved at once so that a restart
+        # catches up from here even if nothing arrives in the meantime.
+        # Threads whose parent has left the reply window are forgotten.
+        since: dict[ListenTarget, str] | None = None
+        positions: dict[ListenTarget, str] = {}
+        if args.checkpoint:
+            replies_since = str(time.time() - args.reply_window)
+            since = load_checkpoints(
+                session,
+                context.name,
+                args.checkpoint,
+                targets,
+                args.with_replies,
+                replies_since,
+            )
+            if args.with_replies:
+                delete_old_thread_checkpoints(
+                    session, context.name, args.checkpoint, targets, replies_since
+                )
+            if not args.include_history:
+                start_ts = str(time.time())
+                for target in targets:
+                    since.setdefault(target, start_ts)
+            save_checkpoints(session, context.name, args.checkpoint, since)
+            session.commit()
 
-        try:
-            for msg in listen_channel(
+        messages_received = 0
+        intervals: dict[ListenTarget, float] = {}
+        backend_status: dict[str, Any] = {"backend": args.backend}
+        poll_options: dict[str, Any] = {
+            "interval": args.interval,
+            "timeout": args.timeout,
+            "include_history": args.include_history,
+            "continuous": args.continuous,
+            "requests_per_minute": args.rate_limit,
+            "max_interval": args.max_interval if args.adaptive else None,
+            "intervals": intervals,
+            "since": since,
+            "positions": positions,
+        }
+        if args.backend == "socket":
+            assert app_token is not None
+            messages = listen_socket_mode(
+                client, app_token, targets, status=backend_status, **poll_options
+            )
+        elif args.backend == "events":
+            assert signing_secret is not None
+            server = EventsAPIServer(signing_secret, args.host, args.port)
+            print(
+                json.dumps({"status": "listening", "url": server.url}),
+                file=sys.stderr,
+            )
+            messages = listen_events_api(
                 client,
-                channel_id,
-                thread_ts=args.thread_ts,
-                interval=args.interval,
+                server,
+                targets,
                 timeout=args.timeout,
                 include_history=args.include_history,
                 continuous=args.continuous,
-            ):
-                # Filter by from_user if specified
-                if from_user_id and msg.get("user") != from_user_id:
-                    continue
+                requests_per_minute=args.rate_limit,
+                since=since,
+                positions=positions,
+                status=backend_status,
+            )
+        else:
+            messages = listen_many(
+                client,
+                targets,
+                with_replies=args.with_replies,
+                reply_window=args.reply_window,
+                **poll_options,
+            )
 
-                # Filter out bot messages unless --include-bots
+        try:
+            for msg in messages:
+                # Filter by from_user if specified, and out bot messages
+                # unless --include-bots
+                wanted = not from_user_id or msg.get("user") == from_user_id
                 if not args.include_bots:
                     if msg.get("bot_id") or msg.get("subtype") == "bot_message":
-                        continue
+                        wanted = False
 
-                messages_received += 1
-                line = json.dumps(msg)
-                args.outfile.write(line + "\n")
-                args.outfile.flush()
+                if wanted:
+                    messages_received += 1
+                    line = json.dumps(msg)
+                    args.outfile.write(line + "\n")
+                    args.outfile.flush()
+
+                # Checkpoint every message handled, written or filtered out
+                if args.checkpoint:
+                    save_checkpoints(session, context.name, args.checkpoint, positions)
+                    session.commit()
 
         except KeyboardInterrupt:
             pass
         finally:
+            if args.backend == "events":
+                server.server_close()
+            if args.checkpoint:
+                save_checkpoints(session, context.name, args.checkpoint, positions)
+                if args.with_replies:
+                    delete_old_thread_checkpoints(
+                        session,
+                        context.name,
+                        args.checkpoint,
+                        targets,
+                        str(time.time() - args.reply_window),
+                    )
+                session.commit()
             # Print final status to stderr
-            status = {"status": "stopped", "messages_received": messages_received}
+            status = {
+                "status": "stopped",
+                "messages_received": messages_received,
+                **backend_status,
+                # Effective poll interval per channel or thread
+                "intervals": {
+                    _target_key(target): round(seconds, 3)
+                    for target, seconds in intervals.items()
+                },
+            }
             print(json.dumps(status), file=sys.stderr)
 
 
 def generate_listen_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        description="Listen for new messages in a channel or thread",
+        description="Listen for new messages in channels or threads",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
     parser.add_argument(
-        "channel",
+        "channels",
+        metavar="channel",
+        nargs="+",
         type=str,
-        help="Channel name, ID, or alias (e.g., #general, C123456)",
+        help=(
+            "Channel names, IDs, or aliases (e.g., #general, C123456), or Slack "
+            "message links to listen to those threads"
+        ),
     )
     parser.add_argument(
         "-D",
@@ -113,7 +270,93 @@ def generate_listen_parser() -> argparse.ArgumentParser:
         "--interval",
         type=float,
         default=2.0,
-        help="Poll interval in seconds (default: 2.0)",
+        help="Poll interval per channel in seconds (default: 2.0)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["poll", "socket", "events"],
+        default="poll",
+        help=(
+            "poll: poll the Web API (default). socket: receive message events "
+            "over Socket Mode, falling back to polling if disconnected. events: "
+            "receive Events API callbacks on a local HTTP server"
+        ),
+    )
+    parser.add_argument(
+        "--app-token",
+        type=str,
+        help="App-level token for --backend socket (default: $SLACK_APP_TOKEN)",
+    )
+    parser.add_argument(
+        "--signing-secret",
+        type=str,
+        help="Signing secret for --backend events (default: $SLACK_SIGNING_SECRET)",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=DEFAULT_HOST,
+        help=f"Address for --backend events to listen on (default: {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port for --backend events to listen on (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help=(
+            "Back off exponentially while a channel is quiet, and return to "
+            "--interval when messages arrive"
+        ),
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=DEFAULT_MAX_INTERVAL,
+        help=(
+            "Longest poll interval with --adaptive, in seconds "
+            f"(default: {DEFAULT_MAX_INTERVAL:g})"
+        ),
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=DEFAULT_REQUESTS_PER_MINUTE,
+        help=(
+            "Most Slack API calls per minute across all channels "
+            f"(default: {DEFAULT_REQUESTS_PER_MINUTE:g})"
+        ),
+    )
+    parser.add_argument(
+        "--with-replies",
+        action="store_true",
+        help=(
+            "Also listen to replies in the channels' threads, polling only "
+            "threads with new replies (--backend poll only)"
+        ),
+    )
+    parser.add_argument(
+        "--reply-window",
+        metavar="SECONDS",
+        type=float,
+        default=DEFAULT_REPLY_WINDOW,
+        help=(
+            "With --with-replies, follow threads whose parent was posted within "
+            f"this many seconds (default: {DEFAULT_REPLY_WINDOW:g})"
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="NAME",
+        type=str,
+        help=(
+            "Save the last message handled per channel or thread under NAME, "
+            "and on restart catch up on everything since then before "
+            "listening live"
+        ),
     )
     parser.add_argument(
         "--include-history",
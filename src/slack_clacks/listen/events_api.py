@@ -0,0 +1,210 @@
+"""
+Events API backend for listen: message events pushed to a local HTTP server.
+
+For deployments where an ingress forwards Slack's Events API callbacks to
+this process. Every request's signature is checked against the app's
+signing secret, url_verification challenges are answered, and events Slack
+delivers again (after a slow or failed acknowledgement) are recognised by
+event_id and dropped.
+"""
+
+import http.server
+import json
+import os
+import queue
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any
+
+from slack_sdk import WebClient
+from slack_sdk.signature import SignatureVerifier
+
+from slack_clacks.listen.operations import (
+    DEFAULT_REQUESTS_PER_MINUTE,
+    IGNORED_SUBTYPES,
+    ListenTarget,
+    RateBudget,
+    catch_up,
+    delivered,
+    event_message,
+    event_target,
+)
+
+EVENTS_PATH = "/slack/events"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 3000
+# Event IDs remembered to recognise retries. Slack retries within minutes,
+# so this only has to cover the events of the last few minutes.
+SEEN_EVENT_LIMIT = 10000
+
+
+def get_signing_secret() -> str | None:
+    """Signing secret from SLACK_SIGNING_SECRET, or None if unset."""
+    return os.environ.get("SLACK_SIGNING_SECRET") or None
+
+
+class EventsAPIServer(http.server.ThreadingHTTPServer):
+    """
+    HTTP server receiving Events API callbacks at EVENTS_PATH. Verified
+    message events are put on `events`, once per event_id.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, signing_secret: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ):
+        self.verifier = SignatureVerifier(signing_secret)
+        self.events: queue.Queue[dict[str, Any]] = queue.Queue()
+        self.seen: OrderedDict[str, None] = OrderedDict()
+        self.duplicates = 0
+        self.lock = threading.Lock()
+        super().__init__((host, port), EventsAPIHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}{EVENTS_PATH}"
+
+    def first_delivery(self, event_id: str | None) -> bool:
+        """Record event_id, returning False if it was delivered before."""
+        if not event_id:
+            return True
+        with self.lock:
+            if event_id in self.seen:
+                self.duplicates += 1
+                return False
+            self.seen[event_id] = None
+            if len(self.seen) > SEEN_EVENT_LIMIT:
+                self.seen.popitem(last=False)
+            return True
+
+
+class EventsAPIHandler(http.server.BaseHTTPRequestHandler):
+    server: EventsAPIServer
+
+    def do_POST(self) -> None:
+        if urllib.parse.urlparse(self.path).path != EVENTS_PATH:
+            self._reply(404)
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            valid = self.server.verifier.is_valid_request(body, dict(self.headers))
+        except ValueError:
+            # Malformed timestamp header
+            valid = False
+        if not valid:
+            self._reply(401)
+            return
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._reply(400)
+            return
+
+        if payload.get("type") == "url_verification":
+            self._reply(200, {"challenge": payload.get("challenge")})
+            return
+
+        # Acknowledge first: Slack retries anything not answered in 3 seconds.
+        self._reply(200)
+        if payload.get("type") == "event_callback":
+            event = payload.get("event", {})
+            if self.server.first_delivery(payload.get("event_id")):
+                if event.get("type") == "message":
+                    self.server.events.put(event)
+
+    def _reply(self, status: int, body: Any = None) -> None:
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def listen_events_api(
+    client: WebClient,
+    server: EventsAPIServer,
+    targets: list[ListenTarget],
+    timeout: float | None = None,
+    include_history: int = 0,
+    continuous: bool = False,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    since: dict[ListenTarget, str] | None = None,
+    positions: dict[ListenTarget, str] | None = None,
+    status: dict[str, Any] | None = None,
+) -> Iterator[dict]:
+    """
+    Serve Events API callbacks on server and yield message events for the
+    targets as they arrive, in the same shape as listen_many. The server is
+    shut down when listening ends; closing it is left to the caller.
+
+    client is only used to fetch history and the backlog of targets in
+    `since`, which come first as in listen_many; events for messages yielded
+    there are skipped, and later events are yielded in the order they come.
+    positions is kept as in listen_many. If given, status is updated with
+    "backend" and, when listening ends, the number of "duplicate_events"
+    (retried deliveries) dropped.
+    """
+    unique = list(dict.fromkeys(targets))
+    wanted = set(unique)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    if status is None:
+        status = {}
+    status["backend"] = "events"
+
+    serving = threading.Thread(target=server.serve_forever, daemon=True)
+    serving.start()
+    try:
+        latest: dict[ListenTarget, str] = {} if positions is None else positions
+        backlog = {t: since[t] for t in unique if since and t in since}
+        if (
+            yield from catch_up(
+                client,
+                unique,
+                include_history,
+                backlog,
+                RateBudget(requests_per_minute),
+                latest,
+                continuous,
+            )
+        ):
+            return
+        # Callbacks are handled on concurrent threads, so events reach the
+        # queue in no particular order: only those the catch-up covered are
+        # skipped, not every event older than the latest yielded.
+        caught_up = dict(latest)
+
+        while True:
+            wait = None
+            if deadline is not None:
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    return
+            try:
+                event = server.events.get(timeout=wait)
+            except queue.Empty:
+                return
+
+            target = event_target(event, wanted)
+            if target is None or event.get("subtype") in IGNORED_SUBTYPES:
+                continue
+            if event.get("ts", "") <= caught_up.get(target, ""):
+                continue
+            yield delivered(event_message(event), target, latest)
+            # Exit after first message unless continuous mode
+            if not continuous:
+                return
+    finally:
+        server.shutdown()
+        status["duplicate_events"] = server.duplicates
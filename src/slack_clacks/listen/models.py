@@ -0,0 +1,29 @@
+"""
+SQLAlchemy models for listen.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from slack_clacks.configuration.models import Base
+
+
+class ListenCheckpoint(Base):
+    """
+    Timestamp of the last message a named listener delivered from a channel
+    (thread_ts "") or thread. Unique per (context, name, channel_id,
+    thread_ts).
+    """
+
+    __tablename__ = "listen_checkpoints"
+
+    context: Mapped[str] = mapped_column(
+        String, ForeignKey("contexts.name", ondelete="CASCADE"), primary_key=True
+    )
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    channel_id: Mapped[str] = mapped_column(String, primary_key=True)
+    thread_ts: Mapped[str] = mapped_column(String, primary_key=True, default="")
+    ts: Mapped[str] = mapped_column(String, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
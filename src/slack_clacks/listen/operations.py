@@ -2,16 +2,42 @@
 Core listen operations using Slack Web API.
 """
 
+import heapq
 import time
-from collections.abc import Iterator
-from datetime import datetime, timezone
+from collections.abc import Callable, Generator, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timezone
 from decimal import Decimal
 from typing import Any
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
 
 from slack_clacks.constants import SLACK_TS_EPSILON
+from slack_clacks.listen.models import ListenCheckpoint
+
+# conversations.history and conversations.replies are Tier 3 methods, which
+# Slack allows about 50 times a minute per workspace.
+DEFAULT_REQUESTS_PER_MINUTE = 50.0
+# Adaptive polling doubles a quiet target's interval after each empty poll.
+BACKOFF_FACTOR = 2.0
+DEFAULT_MAX_INTERVAL = 60.0
+# Page size of conversations.history and conversations.replies calls. Slack
+# recommends no more than 200.
+PAGE_SIZE = 200
+# With replies, threads whose parent was posted within this many seconds are
+# followed, and each channel's window is scanned for thread activity at most
+# this often.
+DEFAULT_REPLY_WINDOW = 86400.0
+REPLY_SCAN_INTERVAL = 60.0
+# Fields of a message event that conversations.history does not return;
+# dropped so pushed and polled messages have the same shape.
+EVENT_ONLY_FIELDS = ("channel", "channel_type", "event_ts")
+# Subtypes reporting changes to earlier messages rather than new ones.
+IGNORED_SUBTYPES = frozenset({"message_changed", "message_deleted", "message_replied"})
 
 
 def _call_with_backoff(
@@ -37,6 +63,355 @@ def _call_with_backoff(
     return None  # Should never reach here
 
 
+@dataclass(frozen=True)
+class ListenTarget:
+    """A channel to listen to, or one of its threads if thread_ts is set."""
+
+    channel_id: str
+    thread_ts: str | None = None
+
+
+class RateBudget:
+    """
+    Spaces API calls shared by several pollers so that together they make at
+    most requests_per_minute calls. Times are time.monotonic() values.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive.")
+        self.spacing = 60.0 / requests_per_minute
+        self.next_slot = 0.0
+
+    def reserve(self, not_before: float) -> float:
+        """Reserve the first call slot at or after not_before and return it."""
+        slot = max(not_before, self.next_slot)
+        self.next_slot = slot + self.spacing
+        return slot
+
+
+def _fetch_history(
+    client: WebClient, target: ListenTarget, limit: int
+) -> list[dict[str, Any]]:
+    """Last `limit` messages (or thread replies) of a target, oldest first."""
+    if target.thread_ts:
+        response = _call_with_backoff(
+            client.conversations_replies,
+            channel=target.channel_id,
+            ts=target.thread_ts,
+            limit=limit,
+        )
+        # The first message is the parent; replies follow oldest first.
+        return list(response.get("messages", []))[1:]
+    response = _call_with_backoff(
+        client.conversations_history, channel=target.channel_id, limit=limit
+    )
+    return list(reversed(response.get("messages", [])))
+
+
+def _pages(
+    client: WebClient,
+    target: ListenTarget,
+    oldest_ts: str,
+    budget: RateBudget | None = None,
+    broadcasts: bool = True,
+) -> Iterator[tuple[list[dict[str, Any]], bool]]:
+    """
+    Messages (or thread replies) of a target after oldest_ts, a page at a
+    time as each arrives, as (messages oldest first, more pages follow).
+    next_cursor is followed until has_more is false; each page after the
+    first is a call from budget, if given. Without broadcasts, replies also
+    sent to the channel are left out.
+    """
+    kwargs: dict[str, Any] = {
+        "channel": target.channel_id,
+        # Add epsilon to make oldest exclusive (Slack's oldest is inclusive)
+        "oldest": str(Decimal(oldest_ts) + SLACK_TS_EPSILON),
+        "limit": PAGE_SIZE,
+    }
+    method: Callable[..., Any] = client.conversations_history
+    if target.thread_ts:
+        method = client.conversations_replies
+        kwargs["ts"] = target.thread_ts
+
+    while True:
+        response = _call_with_backoff(method, **kwargs)
+        messages = [
+            m
+            for m in response.get("messages", [])
+            if m.get("ts") != target.thread_ts
+            and m.get("ts", "") > oldest_ts
+            and (broadcasts or m.get("subtype") != "thread_broadcast")
+        ]
+        messages.sort(key=lambda m: Decimal(m["ts"]))
+        cursor = (response.get("response_metadata") or {}).get("next_cursor")
+        more = bool(cursor) and response.get("has_more", True) is not False
+        yield messages, more
+        if not more:
+            return
+        kwargs["cursor"] = cursor
+        if budget is not None:
+            _wait_for_slot(budget)
+
+
+def _wait_for_slot(budget: RateBudget) -> None:
+    """Sleep until the next call slot of budget."""
+    time.sleep(max(0.0, budget.reserve(time.monotonic()) - time.monotonic()))
+
+
+def _fetch_since(
+    client: WebClient, target: ListenTarget, oldest_ts: str, budget: RateBudget
+) -> list[dict[str, Any]]:
+    """
+    Every message (or thread reply) of a target after oldest_ts, oldest
+    first, following next_cursor across pages. Each page is a call from
+    budget.
+    """
+    _wait_for_slot(budget)
+    messages = [
+        msg for page, _ in _pages(client, target, oldest_ts, budget) for msg in page
+    ]
+    messages.sort(key=lambda m: Decimal(m["ts"]))
+    return messages
+
+
+def _poll(
+    client: WebClient,
+    target: ListenTarget,
+    latest: dict[ListenTarget, str],
+    budget: RateBudget | None,
+    continuous: bool,
+    parents: list[dict[str, Any]] | None = None,
+    broadcasts: bool = True,
+) -> Generator[dict, None, int]:
+    """
+    Yield the messages of a target after latest[target], page by page as
+    they arrive, and return how many were yielded. Stops after the first
+    unless continuous. If given, parents collects every message fetched.
+    broadcasts is passed on to _pages.
+
+    Thread replies page forward in time, so latest[target] moves up with
+    each message. Channel history pages backward, newest page first: pages
+    with older ones still to come are yielded without moving latest[target],
+    which only jumps past them once the poll is drained, so a burst cut off
+    midway is fetched again rather than skipped. Without continuous, those
+    newer pages are passed over to reach the oldest new message.
+    """
+    oldest_ts = latest[target]
+    newest = oldest_ts
+    count = 0
+    for messages, more in _pages(client, target, oldest_ts, budget, broadcasts):
+        if parents is not None:
+            parents.extend(messages)
+        if more and target.thread_ts is None:
+            if not continuous:
+                continue
+            for msg in messages:
+                count += 1
+                newest = max(newest, msg["ts"])
+                yield _received(msg, target)
+            continue
+        for msg in messages:
+            count += 1
+            yield delivered(msg, target, latest)
+            # Exit after first message unless continuous mode
+            if not continuous:
+                return count
+    if newest > latest[target]:
+        latest[target] = newest
+    return count
+
+
+def _poll_replies(
+    client: WebClient,
+    channel: ListenTarget,
+    parents: list[dict[str, Any]],
+    latest: dict[ListenTarget, str],
+    saved: dict[ListenTarget, str],
+    start: str,
+    skip: set[ListenTarget],
+    budget: RateBudget | None,
+    continuous: bool,
+) -> Generator[dict, None, int]:
+    """
+    Yield the new replies of the channel's threads whose latest_reply (in
+    parents) is past the last reply yielded from them, and return how many
+    were yielded. Only those threads are polled, each a call from budget;
+    threads in skip are listened to separately. A thread first seen starts
+    from its position in saved, else from start. Replies also sent to the
+    channel come with the channel's messages instead.
+    """
+    count = 0
+    for parent in parents:
+        latest_reply = parent.get("latest_reply")
+        thread = ListenTarget(channel.channel_id, parent["ts"])
+        if not latest_reply or thread in skip:
+            continue
+        position = latest.get(thread) or saved.get(thread, start)
+        if latest_reply <= position:
+            continue
+        latest[thread] = position
+        if budget is not None:
+            _wait_for_slot(budget)
+        count += yield from _poll(
+            client, thread, latest, budget, continuous, broadcasts=False
+        )
+        # Exit after first message unless continuous mode
+        if count and not continuous:
+            break
+        # Drained: latest_reply was seen, even if it was a broadcast
+        if latest_reply > latest[thread]:
+            latest[thread] = latest_reply
+    return count
+
+
+def _forget_old_threads(
+    latest: dict[ListenTarget, str],
+    channel: ListenTarget,
+    window_start: str,
+    keep: set[ListenTarget],
+) -> None:
+    """
+    Drop the positions of the channel's threads whose parent was posted
+    before window_start, as their replies are no longer followed, unless
+    they are in keep.
+    """
+    oldest = Decimal(window_start)
+    for thread in [
+        target
+        for target in latest
+        if target.thread_ts
+        and target.channel_id == channel.channel_id
+        and target not in keep
+        and Decimal(target.thread_ts) < oldest
+    ]:
+        del latest[thread]
+
+
+def _next_interval(
+    current: float, floor: float, ceiling: float | None, received: bool
+) -> float:
+    """
+    Interval before a target's next poll. Fixed at floor unless ceiling is
+    set; then it backs off exponentially while the target is idle, up to
+    ceiling, and snaps back to floor when messages arrive.
+    """
+    if ceiling is None or received:
+        return floor
+    return min(max(current * BACKOFF_FACTOR, floor), max(ceiling, floor))
+
+
+def _received(message: dict[str, Any], target: ListenTarget) -> dict[str, Any]:
+    message["channel_id"] = target.channel_id
+    message["received_at"] = datetime.now(timezone.utc).isoformat()
+    return message
+
+
+def event_target(
+    event: dict[str, Any], targets: set[ListenTarget]
+) -> ListenTarget | None:
+    """
+    The target a message event belongs to, matching what polling would
+    return: thread replies go to their thread, and to the channel only when
+    also sent to the channel.
+    """
+    channel_id = event.get("channel", "")
+    thread_ts = event.get("thread_ts")
+    if thread_ts and thread_ts != event.get("ts"):
+        thread = ListenTarget(channel_id, thread_ts)
+        if thread in targets:
+            return thread
+        if event.get("subtype") != "thread_broadcast":
+            return None
+    channel = ListenTarget(channel_id)
+    return channel if channel in targets else None
+
+
+def event_message(event: dict[str, Any]) -> dict[str, Any]:
+    """A pushed message event in the shape conversations.history returns."""
+    return {k: v for k, v in event.items() if k not in EVENT_ONLY_FIELDS}
+
+
+def delivered(
+    message: dict[str, Any], target: ListenTarget, latest: dict[ListenTarget, str]
+) -> dict[str, Any]:
+    """
+    A message tagged as received from target, first moving latest[target]
+    up to the message's ts.
+    """
+    if message["ts"] > latest.get(target, ""):
+        latest[target] = message["ts"]
+    return _received(message, target)
+
+
+def _oldest_first(
+    batches: Iterable[tuple[ListenTarget, list[dict[str, Any]]]],
+) -> list[tuple[ListenTarget, dict[str, Any]]]:
+    """Messages of several targets merged into one list, oldest first."""
+    merged = [(target, msg) for target, messages in batches for msg in messages]
+    merged.sort(key=lambda item: Decimal(item[1]["ts"]))
+    return merged
+
+
+def _merged_history(
+    client: WebClient,
+    targets: list[ListenTarget],
+    limit: int,
+    budget: RateBudget,
+) -> list[tuple[ListenTarget, dict[str, Any]]]:
+    """Last `limit` messages of each target, oldest first, fetched in budget."""
+
+    def batches() -> Iterator[tuple[ListenTarget, list[dict[str, Any]]]]:
+        for target in targets:
+            _wait_for_slot(budget)
+            yield target, _fetch_history(client, target, limit)
+
+    return _oldest_first(batches())
+
+
+def _merged_backlog(
+    client: WebClient, since: dict[ListenTarget, str], budget: RateBudget
+) -> list[tuple[ListenTarget, dict[str, Any]]]:
+    """Every message of each target after its since timestamp, oldest first."""
+    return _oldest_first(
+        (target, _fetch_since(client, target, ts, budget))
+        for target, ts in since.items()
+    )
+
+
+def catch_up(
+    client: WebClient,
+    targets: list[ListenTarget],
+    include_history: int,
+    backlog: dict[ListenTarget, str],
+    budget: RateBudget,
+    latest: dict[ListenTarget, str],
+    continuous: bool,
+) -> Generator[dict, None, bool]:
+    """
+    Yield what comes before live messages: the history of targets not in
+    backlog (if include_history), then every message of the backlog targets
+    after their timestamps. Returns True if it stopped at the first backlog
+    message because continuous is off.
+    """
+    if include_history > 0:
+        history_targets = [target for target in targets if target not in backlog]
+        for target, msg in _merged_history(
+            client, history_targets, include_history, budget
+        ):
+            yield delivered(msg, target, latest)
+
+    for target, ts in backlog.items():
+        if ts > latest.get(target, ""):
+            latest[target] = ts
+    for target, msg in _merged_backlog(client, backlog, budget):
+        yield delivered(msg, target, latest)
+        # Exit after first message unless continuous mode
+        if not continuous:
+            return True
+    return False
+
+
 def listen_channel(
     client: WebClient,
     channel_id: str,
@@ -45,6 +420,8 @@ def listen_channel(
     timeout: float | None = None,
     include_history: int = 0,
     continuous: bool = False,
+    max_interval: float | None = None,
+    intervals: dict[ListenTarget, float] | None = None,
 ) -> Iterator[dict]:
     """
     Yield new messages as they appear in channel or thread.
@@ -58,51 +435,28 @@ def listen_channel(
         include_history: Include last N messages on start (default: 0)
         continuous: If False (default), exit after yielding first new message.
                    If True, keep listening indefinitely.
+        max_interval: If set, poll adaptively: double the interval after each
+                   empty poll, up to max_interval, and drop back to interval
+                   when messages arrive (default: None = fixed interval)
+        intervals: If given, updated with the target's current poll interval
 
     Yields:
-        Message dicts with 'received_at' ISO timestamp added
+        Message dicts with 'channel_id' and 'received_at' ISO timestamp added
     """
+    target = ListenTarget(channel_id, thread_ts)
+    current_interval = interval
+    if intervals is not None:
+        intervals[target] = current_interval
     start_time = time.monotonic()
-    latest_ts: str | None = None
+    latest: dict[ListenTarget, str] = {}
 
     # Fetch history if requested
     if include_history > 0:
-        messages: list[Any]
-        if thread_ts:
-            response = _call_with_backoff(
-                client.conversations_replies,
-                channel=channel_id,
-                ts=thread_ts,
-                limit=include_history,
-            )
-            messages = response.get("messages", [])
-            # First message is parent, rest are replies
-            if len(messages) > 1:
-                messages = messages[1:]  # Skip parent
-            else:
-                messages = []
-        else:
-            response = _call_with_backoff(
-                client.conversations_history,
-                channel=channel_id,
-                limit=include_history,
-            )
-            messages = response.get("messages", [])
-
-        # Messages come in reverse chronological order, reverse to chronological
-        messages = list(reversed(messages))
-
-        for msg in messages:
-            msg["received_at"] = datetime.now(timezone.utc).isoformat()
-            yield msg
-            # Track latest timestamp seen
-            msg_ts = msg.get("ts")
-            if msg_ts and (latest_ts is None or msg_ts > latest_ts):
-                latest_ts = msg_ts
+        for msg in _fetch_history(client, target, include_history):
+            yield delivered(msg, target, latest)
 
     # If no history fetched, start from now
-    if latest_ts is None:
-        latest_ts = str(time.time())
+    latest.setdefault(target, str(time.time()))
 
     # Poll for new messages
     while True:
@@ -111,46 +465,221 @@ def listen_channel(
             if elapsed >= timeout:
                 break
 
-        time.sleep(interval)
+        time.sleep(current_interval)
 
-        # Add epsilon to make oldest exclusive (Slack's oldest is inclusive)
-        exclusive_oldest = str(Decimal(latest_ts) + SLACK_TS_EPSILON)
-
-        if thread_ts:
-            response = _call_with_backoff(
-                client.conversations_replies,
-                channel=channel_id,
-                ts=thread_ts,
-                oldest=exclusive_oldest,
-            )
-            messages = response.get("messages", [])
-            # Filter out parent and already-seen messages
-            messages = [
-                m
-                for m in messages
-                if m.get("ts") != thread_ts and m.get("ts", "") > latest_ts
-            ]
-        else:
-            response = _call_with_backoff(
-                client.conversations_history,
-                channel=channel_id,
-                oldest=exclusive_oldest,
+        received = yield from _poll(client, target, latest, None, continuous)
+        # Exit after first message unless continuous mode
+        if received and not continuous:
+            return
+        current_interval = _next_interval(
+            current_interval, interval, max_interval, received > 0
+        )
+        if intervals is not None:
+            intervals[target] = current_interval
+
+
+def listen_many(
+    client: WebClient,
+    targets: list[ListenTarget],
+    interval: float = 2.0,
+    timeout: float | None = None,
+    include_history: int = 0,
+    continuous: bool = False,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    max_interval: float | None = None,
+    intervals: dict[ListenTarget, float] | None = None,
+    since: dict[ListenTarget, str] | None = None,
+    positions: dict[ListenTarget, str] | None = None,
+    with_replies: bool = False,
+    reply_window: float = DEFAULT_REPLY_WINDOW,
+) -> Iterator[dict]:
+    """
+    Yield new messages from many channels and threads as they appear, as one
+    stream, polling them all from this thread.
+
+    Each target is polled at most every `interval` seconds, and all polls
+    share one RateBudget of `requests_per_minute`, so many targets slow each
+    other down instead of getting rate limited. The target due soonest is
+    polled next. A poll follows next_cursor until the target is drained,
+    yielding each page as it arrives (see _poll); every further page takes
+    a call from the budget. With max_interval, each target's interval backs
+    off separately while it is quiet.
+
+    Targets in `since` first catch up on every message after that timestamp,
+    page by page; the rest yield their history (if requested). Either way
+    these come first, merged oldest first across targets.
+
+    If given, positions holds each target's latest timestamp delivered or
+    polled past, and is updated before each message is yielded, so that
+    saving it as the message is handled never skips a message.
+
+    With with_replies, channels also yield new replies in their threads.
+    Every REPLY_SCAN_INTERVAL seconds a channel's messages of the last
+    reply_window seconds are fetched again for their latest_reply, and only
+    threads whose latest_reply has moved since are polled for replies (see
+    _poll_replies), so the cost follows thread activity rather than the
+    number of threads. Replies to threads started by new messages are
+    picked up at every poll. A thread's position is kept in positions until
+    its parent is older than reply_window, and threads in `since` resume
+    from there; others start from their channel's starting point.
+
+    Args mirror listen_channel. Yields message dicts with 'channel_id' and
+    'received_at' added.
+    """
+    unique = list(dict.fromkeys(targets))
+    budget = RateBudget(requests_per_minute)
+    start_time = time.monotonic()
+    deadline = start_time + timeout if timeout is not None else None
+    latest: dict[ListenTarget, str] = {} if positions is None else positions
+    if intervals is None:
+        intervals = {}
+    for target in unique:
+        intervals[target] = interval
+    backlog = {target: since[target] for target in unique if since and target in since}
+    started_ts = str(time.time())
+    reply_start = {target: backlog.get(target, started_ts) for target in unique}
+    wanted = set(unique)
+    next_scan: dict[ListenTarget, float] = {}
+    if (
+        yield from catch_up(
+            client, unique, include_history, backlog, budget, latest, continuous
+        )
+    ):
+        return
+
+    # Targets without history or a backlog start from now
+    now_ts = str(time.time())
+    for target in unique:
+        latest.setdefault(target, now_ts)
+
+    due = [(start_time + interval, index) for index in range(len(unique))]
+    heapq.heapify(due)
+    while due:
+        not_before, index = heapq.heappop(due)
+        slot = budget.reserve(not_before)
+        if deadline is not None and slot >= deadline:
+            break
+        time.sleep(max(0.0, slot - time.monotonic()))
+
+        target = unique[index]
+        parents: list[dict[str, Any]] | None = None
+        if with_replies and target.thread_ts is None:
+            parents = []
+        received = yield from _poll(client, target, latest, budget, continuous, parents)
+        if parents is not None and (continuous or not received):
+            window_start = str(time.time() - reply_window)
+            _forget_old_threads(latest, target, window_start, wanted)
+            # New messages carry their own reply counts; older parents in
+            # the window are rescanned only every REPLY_SCAN_INTERVAL.
+            if time.monotonic() >= next_scan.get(target, 0.0):
+                next_scan[target] = time.monotonic() + REPLY_SCAN_INTERVAL
+                parents += _fetch_since(client, target, window_start, budget)
+            received += yield from _poll_replies(
+                client,
+                target,
+                parents,
+                latest,
+                since or {},
+                reply_start[target],
+                set(unique),
+                budget,
+                continuous,
             )
-            messages = response.get("messages", [])
-            # Filter already-seen messages (defensive deduplication)
-            messages = [m for m in messages if m.get("ts", "") > latest_ts]
+        # Exit after first message unless continuous mode
+        if received and not continuous:
+            return
+        intervals[target] = _next_interval(
+            intervals[target], interval, max_interval, received > 0
+        )
+        heapq.heappush(due, (time.monotonic() + intervals[target], index))
 
-        # Messages come in reverse chronological order, reverse to chronological
-        messages = list(reversed(messages))
 
-        for msg in messages:
-            msg["received_at"] = datetime.now(timezone.utc).isoformat()
-            yield msg
-            # Track latest timestamp seen
-            msg_ts = msg.get("ts")
-            if msg_ts and (latest_ts is None or msg_ts > latest_ts):
-                latest_ts = msg_ts
+def load_checkpoints(
+    session: Session,
+    context: str,
+    name: str,
+    targets: list[ListenTarget],
+    with_replies: bool = False,
+    replies_since: str | None = None,
+) -> dict[ListenTarget, str]:
+    """
+    Saved timestamps of the targets that have one in checkpoint `name`.
+    With with_replies, also those of threads in the channel targets, leaving
+    out threads whose parent was posted before replies_since (if given).
+    """
+    wanted = set(targets)
+    checkpoints: dict[ListenTarget, str] = {}
+    for row in session.query(ListenCheckpoint).filter(
+        ListenCheckpoint.context == context, ListenCheckpoint.name == name
+    ):
+        target = ListenTarget(row.channel_id, row.thread_ts or None)
+        if target in wanted or (
+            with_replies
+            and target.thread_ts
+            and ListenTarget(row.channel_id) in wanted
+            and (replies_since is None or row.thread_ts >= replies_since)
+        ):
+            checkpoints[target] = row.ts
+    return checkpoints
 
-            # Exit after first message unless continuous mode
-            if not continuous:
-                return
+
+def delete_old_thread_checkpoints(
+    session: Session,
+    context: str,
+    name: str,
+    targets: list[ListenTarget],
+    replies_since: str,
+) -> int:
+    """
+    Delete the saved timestamps, in checkpoint `name`, of threads in the
+    channel targets whose parent was posted before replies_since, as
+    listening with replies no longer follows them. Threads that are targets
+    themselves are kept. Returns the number of rows deleted.
+    """
+    channels = [target.channel_id for target in targets if not target.thread_ts]
+    if not channels:
+        return 0
+    kept = [(t.channel_id, t.thread_ts) for t in targets if t.thread_ts]
+    query = session.query(ListenCheckpoint).filter(
+        ListenCheckpoint.context == context,
+        ListenCheckpoint.name == name,
+        ListenCheckpoint.channel_id.in_(channels),
+        ListenCheckpoint.thread_ts != "",
+        ListenCheckpoint.thread_ts < replies_since,
+    )
+    if kept:
+        query = query.filter(
+            tuple_(ListenCheckpoint.channel_id, ListenCheckpoint.thread_ts).not_in(kept)
+        )
+    return query.delete(synchronize_session=False)
+
+
+def save_checkpoints(
+    session: Session, context: str, name: str, positions: dict[ListenTarget, str]
+) -> None:
+    """
+    Save the timestamps of targets in checkpoint `name`. A saved timestamp
+    only ever moves forward.
+    """
+    if not positions:
+        return
+    updated_at = datetime.now(UTC).replace(tzinfo=None)
+    stmt = insert(ListenCheckpoint).values(
+        [
+            {
+                "context": context,
+                "name": name,
+                "channel_id": target.channel_id,
+                "thread_ts": target.thread_ts or "",
+                "ts": ts,
+                "updated_at": updated_at,
+            }
+            for target, ts in positions.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["context", "name", "channel_id", "thread_ts"],
+        set_={"ts": stmt.excluded.ts, "updated_at": stmt.excluded.updated_at},
+        where=stmt.excluded.ts > ListenCheckpoint.ts,
+    )
+    session.execute(stmt)
@@ -0,0 +1,197 @@
+"""
+Socket Mode backend for listen: message events pushed over a websocket.
+
+A Socket Mode app receives its Events API events over a websocket opened
+with an app-level token (xapp-...), so messages arrive as soon as they are
+posted and cost no Tier 3 calls. The app must subscribe to the message.*
+events for the conversations being listened to.
+
+If the connection cannot be opened, or drops, listen falls back to polling
+from the last message seen on each target, so messages posted in between
+are not missed.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackClientError
+from slack_sdk.socket_mode.builtin import SocketModeClient
+from slack_sdk.socket_mode.request import SocketModeRequest
+from slack_sdk.socket_mode.response import SocketModeResponse
+
+from slack_clacks.listen.operations import (
+    DEFAULT_REQUESTS_PER_MINUTE,
+    IGNORED_SUBTYPES,
+    ListenTarget,
+    RateBudget,
+    catch_up,
+    delivered,
+    event_message,
+    event_target,
+    listen_many,
+)
+
+# How often, in seconds, the listener checks that the connection is up.
+CONNECTION_CHECK_INTERVAL = 0.5
+# Messages remembered to recognise repeated events. Repeats and out-of-order
+# events arrive close together, so only the most recent few are kept.
+SEEN_MESSAGE_LIMIT = 10000
+
+
+def get_app_token() -> str | None:
+    """App-level token from SLACK_APP_TOKEN, or None if unset."""
+    return os.environ.get("SLACK_APP_TOKEN") or None
+
+
+def listen_socket_mode(
+    client: WebClient,
+    app_token: str,
+    targets: list[ListenTarget],
+    interval: float = 2.0,
+    timeout: float | None = None,
+    include_history: int = 0,
+    continuous: bool = False,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    max_interval: float | None = None,
+    intervals: dict[ListenTarget, float] | None = None,
+    since: dict[ListenTarget, str] | None = None,
+    positions: dict[ListenTarget, str] | None = None,
+    status: dict[str, Any] | None = None,
+) -> Iterator[dict]:
+    """
+    Yield new messages from channels and threads as Socket Mode delivers
+    them, in the same shape as listen_many.
+
+    Once connected, history and the backlog of targets in `since` are
+    fetched as in listen_many, and events for messages already yielded are
+    skipped; live events may arrive out of order, and are yielded as they
+    come. Every envelope is acknowledged. If the connection cannot be
+    opened or is lost, listening continues with listen_many from the latest
+    message seen on each target (or from when the connection opened). The
+    polling args, and positions, are passed on to it.
+
+    If given, status is updated with "backend" ("socket", then "poll"
+    after a fallback) and "fallback_reason".
+    """
+    unique = list(dict.fromkeys(targets))
+    wanted = set(unique)
+    start_time = time.monotonic()
+    deadline = start_time + timeout if timeout is not None else None
+    if status is None:
+        status = {}
+
+    # Message events, or None when the connection closes
+    events: queue.Queue[dict[str, Any] | None] = queue.Queue()
+
+    def on_request(socket_client: Any, request: SocketModeRequest) -> None:
+        socket_client.send_socket_mode_response(
+            SocketModeResponse(envelope_id=request.envelope_id)
+        )
+        if request.type == "events_api":
+            event = request.payload.get("event", {})
+            if event.get("type") == "message":
+                events.put(event)
+
+    socket_client = SocketModeClient(
+        app_token,
+        web_client=client,
+        auto_reconnect_enabled=False,
+        on_close_listeners=[lambda code, reason: events.put(None)],
+    )
+    socket_client.socket_mode_request_listeners.append(on_request)
+
+    connected_at = str(time.time())
+    latest: dict[ListenTarget, str] = {} if positions is None else positions
+    try:
+        try:
+            socket_client.connect()
+        except (SlackClientError, OSError) as e:
+            status.update(backend="poll", fallback_reason=str(e))
+        if not socket_client.is_connected():
+            status.setdefault("fallback_reason", "connection failed")
+            status["backend"] = "poll"
+            fallback_since, fallback_history = since, include_history
+        else:
+            status["backend"] = "socket"
+            # Fetched after connecting, so nothing falls in between; events
+            # for messages yielded here are skipped below.
+            backlog = {t: since[t] for t in unique if since and t in since}
+            if (
+                yield from catch_up(
+                    client,
+                    unique,
+                    include_history,
+                    backlog,
+                    RateBudget(requests_per_minute),
+                    latest,
+                    continuous,
+                )
+            ):
+                return
+            # The client's listener threads hand events over in whatever
+            # order they finish, so events are not compared with the latest
+            # message seen: only those the catch-up covered, and repeats,
+            # are skipped.
+            caught_up = dict(latest)
+            seen: OrderedDict[tuple[ListenTarget, str], None] = OrderedDict()
+
+            while True:
+                wait = CONNECTION_CHECK_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return
+                try:
+                    event = events.get(timeout=wait)
+                except queue.Empty:
+                    event = None
+                if event is None:
+                    if socket_client.is_connected():
+                        continue
+                    status.update(backend="poll", fallback_reason="disconnected")
+                    break
+
+                target = event_target(event, wanted)
+                if target is None or event.get("subtype") in IGNORED_SUBTYPES:
+                    continue
+                ts = event.get("ts", "")
+                if ts <= caught_up.get(target, "") or (target, ts) in seen:
+                    continue
+                seen[(target, ts)] = None
+                if len(seen) > SEEN_MESSAGE_LIMIT:
+                    seen.popitem(last=False)
+                yield delivered(event_message(event), target, latest)
+                # Exit after first message unless continuous mode
+                if not continuous:
+                    return
+            fallback_since = {t: latest.get(t, connected_at) for t in unique}
+            fallback_history = 0
+
+        # Stop reading the dead connection; the client's worker threads are
+        # shut down only once listening ends.
+        socket_client.disconnect()
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        yield from listen_many(
+            client,
+            unique,
+            interval=interval,
+            timeout=remaining,
+            include_history=fallback_history,
+            continuous=continuous,
+            requests_per_minute=requests_per_minute,
+            max_interval=max_interval,
+            intervals=intervals,
+            since=fallback_since,
+            positions=latest,
+        )
+    finally:
+        # close() waits for the client's reader to time out of recv (up to
+        # three seconds), so it runs in the background rather than delaying
+        # the caller.
+        threading.Thread(target=socket_client.close, daemon=True).start()
@@ -13,10 +13,14 @@ from slack_clacks.configuration.database import (
 )
 from slack_clacks.constants import SLACK_TS_EPSILON
 from slack_clacks.messaging.operations import (
+    MessageLink,
     add_reaction,
     delete_message,
     get_recent_activity,
+    get_resolution_memo,
+    is_message_link,
     open_dm_channel,
+    parse_message_link,
     parse_schedule_time,
     parse_timestamp,
     read_messages,
@@ -31,22 +35,76 @@ from slack_clacks.messaging.operations import (
 )
 
 
+def _check_link_channel(
+    link: MessageLink | None, channel_id: str, identifier: str
+) -> None:
+    """Raise if a message link points into another channel than channel_id."""
+    if link is not None and link.channel_id != channel_id:
+        raise ValueError(
+            f"'{identifier}' ({channel_id}) is not the channel of the message "
+            f"link ({link.channel_id}); pass only one of them."
+        )
+
+
 def _resolve_target_channel(
     client: Any,
     args: argparse.Namespace,
     session: Any,
     context_name: str,
+    link: MessageLink | None = None,
+    check_deliverable: bool = False,
 ) -> str:
+    """
+    Channel ID for --channel, --user (opening the DM) or a message link. With
+    check_deliverable, archived channels and deactivated users are rejected
+    before any message is sent (see check_message_target). A --channel or
+    --user naming a different conversation than the link is rejected, since
+    the link's timestamp would be used in the wrong one.
+    """
+    from slack_clacks.rolodex.operations import check_message_target
+
+    memo = get_resolution_memo(context_name)
     if getattr(args, "channel", None):
-        return resolve_channel_id(client, args.channel, session, context_name)
+        channel_id = resolve_channel_id(
+            client, args.channel, session, context_name, memo
+        )
+        _check_link_channel(link, channel_id, args.channel)
     elif getattr(args, "user", None):
-        user_id = resolve_user_id(client, args.user, session, context_name)
-        channel_id = open_dm_channel(client, user_id)
-        if channel_id is None:
+        user_id = resolve_user_id(client, args.user, session, context_name, memo)
+        if check_deliverable:
+            check_message_target(session, client, context_name, user_id=user_id)
+        dm_channel_id = open_dm_channel(client, user_id, session, context_name, memo)
+        if dm_channel_id is None:
             raise ValueError(f"Failed to open DM with user '{args.user}'.")
-        return channel_id
+        _check_link_channel(link, dm_channel_id, args.user)
+        return dm_channel_id
+    elif link is not None:
+        # The permalink already names the channel, so no resolution is needed.
+        channel_id = link.channel_id
     else:
-        raise ValueError("Must specify either --channel or --user.")
+        raise ValueError("Must specify --channel, --user, or a Slack message link.")
+    if check_deliverable:
+        check_message_target(session, client, context_name, channel_id=channel_id)
+    return channel_id
+
+
+def _parse_link_arg(value: str | None) -> MessageLink | None:
+    """Parse a CLI value as a Slack message link, or None if it is not one."""
+    if is_message_link(value):
+        assert value is not None
+        return parse_message_link(value)
+    return None
+
+
+def _thread_ts_from_arg(value: str | None) -> str | None:
+    """
+    Thread timestamp from a --thread value. For a link to a thread reply this
+    is the parent's ts; for any other link it is the linked message's ts.
+    """
+    link = _parse_link_arg(value)
+    if link is None:
+        return value
+    return link.thread_ts or link.ts
 
 
 def handle_send(args: argparse.Namespace) -> None:
@@ -59,8 +117,13 @@ def handle_send(args: argparse.Namespace) -> None:
             )
 
         client = create_client(context.access_token, context.app_type)
-        channel_id = _resolve_target_channel(client, args, session, context.name)
-        response = send_message(client, channel_id, args.message, thread_ts=args.thread)
+        link = _parse_link_arg(args.thread)
+        channel_id = _resolve_target_channel(
+            client, args, session, context.name, link=link, check_deliverable=True
+        )
+        response = send_message(
+            client, channel_id, args.message, thread_ts=_thread_ts_from_arg(args.thread)
+        )
 
         with args.outfile as ofp:
             json.dump(response.data, ofp)
@@ -101,7 +164,10 @@ def generate_send_parser() -> argparse.ArgumentParser:
         "-t",
         "--thread",
         type=str,
-        help="Thread timestamp for replying to thread",
+        help=(
+            "Thread timestamp or Slack message link for replying to thread "
+            "(a link also sets the channel)"
+        ),
     )
     parser.add_argument(
         "-o",
@@ -125,10 +191,17 @@ def handle_schedule(args: argparse.Namespace) -> None:
             )
 
         client = create_client(context.access_token, context.app_type)
-        channel_id = _resolve_target_channel(client, args, session, context.name)
+        link = _parse_link_arg(args.thread)
+        channel_id = _resolve_target_channel(
+            client, args, session, context.name, link=link, check_deliverable=True
+        )
         post_at = parse_schedule_time(args.at)
         response = schedule_message(
-            client, channel_id, args.message, post_at, thread_ts=args.thread
+            client,
+            channel_id,
+            args.message,
+            post_at,
+            thread_ts=_thread_ts_from_arg(args.thread),
         )
 
         with args.outfile as ofp:
@@ -180,7 +253,10 @@ def generate_schedule_parser() -> argparse.ArgumentParser:
         "-t",
         "--thread",
         type=str,
-        help="Thread timestamp for replying to thread",
+        help=(
+            "Thread timestamp or Slack message link for replying to thread "
+            "(a link also sets the channel)"
+        ),
     )
     parser.add_argument(
         "-o",
@@ -205,25 +281,19 @@ def handle_read(args: argparse.Namespace) -> None:
 
         client = create_client(context.access_token, context.app_type)
 
-        channel_id = None
-
-        if args.channel:
-            channel_id = resolve_channel_id(client, args.channel, session, context.name)
+        message_link = _parse_link_arg(args.message)
+        link = message_link or _parse_link_arg(args.thread)
+        channel_id = _resolve_target_channel(
+            client, args, session, context.name, link=link
+        )
 
+        if not args.user:
             scopes = get_scopes_for_mode(context.app_type)
             if channel_id.startswith("C"):
                 validate("channels:history", scopes, raise_on_error=True)
             elif channel_id.startswith("G"):
                 validate("groups:history", scopes, raise_on_error=True)
 
-        elif args.user:
-            user_id = resolve_user_id(client, args.user, session, context.name)
-            channel_id = open_dm_channel(client, user_id)
-            if channel_id is None:
-                raise ValueError(f"Failed to open DM with user '{args.user}'.")
-        else:
-            raise ValueError("Must specify either --channel or --user.")
-
         oldest = None
         if args.since:
             oldest = parse_timestamp(args.since)
@@ -237,14 +307,32 @@ def handle_read(args: argparse.Namespace) -> None:
             latest = str(Decimal(parse_timestamp(args.before)) - SLACK_TS_EPSILON)
 
         if args.thread:
+            thread_ts = _thread_ts_from_arg(args.thread)
+            assert thread_ts is not None
             response = read_thread(
                 client,
                 channel_id,
-                args.thread,
+                thread_ts,
                 limit=args.limit,
                 oldest=oldest,
                 latest=latest,
             )
+        elif message_link is not None and message_link.thread_ts:
+            # Thread replies are not in channel history; fetch from the thread.
+            # conversations.replies always returns the parent first, so the
+            # reply is the second message.
+            ts = message_link.ts
+            response = read_thread(
+                client,
+                channel_id,
+                message_link.thread_ts,
+                limit=2,
+                oldest=ts,
+                latest=ts,
+            )
+            response.data["messages"] = [
+                m for m in response.get("messages", []) if m.get("ts") == ts
+            ]
         elif args.message:
             ts = resolve_message_timestamp(args.message)
             response = read_messages(client, channel_id, limit=1, latest=ts, oldest=ts)
@@ -285,13 +373,13 @@ def generate_read_parser() -> argparse.ArgumentParser:
         "-t",
         "--thread",
         type=str,
-        help="Thread timestamp to read thread replies",
+        help="Thread timestamp or Slack message link to read thread replies",
     )
     parser.add_argument(
         "-m",
         "--message",
         type=str,
-        help="Specific message timestamp to read",
+        help="Specific message timestamp or Slack message link to read",
     )
     lower_bound = parser.add_mutually_exclusive_group()
     lower_bound.add_argument(
@@ -412,7 +500,13 @@ def handle_react(args: argparse.Namespace) -> None:
             )
 
         client = create_client(context.access_token, context.app_type)
-        channel_id = _resolve_target_channel(client, args, session, context.name)
+        channel_id = _resolve_target_channel(
+            client,
+            args,
+            session,
+            context.name,
+            link=_parse_link_arg(args.message),
+        )
         ts = resolve_message_timestamp(args.message)
 
         if args.remove:
@@ -437,7 +531,7 @@ def generate_react_parser() -> argparse.ArgumentParser:
         help="Configuration directory (default: platform-specific user config dir)",
     )
 
-    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group = parser.add_mutually_exclusive_group()
     target_group.add_argument(
         "-c",
         "--channel",
@@ -455,7 +549,7 @@ def generate_react_parser() -> argparse.ArgumentParser:
         "--message",
         type=str,
         required=True,
-        help="Message timestamp",
+        help="Message timestamp or Slack message link",
     )
     parser.add_argument(
         "-e",
@@ -606,7 +700,13 @@ def handle_delete(args: argparse.Namespace) -> None:
             )
 
         client = create_client(context.access_token, context.app_type)
-        channel_id = _resolve_target_channel(client, args, session, context.name)
+        channel_id = _resolve_target_channel(
+            client,
+            args,
+            session,
+            context.name,
+            link=_parse_link_arg(args.message),
+        )
         ts = resolve_message_timestamp(args.message)
         response = delete_message(client, channel_id, ts)
 
@@ -630,7 +730,7 @@ def generate_delete_parser() -> argparse.ArgumentParser:
         help="Configuration directory (default: platform-specific user config dir)",
     )
 
-    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group = parser.add_mutually_exclusive_group()
     target_group.add_argument(
         "-c",
         "--channel",
@@ -648,7 +748,7 @@ def generate_delete_parser() -> argparse.ArgumentParser:
         "--message",
         type=str,
         required=True,
-        help="Message timestamp to delete",
+        help="Message timestamp or Slack message link to delete",
     )
     parser.add_argument(
         "-o",
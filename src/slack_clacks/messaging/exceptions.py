@@ -3,13 +3,28 @@ Custom exceptions for messaging operations.
 """
 
 
-class ClacksUserNotFoundError(Exception):
+class _ClacksNotFoundError(Exception):
+    """
+    Base for lookup failures. suggestions holds similar known names, best
+    first, and is shown as a "did you mean" hint.
+    """
+
+    def __init__(self, identifier: str, suggestions: list[str] | None = None):
+        self.identifier = identifier
+        self.suggestions = suggestions or []
+        message = identifier
+        if self.suggestions:
+            message += f" (did you mean: {', '.join(self.suggestions)}?)"
+        super().__init__(message)
+
+
+class ClacksUserNotFoundError(_ClacksNotFoundError):
     """Raised when a user lookup fails."""
 
     pass
 
 
-class ClacksChannelNotFoundError(Exception):
+class ClacksChannelNotFoundError(_ClacksNotFoundError):
     """Raised when a channel lookup fails."""
 
     pass
@@ -4,6 +4,8 @@ Core messaging operations using Slack Web API.
 
 import re
 import time
+import urllib.parse
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, tzinfo
 from typing import Any
 from zoneinfo import ZoneInfo
@@ -18,11 +20,209 @@ from slack_clacks.messaging.exceptions import (
 )
 
 
+class ResolutionMemo:
+    """
+    In-process memo of successful resolutions for one context.
+    Sits in front of the alias, directory and API lookups, so an identifier
+    resolved once in a process is not looked up again. Only hits are
+    memoized; misses are left to the negative cache.
+    """
+
+    def __init__(self) -> None:
+        self.channels: dict[str, str] = {}
+        self.users: dict[str, str] = {}
+        self.dm_channels: dict[str, str] = {}
+
+    def clear(self) -> None:
+        self.channels.clear()
+        self.users.clear()
+        self.dm_channels.clear()
+
+
+_resolution_memos: dict[str, ResolutionMemo] = {}
+
+
+def get_resolution_memo(context_name: str) -> ResolutionMemo:
+    """Process-wide resolution memo for a context, created on first use."""
+    return _resolution_memos.setdefault(context_name, ResolutionMemo())
+
+
+def clear_resolution_memos(context_name: str | None = None) -> None:
+    """Forget memoized resolutions for one context, or for all contexts."""
+    if context_name is None:
+        _resolution_memos.clear()
+    else:
+        _resolution_memos.pop(context_name, None)
+
+
+def _write_through_pages(
+    session: Session | None,
+    context_name: str | None,
+    target_type: str,
+    pages: list[list[dict[str, Any]]],
+) -> None:
+    """
+    Upsert the pages downloaded by a fallback scan into their directory
+    cache, once the scan is over, and commit. Writing each page as it
+    arrived would hold the database's write lock, and so lock out other
+    clacks processes, for as long as the scan takes.
+    """
+    if session is None or context_name is None or not pages:
+        return
+
+    from slack_clacks.rolodex.operations import (
+        upsert_channel_directory,
+        upsert_user_directory,
+    )
+
+    for page in pages:
+        if target_type == "user":
+            upsert_user_directory(session, context_name, page)
+        else:
+            upsert_channel_directory(session, context_name, page)
+    session.commit()
+
+
+def _mark_scan_complete(
+    session: Session | None,
+    context_name: str | None,
+    target_type: str,
+    missing: list[str],
+) -> None:
+    """
+    A fallback scan that ran to the last page is a full directory refresh,
+    and proves the missing identifiers do not exist, so they are recorded in
+    the negative cache. Commits, because the caller is about to raise a
+    not-found error and this work must survive the rollback that follows.
+    """
+    if session is None or context_name is None:
+        return
+
+    from slack_clacks.rolodex.operations import (
+        mark_directory_refreshed,
+        record_resolution_misses,
+    )
+
+    mark_directory_refreshed(session, context_name, target_type)
+    record_resolution_misses(session, missing, context_name, target_type)
+    session.commit()
+
+
+def resolve_channels_many(
+    client: WebClient,
+    channel_identifiers: list[str],
+    session: Session | None = None,
+    context_name: str | None = None,
+    memo: ResolutionMemo | None = None,
+) -> dict[str, str | None]:
+    """
+    Resolve many channel identifiers in one directory pass.
+    Accepts the same identifiers as resolve_channel_id.
+    Returns {identifier: channel ID}, with None for identifiers that could
+    not be resolved.
+
+    Aliases and the channel directory are checked with one IN query each.
+    Names that recently failed to resolve are answered from the negative
+    cache; a single conversations.list scan looks for all remaining names.
+    If a memo is given, names it holds are answered without any lookup and
+    new resolutions are added to it.
+    """
+    resolved: dict[str, str | None] = {}
+    pending: dict[str, list[str]] = {}
+    for identifier in channel_identifiers:
+        name = identifier.lstrip("#")
+        if identifier.startswith(("C", "D", "G")):
+            resolved[identifier] = identifier
+        elif memo is not None and name in memo.channels:
+            resolved[identifier] = memo.channels[name]
+        else:
+            pending.setdefault(name, []).append(identifier)
+
+    def settle(name: str, channel_id: str) -> None:
+        if memo is not None:
+            memo.channels[name] = channel_id
+        for identifier in pending.pop(name):
+            resolved[identifier] = channel_id
+
+    if pending and session is not None and context_name is not None:
+        from slack_clacks.rolodex.operations import (
+            is_directory_stale,
+            lookup_channel_directory_many,
+            recent_resolution_misses,
+            resolve_alias_targets,
+            start_background_directory_refresh,
+        )
+
+        targets = resolve_alias_targets(
+            session, list(pending), context_name, "channel", "slack"
+        )
+        for name, target_id in targets.items():
+            settle(name, target_id)
+
+        entries = lookup_channel_directory_many(session, list(pending), context_name)
+        for name, entry in entries.items():
+            settle(name, entry.channel_id)
+        if entries and is_directory_stale(session, context_name, "channel"):
+            start_background_directory_refresh(session, client, context_name, "channel")
+
+        for name in recent_resolution_misses(
+            session, list(pending), context_name, "channel"
+        ):
+            for identifier in pending.pop(name):
+                resolved[identifier] = None
+
+    if pending:
+        scanned: list[list[dict[str, Any]]] = []
+        try:
+            cursor: str | None = None
+            while pending:
+                response = client.conversations_list(
+                    types="public_channel,private_channel", limit=200, cursor=cursor
+                )
+                scanned.append(response["channels"])
+                for channel in response["channels"]:
+                    if channel["name"] in pending:
+                        settle(channel["name"], channel["id"])
+                response_metadata = response.get("response_metadata")
+                cursor = (
+                    response_metadata.get("next_cursor") if response_metadata else None
+                )
+                if not cursor:
+                    break
+        except SlackApiError as e:
+            missing = [i for identifiers in pending.values() for i in identifiers]
+            raise ClacksChannelNotFoundError(", ".join(missing)) from e
+
+        _write_through_pages(session, context_name, "channel", scanned)
+        if pending:
+            _mark_scan_complete(session, context_name, "channel", list(pending))
+
+    for identifiers in pending.values():
+        for identifier in identifiers:
+            resolved[identifier] = None
+    return resolved
+
+
+def _suggestions(
+    session: Session | None,
+    context_name: str | None,
+    identifier: str,
+    target_type: str,
+) -> list[str]:
+    """Similar alias and directory names for an identifier that did not resolve."""
+    if session is None or context_name is None:
+        return []
+    from slack_clacks.rolodex.search import suggest_names
+
+    return suggest_names(session, identifier, context_name, target_type)
+
+
 def resolve_channel_id(
     client: WebClient,
     channel_identifier: str,
     session: Session | None = None,
     context_name: str | None = None,
+    memo: ResolutionMemo | None = None,
 ) -> str:
     """
     Resolve channel identifier to channel ID.
@@ -30,39 +230,132 @@ def resolve_channel_id(
     Returns channel ID or raises ClacksChannelNotFoundError if not found.
 
     Resolution order:
-    1. Check if already a Slack channel ID (C..., D..., G...)
+    1. Check if already a Slack channel ID (C..., D..., G...), or in the memo
     2. Check aliases (if session and context_name provided)
-    3. Fall back to Slack API
+    3. Check the channel directory cache (if session and context_name provided)
+    4. Fall back to Slack API
+
+    A directory hit older than the TTL is still returned, and a refresh is
+    started in the background. On a miss, every page the API scan downloads
+    is written through to the directory once the scan ends, so the scan is
+    not paid twice, and the error suggests similar known channel names.
     """
-    if channel_identifier.startswith(("C", "D", "G")):
-        return channel_identifier
+    channel_id = resolve_channels_many(
+        client, [channel_identifier], session, context_name, memo
+    )[channel_identifier]
+    if channel_id is None:
+        raise ClacksChannelNotFoundError(
+            channel_identifier,
+            _suggestions(session, context_name, channel_identifier, "channel"),
+        )
+    return channel_id
 
-    channel_name = channel_identifier.lstrip("#")
 
-    if session is not None and context_name is not None:
-        from slack_clacks.rolodex.operations import resolve_alias
+def _user_matches(user: dict[str, Any], username: str) -> bool:
+    """
+    Whether a users.list member matches a username, real name or email.
+    Emails compare case-insensitively, as in the user directory.
+    """
+    email = user.get("profile", {}).get("email")
+    return (
+        user.get("name") == username
+        or user.get("real_name") == username
+        or (email is not None and email.lower() == username.lower())
+    )
 
-        alias = resolve_alias(session, channel_name, context_name, "channel", "slack")
-        if alias:
-            return alias.target_id
 
-    try:
-        cursor: str | None = None
-        while True:
-            response = client.conversations_list(
-                types="public_channel,private_channel", limit=200, cursor=cursor
-            )
-            for channel in response["channels"]:
-                if channel["name"] == channel_name:
-                    return channel["id"]
-            response_metadata = response.get("response_metadata")
-            cursor = response_metadata.get("next_cursor") if response_metadata else None
-            if not cursor:
-                break
-    except SlackApiError as e:
-        raise ClacksChannelNotFoundError(channel_identifier) from e
+def resolve_users_many(
+    client: WebClient,
+    user_identifiers: list[str],
+    session: Session | None = None,
+    context_name: str | None = None,
+    memo: ResolutionMemo | None = None,
+) -> dict[str, str | None]:
+    """
+    Resolve many user identifiers in one directory pass.
+    Accepts the same identifiers as resolve_user_id.
+    Returns {identifier: user ID}, with None for identifiers that could not
+    be resolved.
+
+    Aliases are checked with one IN query and the user directory with one IN
+    query per lookup column. Identifiers that recently failed to resolve are
+    answered from the negative cache; a single users.list scan looks for all
+    remaining identifiers. If a memo is given, identifiers it holds are
+    answered without any lookup and new resolutions are added to it.
+    """
+    resolved: dict[str, str | None] = {}
+    pending: dict[str, list[str]] = {}
+    for identifier in user_identifiers:
+        username = identifier.lstrip("@")
+        if identifier.startswith("U"):
+            resolved[identifier] = identifier
+        elif memo is not None and username in memo.users:
+            resolved[identifier] = memo.users[username]
+        else:
+            pending.setdefault(username, []).append(identifier)
+
+    def settle(username: str, user_id: str) -> None:
+        if memo is not None:
+            memo.users[username] = user_id
+        for identifier in pending.pop(username):
+            resolved[identifier] = user_id
+
+    if pending and session is not None and context_name is not None:
+        from slack_clacks.rolodex.operations import (
+            is_directory_stale,
+            lookup_user_directory_many,
+            recent_resolution_misses,
+            resolve_alias_targets,
+            start_background_directory_refresh,
+        )
+
+        targets = resolve_alias_targets(
+            session, list(pending), context_name, "user", "slack"
+        )
+        for username, target_id in targets.items():
+            settle(username, target_id)
+
+        entries = lookup_user_directory_many(session, list(pending), context_name)
+        for username, entry in entries.items():
+            settle(username, entry.user_id)
+        if entries and is_directory_stale(session, context_name, "user"):
+            start_background_directory_refresh(session, client, context_name, "user")
+
+        for username in recent_resolution_misses(
+            session, list(pending), context_name, "user"
+        ):
+            for identifier in pending.pop(username):
+                resolved[identifier] = None
+
+    if pending:
+        scanned: list[list[dict[str, Any]]] = []
+        try:
+            cursor: str | None = None
+            while pending:
+                response = client.users_list(cursor=cursor, limit=200)
+                scanned.append(response["members"])
+                for user in response["members"]:
+                    for username in list(pending):
+                        if _user_matches(user, username):
+                            settle(username, user["id"])
+                response_metadata = response.get("response_metadata")
+                cursor = (
+                    response_metadata.get("next_cursor") if response_metadata else None
+                )
+                if not cursor:
+                    break
+        except SlackApiError as e:
+            missing = [i for identifiers in pending.values() for i in identifiers]
+            raise ClacksUserNotFoundError(", ".join(missing)) from e
 
-    raise ClacksChannelNotFoundError(channel_identifier)
+        _write_through_pages(session, context_name, "user", scanned)
+        if pending:
+            _mark_scan_complete(session, context_name, "user", list(pending))
+
+    for identifiers in pending.values():
+        for identifier in identifiers:
+            resolved[identifier] = None
+    return resolved
 
 
 def resolve_user_id(
@@ -70,6 +363,7 @@ def resolve_user_id(
     user_identifier: str,
     session: Session | None = None,
     context_name: str | None = None,
+    memo: ResolutionMemo | None = None,
 ) -> str:
     """
     Resolve user identifier to user ID.
@@ -77,41 +371,61 @@ def resolve_user_id(
     Returns user ID or raises ClacksUserNotFoundError if not found.
 
     Resolution order:
-    1. Check if already a Slack user ID (U...)
+    1. Check if already a Slack user ID (U...), or in the memo
     2. Check aliases (if session and context_name provided)
-    3. Fall back to Slack API
+    3. Check the user directory cache by username, email, display name or
+       real name (if session and context_name provided)
+    4. Fall back to Slack API
+
+    A directory hit older than the TTL is still returned, and a refresh is
+    started in the background. On a miss, every page the API scan downloads
+    is written through to the directory once the scan ends, so the scan is
+    not paid twice, and the error suggests similar known names.
     """
-    if user_identifier.startswith("U"):
-        return user_identifier
+    user_id = resolve_users_many(
+        client, [user_identifier], session, context_name, memo
+    )[user_identifier]
+    if user_id is None:
+        raise ClacksUserNotFoundError(
+            user_identifier,
+            _suggestions(session, context_name, user_identifier, "user"),
+        )
+    return user_id
 
-    username = user_identifier.lstrip("@")
 
-    if session is not None and context_name is not None:
-        from slack_clacks.rolodex.operations import resolve_alias
+@dataclass(frozen=True)
+class MessageLink:
+    """Target of a Slack message permalink."""
 
-        alias = resolve_alias(session, username, context_name, "user", "slack")
-        if alias:
-            return alias.target_id
+    channel_id: str
+    ts: str
+    thread_ts: str | None = None
 
-    try:
-        cursor: str | None = None
-        while True:
-            response = client.users_list(cursor=cursor, limit=200)
-            for user in response["members"]:
-                if (
-                    user.get("name") == username
-                    or user.get("real_name") == username
-                    or user.get("profile", {}).get("email") == user_identifier
-                ):
-                    return user["id"]
-            response_metadata = response.get("response_metadata")
-            cursor = response_metadata.get("next_cursor") if response_metadata else None
-            if not cursor:
-                break
-    except SlackApiError as e:
-        raise ClacksUserNotFoundError(user_identifier) from e
-
-    raise ClacksUserNotFoundError(user_identifier)
+
+def is_message_link(value: str | None) -> bool:
+    """Whether a CLI value looks like a Slack message link."""
+    return value is not None and value.startswith("http")
+
+
+def parse_message_link(link: str) -> MessageLink:
+    """
+    Parse a Slack message link into channel ID, message ts and thread ts.
+    Accepts links like
+    https://workspace.slack.com/archives/C.../p1767795445338939?thread_ts=...
+    thread_ts is only set for links to thread replies.
+    Raises ValueError if the link has no channel or timestamp.
+    """
+    parsed = urllib.parse.urlparse(link)
+    match = re.search(r"/archives/([A-Z0-9]+)/p(\d+)$", parsed.path)
+    if not match:
+        raise ValueError(f"Invalid Slack message link: {link}")
+    channel_id, raw_ts = match.groups()
+    if len(raw_ts) <= 6:
+        raise ValueError(f"Invalid timestamp in link: {link}")
+    ts = f"{raw_ts[:-6]}.{raw_ts[-6:]}"
+
+    thread_ts = urllib.parse.parse_qs(parsed.query).get("thread_ts", [None])[0]
+    return MessageLink(channel_id=channel_id, ts=ts, thread_ts=thread_ts)
 
 
 def resolve_message_timestamp(timestamp_or_link: str) -> str:
@@ -201,17 +515,47 @@ def parse_timestamp(value: str) -> str:
     )
 
 
-def open_dm_channel(client: WebClient, user_id: str) -> str | None:
+def open_dm_channel(
+    client: WebClient,
+    user_id: str,
+    session: Session | None = None,
+    context_name: str | None = None,
+    memo: ResolutionMemo | None = None,
+) -> str | None:
     """
     Open a DM channel with a user.
     Returns channel ID or None if failed.
+
+    If session and context_name are provided, the DM channel cache is checked
+    first and conversations.open is only called on a miss. A memo, if given,
+    is checked before the cache.
     """
+    if memo is not None and user_id in memo.dm_channels:
+        return memo.dm_channels[user_id]
+
+    if session is not None and context_name is not None:
+        from slack_clacks.rolodex.operations import get_dm_channel
+
+        cached = get_dm_channel(session, user_id, context_name)
+        if cached is not None:
+            if memo is not None:
+                memo.dm_channels[user_id] = cached
+            return cached
+
     try:
         response = client.conversations_open(users=[user_id])
-        return response["channel"]["id"]
+        channel_id = response["channel"]["id"]
     except SlackApiError:
         return None
 
+    if session is not None and context_name is not None:
+        from slack_clacks.rolodex.operations import set_dm_channel
+
+        set_dm_channel(session, user_id, context_name, channel_id)
+    if memo is not None:
+        memo.dm_channels[user_id] = channel_id
+    return channel_id
+
 
 def send_message(
     client: WebClient,
@@ -3,24 +3,48 @@ CLI commands for rolodex.
 """
 
 import argparse
+import csv
 import json
 import sys
+from collections.abc import Iterator
+from itertools import batched
 from pathlib import Path
+from typing import Any
 
 from slack_clacks.auth.client import create_client
 from slack_clacks.configuration.database import (
     ensure_db_updated,
     get_current_context,
     get_session,
+    list_contexts,
 )
-from slack_clacks.rolodex.data import PLATFORM_TARGET_TYPES
+from slack_clacks.messaging.operations import (
+    get_resolution_memo,
+    resolve_channels_many,
+    resolve_users_many,
+)
+from slack_clacks.rolodex.data import (
+    CHANNEL,
+    GITHUB,
+    PLATFORM_TARGET_TYPES,
+    SLACK,
+    USER,
+)
+from slack_clacks.rolodex.github import get_github_token, sync_from_github
 from slack_clacks.rolodex.operations import (
+    IMPORT_BATCH_SIZE,
     add_alias,
+    directory_details,
     get_platform_target_types,
+    import_aliases,
+    iter_aliases,
     list_aliases,
+    next_alias_cursor,
     remove_alias,
+    sync_contexts_from_slack,
     sync_from_slack,
 )
+from slack_clacks.rolodex.search import search_names, suggest_names
 
 
 def handle_add(args: argparse.Namespace) -> None:
@@ -53,6 +77,29 @@ def handle_add(args: argparse.Namespace) -> None:
             json.dump(output, ofp)
 
 
+def _alias_output(alias: Any) -> dict[str, str]:
+    return {
+        "alias": alias.alias,
+        "platform": alias.platform,
+        "target_type": alias.target_type,
+        "target_id": alias.target_id,
+    }
+
+
+def _detailed_alias_outputs(
+    session: Any, context: str, aliases: list[Any]
+) -> list[dict[str, Any]]:
+    """Alias outputs with a "details" object from the directory, or null."""
+    details = directory_details(session, context, aliases)
+    return [
+        {
+            **_alias_output(alias),
+            "details": details.get((alias.target_type, alias.target_id)),
+        }
+        for alias in aliases
+    ]
+
+
 def handle_list(args: argparse.Namespace) -> None:
     ensure_db_updated(config_dir=args.config_dir)
     with get_session(args.config_dir) as session:
@@ -62,32 +109,116 @@ def handle_list(args: argparse.Namespace) -> None:
                 "No active authentication context. Authenticate with: clacks auth login"
             )
 
-        aliases = list_aliases(
-            session,
-            context=context.name,
-            platform=args.platform,
-            target_type=args.target_type,
-            target_id=args.target_id,
-            limit=args.limit,
-            offset=args.offset,
-        )
+        filters: dict[str, Any] = {
+            "context": context.name,
+            "platform": args.platform,
+            "target_type": args.target_type,
+            "target_id": args.target_id,
+            "limit": args.limit,
+            "cursor": args.cursor,
+        }
+
+        if args.format == "ndjson":
+            if args.offset:
+                raise ValueError(
+                    "--offset is not supported with --format ndjson; use --cursor."
+                )
+            # One alias per line, written as rows arrive from the database.
+            with args.outfile as ofp:
+                rows = iter_aliases(session, **filters)
+                if not args.details:
+                    for row in rows:
+                        ofp.write(json.dumps(_alias_output(row)) + "\n")
+                    return
+                # Details are looked up per batch, not per alias.
+                for batch in batched(rows, IMPORT_BATCH_SIZE):
+                    for item in _detailed_alias_outputs(
+                        session, context.name, list(batch)
+                    ):
+                        ofp.write(json.dumps(item) + "\n")
+            return
+
+        aliases = list_aliases(session, offset=args.offset, **filters)
 
         output = {
-            "aliases": [
-                {
-                    "alias": a.alias,
-                    "platform": a.platform,
-                    "target_type": a.target_type,
-                    "target_id": a.target_id,
-                }
-                for a in aliases
-            ],
+            "aliases": (
+                _detailed_alias_outputs(session, context.name, aliases)
+                if args.details
+                else [_alias_output(a) for a in aliases]
+            ),
             "count": len(aliases),
+            "next_cursor": next_alias_cursor(aliases, args.limit),
         }
         with args.outfile as ofp:
             json.dump(output, ofp)
 
 
+ALIAS_FIELDS = ["alias", "platform", "target_type", "target_id"]
+
+
+def _read_alias_records(fp: Any, fmt: str) -> Iterator[dict[str, Any]]:
+    """Stream alias records from an NDJSON or CSV file."""
+    if fmt == "csv":
+        yield from csv.DictReader(fp)
+        return
+
+    for number, line in enumerate(fp, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {number}: invalid JSON ({e.msg}).") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {number}: expected a JSON object.")
+        yield record
+
+
+def handle_import(args: argparse.Namespace) -> None:
+    ensure_db_updated(config_dir=args.config_dir)
+    with get_session(args.config_dir) as session:
+        context = get_current_context(session)
+        if context is None:
+            raise ValueError(
+                "No active authentication context. Authenticate with: clacks auth login"
+            )
+
+        with args.infile as ifp:
+            count = import_aliases(
+                session, context.name, _read_alias_records(ifp, args.format)
+            )
+
+        output = {"status": "imported", "count": count}
+        with args.outfile as ofp:
+            json.dump(output, ofp)
+
+
+def handle_export(args: argparse.Namespace) -> None:
+    ensure_db_updated(config_dir=args.config_dir)
+    with get_session(args.config_dir) as session:
+        context = get_current_context(session)
+        if context is None:
+            raise ValueError(
+                "No active authentication context. Authenticate with: clacks auth login"
+            )
+
+        rows = iter_aliases(
+            session,
+            context=context.name,
+            platform=args.platform,
+            target_type=args.target_type,
+        )
+        with args.outfile as ofp:
+            if args.format == "csv":
+                writer = csv.writer(ofp)
+                writer.writerow(ALIAS_FIELDS)
+                for row in rows:
+                    writer.writerow(row)
+            else:
+                for row in rows:
+                    ofp.write(json.dumps(_alias_output(row)) + "\n")
+
+
 def handle_remove(args: argparse.Namespace) -> None:
     ensure_db_updated(config_dir=args.config_dir)
     with get_session(args.config_dir) as session:
@@ -113,7 +244,82 @@ def handle_remove(args: argparse.Namespace) -> None:
             json.dump(output, ofp)
 
 
+def _sync_output(result: dict[str, Any]) -> dict[str, Any]:
+    if "error" in result:
+        return {"status": "error", "error": result["error"]}
+    return {
+        "status": "synced",
+        "users": result["users"],
+        "channels": result["channels"],
+        "added": result["added"],
+        "updated": result["updated"],
+        "skipped": result["skipped"],
+        "pruned": result["pruned"],
+        "incremental": result["incremental"],
+        "timings": result["timings"],
+    }
+
+
 def handle_sync(args: argparse.Namespace) -> None:
+    ensure_db_updated(config_dir=args.config_dir)
+    if args.platform == GITHUB:
+        if not args.org:
+            raise ValueError("--org is required with --platform github.")
+        if args.since_last or args.all_contexts:
+            raise ValueError(
+                "--since-last and --all-contexts only apply to --platform slack."
+            )
+    elif args.org:
+        raise ValueError("--org only applies to --platform github.")
+
+    with get_session(args.config_dir) as session:
+        if args.platform == GITHUB:
+            context = get_current_context(session)
+            if context is None:
+                raise ValueError(
+                    "No active authentication context. "
+                    "Authenticate with: clacks auth login"
+                )
+            github_result = sync_from_github(
+                session, context.name, args.org, token=get_github_token()
+            )
+            output: dict[str, Any] = {"status": "synced", **github_result}
+        elif args.all_contexts:
+            clients = {
+                context.name: create_client(context.access_token, context.app_type)
+                for context in list_contexts(session)
+            }
+            if not clients:
+                raise ValueError(
+                    "No authentication contexts. Authenticate with: clacks auth login"
+                )
+            results = sync_contexts_from_slack(
+                session, clients, since_last=args.since_last
+            )
+            output = {
+                "contexts": {
+                    name: _sync_output(result) for name, result in results.items()
+                }
+            }
+        else:
+            context = get_current_context(session)
+            if context is None:
+                raise ValueError(
+                    "No active authentication context. "
+                    "Authenticate with: clacks auth login"
+                )
+
+            client = create_client(context.access_token, context.app_type)
+            result = sync_from_slack(
+                session, client, context.name, since_last=args.since_last
+            )
+            output = _sync_output(result)
+
+        with args.outfile as ofp:
+            json.dump(output, ofp)
+
+
+def handle_resolve(args: argparse.Namespace) -> None:
     ensure_db_updated(config_dir=args.config_dir)
     with get_session(args.config_dir) as session:
         context = get_current_context(session)
@@ -123,12 +329,67 @@ def handle_sync(args: argparse.Namespace) -> None:
             )
 
         client = create_client(context.access_token, context.app_type)
-        result = sync_from_slack(session, client, context.name)
+        memo = get_resolution_memo(context.name)
+        if args.target_type == USER:
+            resolved = resolve_users_many(
+                client, args.identifiers, session, context.name, memo
+            )
+        else:
+            resolved = resolve_channels_many(
+                client, args.identifiers, session, context.name, memo
+            )
 
+        unresolved = [k for k, v in resolved.items() if v is None]
         output = {
-            "status": "synced",
-            "users": result["users"],
-            "channels": result["channels"],
+            "target_type": args.target_type,
+            "resolved": {k: v for k, v in resolved.items() if v is not None},
+            "unresolved": unresolved,
+            "suggestions": {
+                identifier: suggest_names(
+                    session, identifier, context.name, args.target_type
+                )
+                for identifier in unresolved
+            },
+        }
+        with args.outfile as ofp:
+            json.dump(output, ofp)
+
+
+def handle_search(args: argparse.Namespace) -> None:
+    ensure_db_updated(config_dir=args.config_dir)
+    with get_session(args.config_dir) as session:
+        context = get_current_context(session)
+        if context is None:
+            raise ValueError(
+                "No active authentication context. Authenticate with: clacks auth login"
+            )
+
+        if args.limit < 1:
+            raise ValueError("Limit must be at least 1.")
+        matches = search_names(
+            session,
+            args.fragment,
+            context.name,
+            target_type=args.target_type,
+            platform=args.platform,
+            limit=args.limit,
+            fuzzy=not args.no_fuzzy,
+        )
+
+        output = {
+            "query": args.fragment,
+            "matches": [
+                {
+                    "name": match.name,
+                    "platform": match.platform,
+                    "target_type": match.target_type,
+                    "target_id": match.target_id,
+                    "source": match.source,
+                    "score": match.score,
+                }
+                for match in matches
+            ],
+            "count": len(matches),
         }
         with args.outfile as ofp:
             json.dump(output, ofp)
@@ -234,12 +495,37 @@ def generate_cli() -> argparse.ArgumentParser:
         default=None,
         help="Maximum results",
     )
-    list_parser.add_argument(
+    position = list_parser.add_mutually_exclusive_group()
+    position.add_argument(
         "--offset",
         type=int,
         default=0,
         help="Skip results (default: 0)",
     )
+    position.add_argument(
+        "--cursor",
+        type=str,
+        default=None,
+        help="Continue after the next_cursor of a previous page",
+    )
+    list_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help=(
+            "Output format: one JSON document (default), or one alias per line, "
+            "streamed without loading the full list"
+        ),
+    )
+    list_parser.add_argument(
+        "--details",
+        action="store_true",
+        help=(
+            "Include directory details for Slack targets: profile fields for "
+            "users, member count, topic and purpose for channels"
+        ),
+    )
     list_parser.add_argument(
         "-o",
         "--outfile",
@@ -249,6 +535,82 @@ def generate_cli() -> argparse.ArgumentParser:
     )
     list_parser.set_defaults(func=handle_list)
 
+    # --- import ---
+    import_parser = subparsers.add_parser(
+        "import", help="Add or update aliases in bulk from NDJSON or CSV"
+    )
+    import_parser.add_argument(
+        "-D",
+        "--config-dir",
+        type=Path,
+        default=None,
+        help="Configuration directory",
+    )
+    import_parser.add_argument(
+        "-i",
+        "--infile",
+        type=argparse.FileType("r"),
+        default=sys.stdin,
+        help=(
+            "Aliases with alias, target_type, target_id and optional platform "
+            "fields (default: stdin)"
+        ),
+    )
+    import_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["ndjson", "csv"],
+        default="ndjson",
+        help="Input format (default: ndjson)",
+    )
+    import_parser.add_argument(
+        "-o",
+        "--outfile",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="Output file for JSON results (default: stdout)",
+    )
+    import_parser.set_defaults(func=handle_import)
+
+    # --- export ---
+    export_parser = subparsers.add_parser(
+        "export", help="Write all aliases as NDJSON or CSV"
+    )
+    export_parser.add_argument(
+        "-D",
+        "--config-dir",
+        type=Path,
+        default=None,
+        help="Configuration directory",
+    )
+    export_parser.add_argument(
+        "-p",
+        "--platform",
+        type=str,
+        help="Filter by platform",
+    )
+    export_parser.add_argument(
+        "-T",
+        "--target-type",
+        type=str,
+        help="Filter by target type",
+    )
+    export_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["ndjson", "csv"],
+        default="ndjson",
+        help="Output format (default: ndjson)",
+    )
+    export_parser.add_argument(
+        "-o",
+        "--outfile",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="Output file (default: stdout)",
+    )
+    export_parser.set_defaults(func=handle_export)
+
     # --- remove ---
     remove_parser = subparsers.add_parser("remove", help="Remove an alias")
     remove_parser.add_argument(
@@ -280,7 +642,9 @@ def generate_cli() -> argparse.ArgumentParser:
     remove_parser.set_defaults(func=handle_remove)
 
     # --- sync ---
-    sync_parser = subparsers.add_parser("sync", help="Sync from Slack API")
+    sync_parser = subparsers.add_parser(
+        "sync", help="Sync from the Slack or GitHub API"
+    )
     sync_parser.add_argument(
         "-D",
         "--config-dir",
@@ -288,6 +652,34 @@ def generate_cli() -> argparse.ArgumentParser:
         default=None,
         help="Configuration directory",
     )
+    sync_parser.add_argument(
+        "-p",
+        "--platform",
+        choices=[SLACK, GITHUB],
+        default=SLACK,
+        help=(
+            "Platform to sync (default: slack). GitHub requests use GITHUB_TOKEN if set"
+        ),
+    )
+    sync_parser.add_argument(
+        "--org",
+        type=str,
+        default=None,
+        help="GitHub organization whose members and repos to sync",
+    )
+    sync_parser.add_argument(
+        "--since-last",
+        action="store_true",
+        help=(
+            "Only write users and channels updated since the last sync "
+            "(skips pruning of renamed aliases)"
+        ),
+    )
+    sync_parser.add_argument(
+        "--all-contexts",
+        action="store_true",
+        help="Sync every authenticated context in parallel",
+    )
     sync_parser.add_argument(
         "-o",
         "--outfile",
@@ -297,6 +689,90 @@ def generate_cli() -> argparse.ArgumentParser:
     )
     sync_parser.set_defaults(func=handle_sync)
 
+    # --- resolve ---
+    resolve_parser = subparsers.add_parser(
+        "resolve", help="Resolve many users or channels to Slack IDs"
+    )
+    resolve_parser.add_argument(
+        "-D",
+        "--config-dir",
+        type=Path,
+        default=None,
+        help="Configuration directory",
+    )
+    resolve_parser.add_argument(
+        "identifiers",
+        type=str,
+        nargs="+",
+        help="Names, aliases, emails or IDs to resolve",
+    )
+    resolve_parser.add_argument(
+        "-T",
+        "--target-type",
+        type=str,
+        choices=[USER, CHANNEL],
+        required=True,
+        help="Target type of all identifiers",
+    )
+    resolve_parser.add_argument(
+        "-o",
+        "--outfile",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="Output file for JSON results (default: stdout)",
+    )
+    resolve_parser.set_defaults(func=handle_resolve)
+
+    # --- search ---
+    search_parser = subparsers.add_parser(
+        "search",
+        help="Search aliases and directory names by prefix, substring or spelling",
+    )
+    search_parser.add_argument(
+        "-D",
+        "--config-dir",
+        type=Path,
+        default=None,
+        help="Configuration directory",
+    )
+    search_parser.add_argument(
+        "fragment",
+        type=str,
+        help="Part of a name, or a misspelling of one",
+    )
+    search_parser.add_argument(
+        "-T",
+        "--target-type",
+        type=str,
+        help="Filter by target type",
+    )
+    search_parser.add_argument(
+        "-p",
+        "--platform",
+        type=str,
+        help="Filter by platform",
+    )
+    search_parser.add_argument(
+        "-l",
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of matches (default: 20)",
+    )
+    search_parser.add_argument(
+        "--no-fuzzy",
+        action="store_true",
+        help="Only return prefix and substring matches",
+    )
+    search_parser.add_argument(
+        "-o",
+        "--outfile",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="Output file for JSON results (default: stdout)",
+    )
+    search_parser.set_defaults(func=handle_search)
+
     # --- platforminfo ---
     platforminfo_parser = subparsers.add_parser(
         "platforminfo", help="Show valid target types for a platform"
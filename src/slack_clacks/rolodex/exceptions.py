@@ -0,0 +1,9 @@
+"""
+Custom exceptions for rolodex operations.
+"""
+
+
+class ClacksGitHubAPIError(Exception):
+    """Raised when a GitHub API request fails."""
+
+    pass
@@ -0,0 +1,303 @@
+"""
+Rolodex sync from the GitHub REST API.
+
+Fills github aliases for an organization: its members (user), its
+repositories (repo) and the organization itself (org). Users and orgs are
+keyed by login and repos by full name, which is how GitHub's API, URLs and
+mentions address them; repo aliases are the short repository name.
+
+Every page's ETag is stored in github_etags, so a repeat sync sends
+If-None-Match and an unchanged page costs a 304, which GitHub does not count
+against the rate limit.
+"""
+
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from itertools import batched
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from slack_clacks.rolodex.data import GITHUB, ORG, REPO, USER
+from slack_clacks.rolodex.exceptions import ClacksGitHubAPIError
+from slack_clacks.rolodex.models import Alias, GitHubETag
+from slack_clacks.rolodex.operations import (
+    IMPORT_BATCH_SIZE,
+    forget_memoized_resolutions,
+    next_sync_generation,
+    upsert_synced_aliases,
+    utcnow,
+)
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_PAGE_SIZE = 100
+GITHUB_TIMEOUT = 30
+
+_NEXT_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="next"')
+
+
+@dataclass(frozen=True)
+class GitHubResponse:
+    """A GitHub API response. body is None for 304 Not Modified."""
+
+    status: int
+    body: Any
+    etag: str | None
+    next_url: str | None
+
+
+def get_github_api_url() -> str:
+    """GitHub API base URL, from CLACKS_GITHUB_API_URL if set."""
+    return os.environ.get("CLACKS_GITHUB_API_URL", GITHUB_API_URL).rstrip("/")
+
+
+def get_github_token() -> str | None:
+    """GitHub token from GITHUB_TOKEN, or None for unauthenticated requests."""
+    return os.environ.get("GITHUB_TOKEN") or None
+
+
+def _next_link(link_header: str | None) -> str | None:
+    """URL of the rel="next" entry of a Link header, if any."""
+    if not link_header:
+        return None
+    match = _NEXT_LINK.search(link_header)
+    return match.group(1) if match else None
+
+
+def github_get(url: str, token: str | None, etag: str | None = None) -> GitHubResponse:
+    """
+    GET a GitHub API URL, conditionally on etag if given.
+    Raises ClacksGitHubAPIError on any status other than 200 or 304.
+    """
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "clacks",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    if etag:
+        headers["If-None-Match"] = etag
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=GITHUB_TIMEOUT) as response:
+            return GitHubResponse(
+                status=response.status,
+                body=json.load(response),
+                etag=response.headers.get("ETag"),
+                next_url=_next_link(response.headers.get("Link")),
+            )
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return GitHubResponse(
+                status=304,
+                body=None,
+                etag=e.headers.get("ETag") or etag,
+                next_url=_next_link(e.headers.get("Link")),
+            )
+        try:
+            message = json.load(e).get("message", e.reason)
+        except (ValueError, AttributeError):
+            message = e.reason
+        raise ClacksGitHubAPIError(f"GitHub API {e.code} for {url}: {message}") from e
+    except urllib.error.URLError as e:
+        raise ClacksGitHubAPIError(f"GitHub API request failed: {e.reason}") from e
+
+
+def _member_targets(body: Any) -> list[tuple[str, str]]:
+    return [(member["login"], member["login"]) for member in body]
+
+
+def _repo_targets(body: Any) -> list[tuple[str, str]]:
+    return [(repo["name"], repo["full_name"]) for repo in body]
+
+
+def _org_targets(body: Any) -> list[tuple[str, str]]:
+    return [(body["login"], body["login"])]
+
+
+def _fetch_org_pages(
+    session: Session,
+    context: str,
+    org: str,
+    target_type: str,
+    url: str | None,
+    token: str | None,
+    extract: Callable[[Any], list[tuple[str, str]]],
+    stats: dict[str, int],
+) -> list[tuple[str, str]]:
+    """
+    Follow a paginated GitHub listing from url, sending stored ETags, and
+    return the (alias, target_id) pairs of every page. Fresh pages replace
+    their github_etags row; cache rows for pages no longer reached are
+    deleted.
+    """
+    targets: list[tuple[str, str]] = []
+    visited: set[str] = set()
+    while url and url not in visited:
+        visited.add(url)
+        cached = session.get(GitHubETag, (context, url))
+        response = github_get(url, token, cached.etag if cached else None)
+        stats["requests"] += 1
+
+        if response.status == 304 and cached is not None:
+            stats["not_modified"] += 1
+            page = [
+                (alias, target_id) for alias, target_id in json.loads(cached.targets)
+            ]
+            next_url = cached.next_url
+            cached.fetched_at = utcnow()
+        else:
+            page = extract(response.body)
+            next_url = response.next_url
+            if response.etag:
+                if cached is None:
+                    cached = GitHubETag(context=context, url=url)
+                    session.add(cached)
+                cached.org = org
+                cached.target_type = target_type
+                cached.etag = response.etag
+                cached.next_url = next_url
+                cached.targets = json.dumps(page)
+                cached.fetched_at = utcnow()
+            elif cached is not None:
+                session.delete(cached)
+
+        targets.extend(page)
+        url = next_url
+
+    session.flush()
+    session.query(GitHubETag).filter(
+        GitHubETag.context == context,
+        GitHubETag.org == org,
+        GitHubETag.target_type == target_type,
+        GitHubETag.url.not_in(visited),
+    ).delete(synchronize_session=False)
+    return targets
+
+
+def _cached_targets(
+    session: Session, context: str, target_type: str
+) -> dict[str, set[tuple[str, str]]]:
+    """(alias, target_id) pairs in github_etags per org, for one target type."""
+    by_org: dict[str, set[tuple[str, str]]] = {}
+    rows = session.query(GitHubETag.org, GitHubETag.targets).filter(
+        GitHubETag.context == context, GitHubETag.target_type == target_type
+    )
+    for org, targets in rows:
+        by_org.setdefault(org, set()).update(
+            (alias, target_id) for alias, target_id in json.loads(targets)
+        )
+    return by_org
+
+
+def _prune_github_aliases(
+    session: Session,
+    context: str,
+    target_type: str,
+    gone: set[tuple[str, str]],
+) -> int:
+    """Delete synced github aliases for (alias, target_id) pairs."""
+    pruned = 0
+    for alias, target_id in gone:
+        pruned += (
+            session.query(Alias)
+            .filter(
+                Alias.alias == alias,
+                Alias.context == context,
+                Alias.target_type == target_type,
+                Alias.platform == GITHUB,
+                Alias.target_id == target_id,
+                Alias.sync_generation.is_not(None),
+            )
+            .delete(synchronize_session=False)
+        )
+    return pruned
+
+
+def sync_from_github(
+    session: Session,
+    context: str,
+    org: str,
+    token: str | None = None,
+    api_url: str | None = None,
+) -> dict[str, Any]:
+    """
+    Sync github user, repo and org aliases for an organization.
+
+    Each page is requested with its stored ETag. Aliases the organization's
+    previous sync wrote but this one did not see are pruned, unless another
+    synced organization still lists them. Manual aliases, and aliases of the
+    same name from another platform, are never touched.
+
+    Returns counts for users, repos, added, updated and pruned, plus requests
+    made, how many were 304 Not Modified, and the total time in seconds.
+    collisions lists the aliases not written because the name is already
+    taken, e.g. a GitHub login matching a Slack user alias (see
+    upsert_synced_aliases).
+    """
+    started = time.perf_counter()
+    base = (api_url or get_github_api_url()).rstrip("/")
+    stats = {"requests": 0, "not_modified": 0}
+    listings = {
+        ORG: (f"{base}/orgs/{org}", _org_targets),
+        USER: (
+            f"{base}/orgs/{org}/members?per_page={GITHUB_PAGE_SIZE}",
+            _member_targets,
+        ),
+        REPO: (
+            f"{base}/orgs/{org}/repos?per_page={GITHUB_PAGE_SIZE}&type=all",
+            _repo_targets,
+        ),
+    }
+
+    generation = next_sync_generation(session, context)
+    counts: dict[str, int] = {}
+    collisions: list[dict[str, str]] = []
+    added = updated = pruned = 0
+    for target_type, (url, extract) in listings.items():
+        previous = _cached_targets(session, context, target_type)
+        targets = _fetch_org_pages(
+            session, context, org, target_type, url, token, extract, stats
+        )
+        counts[target_type] = len(targets)
+
+        for batch in batched(targets, IMPORT_BATCH_SIZE):
+            batch_added, batch_updated = upsert_synced_aliases(
+                session,
+                context,
+                target_type,
+                GITHUB,
+                list(batch),
+                generation,
+                collisions,
+            )
+            added += batch_added
+            updated += batch_updated
+
+        others = set().union(
+            *(pairs for other, pairs in previous.items() if other != org)
+        )
+        gone = previous.get(org, set()) - set(targets) - others
+        pruned += _prune_github_aliases(session, context, target_type, gone)
+
+    session.flush()
+    forget_memoized_resolutions(context)
+    return {
+        "org": org,
+        "users": counts[USER],
+        "repos": counts[REPO],
+        "added": added,
+        "updated": updated,
+        "pruned": pruned,
+        "collisions": collisions,
+        "requests": stats["requests"],
+        "not_modified": stats["not_modified"],
+        "timings": {"total": round(time.perf_counter() - started, 3)},
+    }
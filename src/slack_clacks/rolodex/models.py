@@ -2,7 +2,9 @@
 SQLAlchemy models for rolodex.
 """
 
-from sqlalchemy import ForeignKey, Index, String
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from slack_clacks.configuration.models import Base
@@ -12,6 +14,8 @@ class Alias(Base):
     """
     Platform-agnostic aliases for users and channels.
     Unique per (alias, context, target_type).
+    sync_generation is set on aliases written by sync and is NULL for aliases
+    added manually, which sync never overwrites or prunes.
     """
 
     __tablename__ = "aliases"
@@ -23,8 +27,150 @@ class Alias(Base):
     target_type: Mapped[str] = mapped_column(String, primary_key=True)
     platform: Mapped[str] = mapped_column(String, nullable=False)
     target_id: Mapped[str] = mapped_column(String, nullable=False)
+    sync_generation: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     __table_args__ = (
         Index("ix_aliases_platform_target", "platform", "target_id"),
         Index("ix_aliases_context", "context"),
+        Index("ix_aliases_context_alias", "context", "alias", "target_type"),
+    )
+
+
+class ChannelDirectoryEntry(Base):
+    """
+    Cached Slack channel directory, used to resolve channel names without
+    paging conversations.list, and to describe channels without calling
+    conversations.info. Unique per (context, channel_id).
+    """
+
+    __tablename__ = "channel_directory"
+
+    context: Mapped[str] = mapped_column(
+        String, ForeignKey("contexts.name", ondelete="CASCADE"), primary_key=True
+    )
+    channel_id: Mapped[str] = mapped_column(String, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    channel_type: Mapped[str] = mapped_column(String, nullable=False)
+    is_archived: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    num_members: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    topic: Mapped[str | None] = mapped_column(String, nullable=True)
+    purpose: Mapped[str | None] = mapped_column(String, nullable=True)
+    updated: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_channel_directory_context_name", "context", "name"),)
+
+
+class UserDirectoryEntry(Base):
+    """
+    Cached Slack user directory, used to resolve usernames, real names,
+    display names and emails without paging users.list, and to describe users
+    without calling users.info.
+    Unique per (context, user_id). email is stored lower-cased. Deactivated
+    users are kept with is_deleted set, but are not resolved.
+    """
+
+    __tablename__ = "user_directory"
+
+    context: Mapped[str] = mapped_column(
+        String, ForeignKey("contexts.name", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[str] = mapped_column(String, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    real_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    display_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    email: Mapped[str | None] = mapped_column(String, nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    is_bot: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    title: Mapped[str | None] = mapped_column(String, nullable=True)
+    timezone: Mapped[str | None] = mapped_column(String, nullable=True)
+    updated: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_user_directory_context_name", "context", "name"),
+        Index("ix_user_directory_context_real_name", "context", "real_name"),
+        Index("ix_user_directory_context_display_name", "context", "display_name"),
+        Index("ix_user_directory_context_email", "context", "email"),
+    )
+
+
+class DirectorySyncState(Base):
+    """
+    Progress of incremental directory refreshes.
+    Unique per (context, target_type).
+
+    cursor is the Slack pagination cursor of an in-progress refresh (None when
+    no refresh is underway). refreshed_at is when the last full pass finished.
+    watermark is the highest Slack `updated` stamp seen by the last sync;
+    rows not updated since can be skipped by an incremental sync.
+    """
+
+    __tablename__ = "directory_sync_state"
+
+    context: Mapped[str] = mapped_column(
+        String, ForeignKey("contexts.name", ondelete="CASCADE"), primary_key=True
+    )
+    target_type: Mapped[str] = mapped_column(String, primary_key=True)
+    cursor: Mapped[str | None] = mapped_column(String, nullable=True)
+    refreshed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    watermark: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+
+class ResolutionMiss(Base):
+    """
+    Negative cache of identifiers that recently failed to resolve.
+    Unique per (context, target_type, identifier).
+    """
+
+    __tablename__ = "resolution_misses"
+
+    context: Mapped[str] = mapped_column(
+        String, ForeignKey("contexts.name", ondelete="CASCADE"), primary_key=True
+    )
+    target_type: Mapped[str] = mapped_column(String, primary_key=True)
+    identifier: Mapped[str] = mapped_column(String, primary_key=True)
+    missed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DMChannel(Base):
+    """
+    Cached DM channel IDs. A user's DM channel never changes, so this saves a
+    conversations.open round trip. Unique per (context, user_id).
+    """
+
+    __tablename__ = "dm_channels"
+
+    context: Mapped[str] = mapped_column(
+        String, ForeignKey("contexts.name", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[str] = mapped_column(String, primary_key=True)
+    channel_id: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class GitHubETag(Base):
+    """
+    ETags of GitHub API pages fetched by rolodex sync, so repeat syncs can
+    send conditional requests. Unique per (context, url).
+
+    targets holds the (alias, target_id) pairs extracted from the page as a
+    JSON list, and next_url its rel="next" link, so a 304 Not Modified
+    response is as good as the full page.
+    """
+
+    __tablename__ = "github_etags"
+
+    context: Mapped[str] = mapped_column(
+        String, ForeignKey("contexts.name", ondelete="CASCADE"), primary_key=True
+    )
+    url: Mapped[str] = mapped_column(String, primary_key=True)
+    org: Mapped[str] = mapped_column(String, nullable=False)
+    target_type: Mapped[str] = mapped_column(String, nullable=False)
+    etag: Mapped[str] = mapped_column(String, nullable=False)
+    next_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    targets: Mapped[str] = mapped_column(Text, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_github_etags_context_org", "context", "org", "target_type"),
     )
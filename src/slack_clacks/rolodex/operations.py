@@ -2,12 +2,57 @@
 Database operations for rolodex.
 """
 
+import base64
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
 from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from sqlalchemy import ColumnElement, func, or_, tuple_
 from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
+from slack_clacks.configuration.database import get_sqlite_connection
 from slack_clacks.rolodex.data import CHANNEL, PLATFORM_TARGET_TYPES, SLACK, USER
-from slack_clacks.rolodex.models import Alias
+from slack_clacks.rolodex.models import (
+    Alias,
+    ChannelDirectoryEntry,
+    DirectorySyncState,
+    DMChannel,
+    ResolutionMiss,
+    UserDirectoryEntry,
+)
+
+# Alias step of name resolution, run by resolve_alias_targets.
+ALIAS_TARGETS_SQL = (
+    "SELECT alias, target_id, platform FROM aliases "
+    "WHERE context = ? AND target_type = ? AND alias IN ({placeholders})"
+)
+
+# Aliases written per multi-row statement by import_aliases.
+IMPORT_BATCH_SIZE = 1000
+
+# How long a completed directory refresh is considered fresh.
+DIRECTORY_TTL = timedelta(hours=12)
+
+# How long a failed lookup is remembered. Override with the
+# CLACKS_NEGATIVE_CACHE_TTL environment variable (seconds); 0 disables it.
+NEGATIVE_CACHE_TTL = timedelta(minutes=5)
+
+# Directory columns that may change without Slack bumping `updated`.
+CHANNEL_VOLATILE_COLUMNS = ("num_members", "topic", "purpose", "is_archived")
+USER_VOLATILE_COLUMNS = ("is_deleted",)
+
+# (database url, context, target_type) of background refreshes in flight.
+_background_refreshes: set[tuple[str, str, str]] = set()
+_background_refreshes_lock = threading.Lock()
 
 
 def get_platform_target_types(platform: str) -> list[str] | None:
@@ -51,9 +96,15 @@ def add_alias(
     )
     stmt = stmt.on_conflict_do_update(
         index_elements=["alias", "context", "target_type"],
-        set_={"platform": stmt.excluded.platform, "target_id": stmt.excluded.target_id},
+        set_={
+            "platform": stmt.excluded.platform,
+            "target_id": stmt.excluded.target_id,
+            "sync_generation": None,
+        },
     )
     session.execute(stmt)
+    invalidate_resolution_misses(session, [alias], context, target_type)
+    forget_memoized_resolutions(context)
     session.flush()
 
     return (
@@ -67,6 +118,78 @@ def add_alias(
     )
 
 
+def import_aliases(
+    session: Session,
+    context: str,
+    records: Iterable[dict[str, Any]],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> int:
+    """
+    Add or update many aliases, as add_alias does for one.
+    Each record needs alias, target_type and target_id; platform defaults to
+    slack. Records are validated as they are read and written in multi-row
+    upserts of batch_size, all in the caller's transaction.
+    Raises ValueError naming the (1-based) number of the first invalid record.
+    Returns the number of records imported.
+    """
+    count = 0
+    batch: list[dict[str, Any]] = []
+
+    def flush_batch() -> None:
+        stmt = insert(Alias).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["alias", "context", "target_type"],
+            set_={
+                "platform": stmt.excluded.platform,
+                "target_id": stmt.excluded.target_id,
+                "sync_generation": None,
+            },
+        )
+        session.execute(stmt)
+        for target_type in {row["target_type"] for row in batch}:
+            invalidate_resolution_misses(
+                session,
+                [row["alias"] for row in batch if row["target_type"] == target_type],
+                context,
+                target_type,
+            )
+        batch.clear()
+
+    for number, record in enumerate(records, start=1):
+        alias = record.get("alias")
+        target_type = record.get("target_type")
+        target_id = record.get("target_id")
+        platform = record.get("platform") or SLACK
+        if not alias or not target_type or not target_id:
+            raise ValueError(
+                f"Record {number}: alias, target_type and target_id are required."
+            )
+        try:
+            validate_platform_target_type(platform, target_type)
+        except ValueError as e:
+            raise ValueError(f"Record {number}: {e}") from e
+
+        batch.append(
+            {
+                "alias": alias,
+                "context": context,
+                "target_type": target_type,
+                "platform": platform,
+                "target_id": target_id,
+            }
+        )
+        count += 1
+        if len(batch) >= batch_size:
+            flush_batch()
+
+    if batch:
+        flush_batch()
+    if count:
+        forget_memoized_resolutions(context)
+        session.flush()
+    return count
+
+
 def get_alias(
     session: Session,
     alias: str,
@@ -85,6 +208,46 @@ def get_alias(
     )
 
 
+def encode_alias_cursor(alias: str, target_type: str) -> str:
+    """Opaque keyset cursor pointing just past the given alias."""
+    raw = json.dumps([alias, target_type]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_alias_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from encode_alias_cursor. Raises ValueError if invalid."""
+    try:
+        alias, target_type = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(alias, str) or not isinstance(target_type, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return alias, target_type
+
+
+def _filter_aliases(
+    query: Any,
+    context: str,
+    platform: str | None,
+    target_type: str | None,
+    target_id: str | None,
+    cursor: str | None,
+) -> Any:
+    """Apply list filters and keyset position, ordered by (alias, target_type)."""
+    query = query.filter(Alias.context == context)
+    if platform is not None:
+        query = query.filter(Alias.platform == platform)
+    if target_type is not None:
+        query = query.filter(Alias.target_type == target_type)
+    if target_id is not None:
+        query = query.filter(Alias.target_id == target_id)
+    if cursor is not None:
+        query = query.filter(
+            tuple_(Alias.alias, Alias.target_type) > decode_alias_cursor(cursor)
+        )
+    return query.order_by(Alias.alias, Alias.target_type)
+
+
 def list_aliases(
     session: Session,
     context: str,
@@ -93,16 +256,16 @@ def list_aliases(
     target_id: str | None = None,
     limit: int | None = None,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[Alias]:
-    """List aliases with optional filtering."""
-    query = session.query(Alias).filter(Alias.context == context)
-    if platform is not None:
-        query = query.filter(Alias.platform == platform)
-    if target_type is not None:
-        query = query.filter(Alias.target_type == target_type)
-    if target_id is not None:
-        query = query.filter(Alias.target_id == target_id)
-    query = query.order_by(Alias.alias)
+    """
+    List aliases with optional filtering, ordered by (alias, target_type).
+    Pass the cursor from next_alias_cursor to continue after the previous
+    page; unlike offset, this costs the same however deep the page is.
+    """
+    query = _filter_aliases(
+        session.query(Alias), context, platform, target_type, target_id, cursor
+    )
     if limit is not None:
         query = query.limit(limit)
     if offset:
@@ -110,6 +273,42 @@ def list_aliases(
     return query.all()
 
 
+def next_alias_cursor(aliases: list[Alias], limit: int | None) -> str | None:
+    """Cursor for the page after a list_aliases page, or None if it was the last."""
+    if limit is None or not aliases or len(aliases) < limit:
+        return None
+    last = aliases[-1]
+    return encode_alias_cursor(last.alias, last.target_type)
+
+
+def iter_aliases(
+    session: Session,
+    context: str,
+    platform: str | None = None,
+    target_type: str | None = None,
+    target_id: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Any]:
+    """
+    Stream aliases as (alias, platform, target_type, target_id) rows, in the
+    same order and with the same filters as list_aliases. Rows are fetched
+    from the database cursor in batches rather than loaded all at once.
+    """
+    query = _filter_aliases(
+        session.query(Alias.alias, Alias.platform, Alias.target_type, Alias.target_id),
+        context,
+        platform,
+        target_type,
+        target_id,
+        cursor,
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    yield from query.yield_per(batch_size)
+
+
 def remove_alias(
     session: Session,
     alias: str,
@@ -120,11 +319,19 @@ def remove_alias(
     existing = get_alias(session, alias, context, target_type)
     if existing:
         session.delete(existing)
+        forget_memoized_resolutions(context)
         session.flush()
         return True
     return False
 
 
+def forget_memoized_resolutions(context: str) -> None:
+    """Drop the in-process resolution memo once an alias changes under it."""
+    from slack_clacks.messaging.operations import clear_resolution_memos
+
+    clear_resolution_memos(context)
+
+
 def resolve_alias(
     session: Session,
     identifier: str,
@@ -141,93 +348,1256 @@ def resolve_alias(
     return alias
 
 
-def _insert_alias_if_not_exists(
+def resolve_alias_targets(
+    session: Session,
+    identifiers: list[str],
+    context: str,
+    target_type: str,
+    platform: str | None = None,
+) -> dict[str, str]:
+    """
+    Resolve many identifiers to alias target IDs in one IN query.
+    Returns {identifier: target ID} for the identifiers that have an alias.
+
+    This is the alias step of every channel and user resolution, so it runs
+    as a raw sqlite3 statement on the session's connection (seeing its
+    flushed writes): building the ORM query costs more than the lookup.
+    """
+    names = list(dict.fromkeys(identifiers))
+    if not names:
+        return {}
+    # sqlite3 keeps the prepared statement per connection, keyed by its text
+    sql = ALIAS_TARGETS_SQL.format(placeholders=", ".join("?" * len(names)))
+    rows = get_sqlite_connection(session).execute(sql, (context, target_type, *names))
+    return {
+        alias: target_id
+        for alias, target_id, alias_platform in rows
+        if platform is None or alias_platform == platform
+    }
+
+
+def upsert_synced_aliases(
     session: Session,
-    alias: str,
     context: str,
     target_type: str,
     platform: str,
-    target_id: str,
-) -> None:
-    """Insert alias only if it doesn't exist. Preserves manual aliases during sync."""
+    targets: list[tuple[str, str]],
+    generation: int,
+    collisions: list[dict[str, str]] | None = None,
+    adopt_unsynced: bool = False,
+) -> tuple[int, int]:
+    """
+    Write (alias, target_id) pairs in one multi-row statement, tagging them
+    with the sync generation. Existing synced aliases of the same platform are
+    repointed and re-tagged; manual aliases (sync_generation NULL) and aliases
+    synced from another platform are left untouched.
+    Slack aliases synced before sync generations existed are also NULL. So
+    that the sweep can prune them once they go stale, adopt_unsynced (set for
+    the first generation-aware Slack sync, see needs_alias_adoption) adopts
+    NULL aliases that already point where the sync would.
+    Returns (added, updated), where updated counts synced aliases whose
+    target changed. If given, collisions collects the aliases left pointing
+    elsewhere because a manual alias or another platform's alias holds the
+    name, as {"alias", "target_type", "target_id", "held_by"} with the
+    holder's platform (or "manual").
+    """
+    if not targets:
+        return 0, 0
+
+    existing = {
+        row.alias: row
+        for row in session.query(
+            Alias.alias, Alias.platform, Alias.target_id, Alias.sync_generation
+        )
+        .filter(
+            Alias.context == context,
+            Alias.target_type == target_type,
+            Alias.alias.in_([alias for alias, _ in targets]),
+        )
+        .all()
+    }
+    added = sum(1 for alias, _ in targets if alias not in existing)
+    if collisions is not None:
+        for alias, target_id in targets:
+            held = existing.get(alias)
+            if held is None or (
+                held.platform == platform
+                and (held.sync_generation is not None or held.target_id == target_id)
+            ):
+                continue
+            collisions.append(
+                {
+                    "alias": alias,
+                    "target_type": target_type,
+                    "target_id": target_id,
+                    "held_by": (
+                        held.platform if held.platform != platform else "manual"
+                    ),
+                }
+            )
+    updated = sum(
+        1
+        for alias, target_id in targets
+        if alias in existing
+        and existing[alias].sync_generation is not None
+        and existing[alias].platform == platform
+        and existing[alias].target_id != target_id
+    )
+
     stmt = insert(Alias).values(
-        alias=alias,
-        context=context,
-        target_type=target_type,
-        platform=platform,
-        target_id=target_id,
+        [
+            {
+                "alias": alias,
+                "context": context,
+                "target_type": target_type,
+                "platform": platform,
+                "target_id": target_id,
+                "sync_generation": generation,
+            }
+            for alias, target_id in targets
+        ]
     )
-    stmt = stmt.on_conflict_do_nothing(
+    synced: list[ColumnElement[bool]] = [Alias.sync_generation.is_not(None)]
+    if adopt_unsynced:
+        synced.append(Alias.target_id == stmt.excluded.target_id)
+    stmt = stmt.on_conflict_do_update(
         index_elements=["alias", "context", "target_type"],
+        set_={
+            "platform": stmt.excluded.platform,
+            "target_id": stmt.excluded.target_id,
+            "sync_generation": stmt.excluded.sync_generation,
+        },
+        where=or_(*synced) & (Alias.platform == stmt.excluded.platform),
     )
     session.execute(stmt)
+    return added, updated
 
 
-def sync_from_slack(
+def needs_alias_adoption(session: Session, context: str, platform: str) -> bool:
+    """
+    Whether a sync of the platform should adopt untagged aliases (see
+    upsert_synced_aliases): only Slack syncs predate sync generations, and
+    only until the context holds a generation-tagged Slack alias.
+    """
+    if platform != SLACK:
+        return False
+    tagged = (
+        session.query(Alias.alias)
+        .filter(
+            Alias.context == context,
+            Alias.platform == platform,
+            Alias.sync_generation.is_not(None),
+        )
+        .first()
+    )
+    return tagged is None
+
+
+def next_sync_generation(session: Session, context: str) -> int:
+    """Generation of a new sync of the context, one past the latest stored."""
+    current = (
+        session.query(func.max(Alias.sync_generation))
+        .filter(Alias.context == context)
+        .scalar()
+    )
+    return (current or 0) + 1
+
+
+def _prune_synced_aliases(
+    session: Session, context: str, platform: str, generation: int
+) -> int:
+    """
+    Delete synced aliases of a platform from generations before the given
+    one, i.e. those the latest sync did not see. Manual aliases are kept.
+    Returns the number of aliases pruned.
+    """
+    return (
+        session.query(Alias)
+        .filter(
+            Alias.context == context,
+            Alias.platform == platform,
+            Alias.sync_generation.is_not(None),
+            Alias.sync_generation < generation,
+        )
+        .delete(synchronize_session=False)
+    )
+
+
+def _prune_synced_aliases_for_targets(
     session: Session,
-    client: WebClient,
     context: str,
-) -> dict[str, int]:
+    target_type: str,
+    target_ids: list[str],
+) -> int:
     """
-    Sync users and channels from Slack API to rolodex.
-    Creates aliases using username/channel_name as the alias.
-    Preserves existing aliases (does not overwrite manual entries).
-    Returns {"users": count, "channels": count}.
+    Delete synced aliases pointing at the given targets, e.g. users an
+    incremental sync saw deactivated. Manual aliases are kept.
+    Returns the number of aliases pruned.
     """
-    users_count = 0
-    channels_count = 0
+    if not target_ids:
+        return 0
+    return (
+        session.query(Alias)
+        .filter(
+            Alias.context == context,
+            Alias.target_type == target_type,
+            Alias.target_id.in_(target_ids),
+            Alias.sync_generation.is_not(None),
+        )
+        .delete(synchronize_session=False)
+    )
 
-    # Sync users
-    cursor: str | None = None
-    while True:
-        response = client.users_list(cursor=cursor, limit=200)
 
-        for member in response["members"]:
-            if member.get("deleted"):
-                continue
-            username = member.get("name")
-            if username:
-                _insert_alias_if_not_exists(
-                    session,
-                    alias=username,
-                    context=context,
-                    target_type=USER,
-                    platform=SLACK,
-                    target_id=member["id"],
-                )
-                users_count += 1
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching how SQLite stores it."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _changed_since_stored(stmt: Any, model: Any, volatile: tuple[str, ...] = ()) -> Any:
+    """
+    ON CONFLICT condition that only rewrites a directory row when its Slack
+    `updated` stamp differs from the stored one, or either is unknown, or one
+    of the volatile columns (which change without a new stamp) differs.
+    """
+    return or_(
+        stmt.excluded.updated.is_(None),
+        model.updated.is_(None),
+        stmt.excluded.updated != model.updated,
+        *(
+            getattr(model, column).is_distinct_from(stmt.excluded[column])
+            for column in volatile
+        ),
+    )
+
+
+def upsert_channel_directory(
+    session: Session,
+    context: str,
+    channels: list[dict[str, Any]],
+    fetched_at: datetime | None = None,
+) -> int:
+    """
+    Insert or update channel directory entries from conversations.list objects.
+    Existing entries whose Slack `updated` stamp, member count, topic and
+    purpose are all unchanged are not rewritten. Returns the number of entries
+    submitted.
+    """
+    if fetched_at is None:
+        fetched_at = utcnow()
+
+    rows = [
+        {
+            "context": context,
+            "channel_id": channel["id"],
+            "name": channel["name"],
+            "channel_type": (
+                "private_channel" if channel.get("is_private") else "public_channel"
+            ),
+            "is_archived": bool(channel.get("is_archived")),
+            "num_members": channel.get("num_members"),
+            "topic": (channel.get("topic") or {}).get("value") or None,
+            "purpose": (channel.get("purpose") or {}).get("value") or None,
+            "updated": channel.get("updated"),
+            "fetched_at": fetched_at,
+        }
+        for channel in channels
+        if channel.get("id") and channel.get("name")
+    ]
+    if not rows:
+        return 0
+
+    stmt = insert(ChannelDirectoryEntry).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["context", "channel_id"],
+        set_={
+            "name": stmt.excluded.name,
+            "channel_type": stmt.excluded.channel_type,
+            "is_archived": stmt.excluded.is_archived,
+            "num_members": stmt.excluded.num_members,
+            "topic": stmt.excluded.topic,
+            "purpose": stmt.excluded.purpose,
+            "updated": stmt.excluded.updated,
+            "fetched_at": stmt.excluded.fetched_at,
+        },
+        where=_changed_since_stored(
+            stmt, ChannelDirectoryEntry, CHANNEL_VOLATILE_COLUMNS
+        ),
+    )
+    session.execute(stmt)
+    invalidate_resolution_misses(
+        session, [row["name"] for row in rows], context, CHANNEL
+    )
+    return len(rows)
+
+
+def lookup_channel_directory(
+    session: Session,
+    name: str,
+    context: str,
+) -> ChannelDirectoryEntry | None:
+    """
+    Lookup a channel by name in the directory.
+    If a rename left several entries with the same name, the most recently
+    fetched one wins.
+    """
+    return (
+        session.query(ChannelDirectoryEntry)
+        .filter(
+            ChannelDirectoryEntry.context == context,
+            ChannelDirectoryEntry.name == name,
+        )
+        .order_by(ChannelDirectoryEntry.fetched_at.desc())
+        .first()
+    )
 
-        response_metadata = response.get("response_metadata")
-        cursor = response_metadata.get("next_cursor") if response_metadata else None
-        if not cursor:
+
+def lookup_channel_directory_many(
+    session: Session,
+    names: list[str],
+    context: str,
+) -> dict[str, ChannelDirectoryEntry]:
+    """Lookup many channel names in the directory with one IN query."""
+    if not names:
+        return {}
+    entries = (
+        session.query(ChannelDirectoryEntry)
+        .filter(
+            ChannelDirectoryEntry.context == context,
+            ChannelDirectoryEntry.name.in_(set(names)),
+        )
+        .order_by(ChannelDirectoryEntry.fetched_at)
+    )
+    # Ascending fetched_at, so the most recently fetched entry for a name wins.
+    return {entry.name: entry for entry in entries}
+
+
+def _user_directory_row(
+    context: str,
+    member: dict[str, Any],
+    fetched_at: datetime,
+) -> dict[str, Any]:
+    """Build a user_directory row from a users.list member object."""
+    profile = member.get("profile") or {}
+    email = profile.get("email")
+    return {
+        "context": context,
+        "user_id": member["id"],
+        "name": member["name"],
+        "real_name": member.get("real_name") or profile.get("real_name") or None,
+        "display_name": profile.get("display_name") or None,
+        "email": email.lower() if email else None,
+        "is_deleted": bool(member.get("deleted")),
+        "is_bot": bool(member.get("is_bot")),
+        "title": profile.get("title") or None,
+        "timezone": member.get("tz") or None,
+        "updated": member.get("updated"),
+        "fetched_at": fetched_at,
+    }
+
+
+def upsert_user_directory(
+    session: Session,
+    context: str,
+    members: list[dict[str, Any]],
+    fetched_at: datetime | None = None,
+) -> int:
+    """
+    Insert or update user directory entries from users.list member objects.
+    Deleted members are stored with is_deleted set. Existing entries whose
+    Slack `updated` stamp is unchanged are not rewritten. Returns the number
+    of entries submitted.
+    """
+    if fetched_at is None:
+        fetched_at = utcnow()
+
+    rows = [
+        _user_directory_row(context, member, fetched_at)
+        for member in members
+        if member.get("id") and member.get("name")
+    ]
+    if not rows:
+        return 0
+
+    stmt = insert(UserDirectoryEntry).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["context", "user_id"],
+        set_={
+            "name": stmt.excluded.name,
+            "real_name": stmt.excluded.real_name,
+            "display_name": stmt.excluded.display_name,
+            "email": stmt.excluded.email,
+            "is_deleted": stmt.excluded.is_deleted,
+            "is_bot": stmt.excluded.is_bot,
+            "title": stmt.excluded.title,
+            "timezone": stmt.excluded.timezone,
+            "updated": stmt.excluded.updated,
+            "fetched_at": stmt.excluded.fetched_at,
+        },
+        where=_changed_since_stored(stmt, UserDirectoryEntry, USER_VOLATILE_COLUMNS),
+    )
+    session.execute(stmt)
+    invalidate_resolution_misses(
+        session,
+        [
+            value
+            for row in rows
+            if not row["is_deleted"]
+            for value in (
+                row["name"],
+                row["real_name"],
+                row["display_name"],
+                row["email"],
+            )
+            if value
+        ],
+        context,
+        USER,
+    )
+    return len(rows)
+
+
+def lookup_user_directory(
+    session: Session,
+    identifier: str,
+    context: str,
+) -> UserDirectoryEntry | None:
+    """
+    Lookup a user in the directory by username, email (case-insensitive),
+    display name or real name, in that order. Each probe is one indexed query.
+    Deactivated users are not returned.
+    """
+    probes = [
+        UserDirectoryEntry.name == identifier,
+        UserDirectoryEntry.email == identifier.lower(),
+        UserDirectoryEntry.display_name == identifier,
+        UserDirectoryEntry.real_name == identifier,
+    ]
+    for probe in probes:
+        entry = (
+            session.query(UserDirectoryEntry)
+            .filter(
+                UserDirectoryEntry.context == context,
+                UserDirectoryEntry.is_deleted.is_(False),
+                probe,
+            )
+            .order_by(UserDirectoryEntry.fetched_at.desc())
+            .first()
+        )
+        if entry is not None:
+            return entry
+    return None
+
+
+def lookup_user_directory_many(
+    session: Session,
+    identifiers: list[str],
+    context: str,
+) -> dict[str, UserDirectoryEntry]:
+    """
+    Lookup many users in the directory, with the same precedence as
+    lookup_user_directory. Runs one IN query per lookup column. Deactivated
+    users are not returned.
+    """
+    found: dict[str, UserDirectoryEntry] = {}
+    pending = set(identifiers)
+    probes: list[tuple[Any, Any]] = [
+        (UserDirectoryEntry.name, lambda identifier: identifier),
+        (UserDirectoryEntry.email, lambda identifier: identifier.lower()),
+        (UserDirectoryEntry.display_name, lambda identifier: identifier),
+        (UserDirectoryEntry.real_name, lambda identifier: identifier),
+    ]
+    for column, normalize in probes:
+        if not pending:
             break
+        keys: dict[str, list[str]] = {}
+        for identifier in pending:
+            keys.setdefault(normalize(identifier), []).append(identifier)
+        entries = (
+            session.query(UserDirectoryEntry)
+            .filter(
+                UserDirectoryEntry.context == context,
+                UserDirectoryEntry.is_deleted.is_(False),
+                column.in_(keys),
+            )
+            .order_by(UserDirectoryEntry.fetched_at)
+        )
+        for entry in entries:
+            for identifier in keys.get(getattr(entry, column.key), []):
+                found[identifier] = entry
+        pending -= found.keys()
+    return found
+
+
+def get_user_directory_entries(
+    session: Session,
+    context: str,
+    user_ids: list[str],
+) -> dict[str, UserDirectoryEntry]:
+    """Directory entries for user IDs, deactivated users included, by ID."""
+    if not user_ids:
+        return {}
+    entries = session.query(UserDirectoryEntry).filter(
+        UserDirectoryEntry.context == context,
+        UserDirectoryEntry.user_id.in_(set(user_ids)),
+    )
+    return {entry.user_id: entry for entry in entries}
+
+
+def get_channel_directory_entries(
+    session: Session,
+    context: str,
+    channel_ids: list[str],
+) -> dict[str, ChannelDirectoryEntry]:
+    """Directory entries for channel IDs, archived channels included, by ID."""
+    if not channel_ids:
+        return {}
+    entries = session.query(ChannelDirectoryEntry).filter(
+        ChannelDirectoryEntry.context == context,
+        ChannelDirectoryEntry.channel_id.in_(set(channel_ids)),
+    )
+    return {entry.channel_id: entry for entry in entries}
+
+
+def user_directory_details(entry: UserDirectoryEntry) -> dict[str, Any]:
+    """JSON-ready profile fields of a user directory entry."""
+    return {
+        "name": entry.name,
+        "real_name": entry.real_name,
+        "display_name": entry.display_name,
+        "email": entry.email,
+        "title": entry.title,
+        "timezone": entry.timezone,
+        "is_bot": entry.is_bot,
+        "is_deleted": entry.is_deleted,
+    }
+
+
+def channel_directory_details(entry: ChannelDirectoryEntry) -> dict[str, Any]:
+    """JSON-ready attributes of a channel directory entry."""
+    return {
+        "name": entry.name,
+        "channel_type": entry.channel_type,
+        "num_members": entry.num_members,
+        "topic": entry.topic,
+        "purpose": entry.purpose,
+        "is_archived": entry.is_archived,
+    }
+
+
+def directory_details(
+    session: Session,
+    context: str,
+    aliases: list[Any],
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """
+    Directory details for Slack user and channel aliases (Alias objects or
+    iter_aliases rows), keyed by (target_type, target_id). Runs one IN query
+    per target type; aliases without a directory entry are left out.
+    """
+    slack = [alias for alias in aliases if alias.platform == SLACK]
+    users = get_user_directory_entries(
+        session,
+        context,
+        [alias.target_id for alias in slack if alias.target_type == "user"],
+    )
+    channels = get_channel_directory_entries(
+        session,
+        context,
+        [alias.target_id for alias in slack if alias.target_type == "channel"],
+    )
+    details: dict[tuple[str, str], dict[str, Any]] = {}
+    for user_id, user in users.items():
+        details[("user", user_id)] = user_directory_details(user)
+    for channel_id, channel in channels.items():
+        details[("channel", channel_id)] = channel_directory_details(channel)
+    return details
+
+
+def check_message_target(
+    session: Session,
+    client: WebClient,
+    context: str,
+    channel_id: str | None = None,
+    user_id: str | None = None,
+) -> None:
+    """
+    Raise ValueError if a message to channel_id, or a DM to user_id, cannot
+    be delivered: the channel is archived or the user is deactivated.
+
+    The directory answers first. Its entries can be up to DIRECTORY_TTL old,
+    so a target it flags is looked up again (conversations.info or
+    users.info) and its entry updated before the target is rejected. Targets
+    missing from the directory pass unchecked, as do flagged targets whose
+    lookup fails; Slack then decides when the message is sent.
+    """
+    if user_id is not None:
+        user = get_user_directory_entries(session, context, [user_id]).get(user_id)
+        if user is not None and user.is_deleted:
+            member = _fetch_directory_entity(client, USER, user_id)
+            if member is not None:
+                upsert_user_directory(session, context, [member])
+                if member.get("deleted"):
+                    raise ValueError(f"User {user.name} ({user_id}) is deactivated.")
+    if channel_id is not None:
+        channels = get_channel_directory_entries(session, context, [channel_id])
+        channel = channels.get(channel_id)
+        if channel is not None and channel.is_archived:
+            current = _fetch_directory_entity(client, CHANNEL, channel_id)
+            if current is not None:
+                upsert_channel_directory(session, context, [current])
+                if current.get("is_archived"):
+                    raise ValueError(
+                        f"Channel #{channel.name} ({channel_id}) is archived."
+                    )
+
+
+def _fetch_directory_entity(
+    client: WebClient, target_type: str, target_id: str
+) -> dict[str, Any] | None:
+    """
+    A user from users.info or a channel from conversations.info, or None if
+    the call fails.
+    """
+    try:
+        if target_type == USER:
+            return client.users_info(user=target_id)["user"]
+        return client.conversations_info(channel=target_id)["channel"]
+    except SlackApiError:
+        return None
+
+
+def get_negative_cache_ttl() -> timedelta:
+    """Negative cache TTL, from CLACKS_NEGATIVE_CACHE_TTL if set."""
+    raw = os.environ.get("CLACKS_NEGATIVE_CACHE_TTL")
+    if raw is None:
+        return NEGATIVE_CACHE_TTL
+    try:
+        return timedelta(seconds=float(raw))
+    except ValueError:
+        raise ValueError(
+            f"Invalid CLACKS_NEGATIVE_CACHE_TTL '{raw}'. Expected seconds."
+        )
+
+
+def record_resolution_misses(
+    session: Session,
+    identifiers: list[str],
+    context: str,
+    target_type: str,
+) -> None:
+    """Remember identifiers that failed to resolve, and drop expired entries."""
+    ttl = get_negative_cache_ttl()
+    if ttl <= timedelta(0):
+        return
+    now = utcnow()
+    session.query(ResolutionMiss).filter(
+        ResolutionMiss.context == context,
+        ResolutionMiss.missed_at < now - ttl,
+    ).delete(synchronize_session=False)
+    if not identifiers:
+        return
+
+    stmt = insert(ResolutionMiss).values(
+        [
+            {
+                "context": context,
+                "target_type": target_type,
+                "identifier": identifier,
+                "missed_at": now,
+            }
+            for identifier in set(identifiers)
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["context", "target_type", "identifier"],
+        set_={"missed_at": stmt.excluded.missed_at},
+    )
+    session.execute(stmt)
+
+
+def recent_resolution_misses(
+    session: Session,
+    identifiers: list[str],
+    context: str,
+    target_type: str,
+) -> set[str]:
+    """Return the identifiers that failed to resolve within the TTL."""
+    ttl = get_negative_cache_ttl()
+    if not identifiers or ttl <= timedelta(0):
+        return set()
+    rows = session.query(ResolutionMiss.identifier).filter(
+        ResolutionMiss.context == context,
+        ResolutionMiss.target_type == target_type,
+        ResolutionMiss.identifier.in_(set(identifiers)),
+        ResolutionMiss.missed_at >= utcnow() - ttl,
+    )
+    return {identifier for (identifier,) in rows}
+
+
+def invalidate_resolution_misses(
+    session: Session,
+    identifiers: list[str],
+    context: str,
+    target_type: str,
+) -> None:
+    """
+    Forget misses for identifiers that are now known to exist.
+    Matches case-insensitively so that email lookups are covered.
+    """
+    if not identifiers:
+        return
+    lowered = {identifier.lower() for identifier in identifiers}
+    session.query(ResolutionMiss).filter(
+        ResolutionMiss.context == context,
+        ResolutionMiss.target_type == target_type,
+        func.lower(ResolutionMiss.identifier).in_(lowered),
+    ).delete(synchronize_session=False)
+
+
+def get_directory_sync_state(
+    session: Session,
+    context: str,
+    target_type: str,
+) -> DirectorySyncState | None:
+    """Get refresh progress for a directory."""
+    return session.get(DirectorySyncState, (context, target_type))
+
+
+def _set_directory_sync_state(
+    session: Session,
+    context: str,
+    target_type: str,
+    cursor: str | None,
+    refreshed_at: datetime | None = None,
+    watermark: int | None = None,
+) -> None:
+    """
+    Record refresh progress. refreshed_at and watermark are only overwritten
+    when given.
+    """
+    values: dict[str, Any] = {
+        "context": context,
+        "target_type": target_type,
+        "cursor": cursor,
+    }
+    set_: dict[str, Any] = {"cursor": cursor}
+    if refreshed_at is not None:
+        values["refreshed_at"] = refreshed_at
+        set_["refreshed_at"] = refreshed_at
+    if watermark is not None:
+        values["watermark"] = watermark
+        set_["watermark"] = watermark
+    stmt = insert(DirectorySyncState).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["context", "target_type"],
+        set_=set_,
+    )
+    session.execute(stmt)
+
+
+def mark_directory_refreshed(
+    session: Session,
+    context: str,
+    target_type: str,
+) -> None:
+    """Record that a full pass over the directory has just completed."""
+    _set_directory_sync_state(
+        session, context, target_type, cursor=None, refreshed_at=utcnow()
+    )
+
+
+def is_directory_stale(
+    session: Session,
+    context: str,
+    target_type: str,
+    ttl: timedelta = DIRECTORY_TTL,
+) -> bool:
+    """True if the directory has never completed a refresh or is older than ttl."""
+    state = get_directory_sync_state(session, context, target_type)
+    if state is None or state.refreshed_at is None:
+        return True
+    return utcnow() - state.refreshed_at > ttl
+
+
+def _fetch_directory_page(
+    client: WebClient,
+    target_type: str,
+    cursor: str | None,
+) -> Any:
+    """Fetch one users.list or conversations.list page."""
+    if target_type == USER:
+        return client.users_list(cursor=cursor, limit=200)
+    return client.conversations_list(
+        types="public_channel,private_channel", limit=200, cursor=cursor
+    )
+
+
+def _upsert_directory_page(
+    session: Session,
+    context: str,
+    target_type: str,
+    response: Any,
+) -> int:
+    """Write a users.list or conversations.list page into its directory."""
+    if target_type == USER:
+        return upsert_user_directory(session, context, response["members"])
+    return upsert_channel_directory(session, context, response["channels"])
+
+
+def refresh_directory_page(
+    session: Session,
+    client: WebClient,
+    context: str,
+    target_type: str,
+) -> bool:
+    """
+    Fetch one page into the user or channel directory, resuming from the
+    stored cursor. Returns True when the refresh pass is complete.
+    """
+    state = get_directory_sync_state(session, context, target_type)
+    cursor = state.cursor if state is not None else None
+
+    try:
+        response = _fetch_directory_page(client, target_type, cursor)
+    except SlackApiError as e:
+        # Stored cursors can expire between runs; start the pass over.
+        if cursor is None or e.response.get("error") != "invalid_cursor":
+            raise
+        response = _fetch_directory_page(client, target_type, None)
+    _upsert_directory_page(session, context, target_type, response)
+
+    response_metadata = response.get("response_metadata")
+    next_cursor = response_metadata.get("next_cursor") if response_metadata else None
+    if next_cursor:
+        _set_directory_sync_state(session, context, target_type, cursor=next_cursor)
+        session.flush()
+        return False
+
+    _set_directory_sync_state(
+        session, context, target_type, cursor=None, refreshed_at=utcnow()
+    )
+    session.flush()
+    return True
+
 
-    # Sync channels
-    cursor = None
+def refresh_directory(
+    session: Session,
+    client: WebClient,
+    context: str,
+    target_type: str,
+    commit_each_page: bool = False,
+) -> None:
+    """
+    Run a user or channel directory refresh to completion.
+    With commit_each_page, progress survives interruption: the next refresh
+    resumes from the last committed page instead of starting over.
+    """
     while True:
-        response = client.conversations_list(
-            cursor=cursor,
-            limit=200,
-            types="public_channel,private_channel",
-        )
-
-        for channel in response["channels"]:
-            channel_name = channel.get("name")
-            if channel_name:
-                _insert_alias_if_not_exists(
-                    session,
-                    alias=channel_name,
-                    context=context,
-                    target_type=CHANNEL,
-                    platform=SLACK,
-                    target_id=channel["id"],
+        done = refresh_directory_page(session, client, context, target_type)
+        if commit_each_page:
+            session.commit()
+        if done:
+            return
+
+
+def start_background_directory_refresh(
+    session: Session,
+    client: WebClient,
+    context: str,
+    target_type: str,
+) -> threading.Thread | None:
+    """
+    Refresh a directory in a daemon thread with its own session.
+    Best effort: errors are swallowed, and a refresh cut short by process exit
+    resumes from its stored cursor next time. Returns None if a refresh of the
+    same directory is already running in this process.
+    """
+    engine = session.get_bind().engine
+    key = (str(engine.url), context, target_type)
+    with _background_refreshes_lock:
+        if key in _background_refreshes:
+            return None
+        _background_refreshes.add(key)
+
+    def run() -> None:
+        try:
+            with Session(engine) as background_session:
+                refresh_directory(
+                    background_session,
+                    client,
+                    context,
+                    target_type,
+                    commit_each_page=True,
                 )
-                channels_count += 1
+        except Exception:
+            pass
+        finally:
+            with _background_refreshes_lock:
+                _background_refreshes.discard(key)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
 
-        response_metadata = response.get("response_metadata")
-        cursor = response_metadata.get("next_cursor") if response_metadata else None
-        if not cursor:
-            break
 
+def get_dm_channel(session: Session, user_id: str, context: str) -> str | None:
+    """Lookup the cached DM channel ID for a user."""
+    dm_channel = session.get(DMChannel, (context, user_id))
+    return dm_channel.channel_id if dm_channel is not None else None
+
+
+def set_dm_channel(
+    session: Session,
+    user_id: str,
+    context: str,
+    channel_id: str,
+) -> None:
+    """Cache the DM channel ID for a user."""
+    stmt = insert(DMChannel).values(
+        context=context, user_id=user_id, channel_id=channel_id
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["context", "user_id"],
+        set_={"channel_id": stmt.excluded.channel_id},
+    )
+    session.execute(stmt)
     session.flush()
-    return {"users": users_count, "channels": channels_count}
+
+
+# Fetched pages allowed to queue up per context ahead of the single writer.
+SYNC_QUEUE_SIZE = 8
+
+
+@dataclass
+class _ContextSync:
+    """Progress of one context's sync while its pages are being written."""
+
+    generation: int
+    watermarks: dict[str, int | None]
+    incremental: bool
+    started: float
+    adopt_unsynced: bool = False
+    highest: dict[str, int | None] = field(default_factory=dict)
+    counts: dict[str, dict[str, int]] = field(default_factory=dict)
+    timings: dict[str, float] = field(
+        default_factory=lambda: {
+            "users_fetch": 0.0,
+            "users_write": 0.0,
+            "channels_fetch": 0.0,
+            "channels_write": 0.0,
+            "prune": 0.0,
+        }
+    )
+
+
+def _phase_name(target_type: str) -> str:
+    return "users" if target_type == USER else "channels"
+
+
+def _start_context_sync(
+    session: Session,
+    context: str,
+    since_last: bool,
+) -> _ContextSync:
+    """
+    Pick the sync mode and generation for a context. An incremental sync
+    needs watermarks from a previous sync for both users and channels.
+    """
+    watermarks: dict[str, int | None] = {USER: None, CHANNEL: None}
+    if since_last:
+        for target_type in watermarks:
+            state = get_directory_sync_state(session, context, target_type)
+            watermarks[target_type] = state.watermark if state is not None else None
+    incremental = all(watermark is not None for watermark in watermarks.values())
+    if incremental:
+        generation = max(next_sync_generation(session, context) - 1, 1)
+    else:
+        watermarks = {USER: None, CHANNEL: None}
+        generation = next_sync_generation(session, context)
+
+    return _ContextSync(
+        generation=generation,
+        watermarks=watermarks,
+        incremental=incremental,
+        started=time.perf_counter(),
+        # Decided before the first page tags any alias
+        adopt_unsynced=needs_alias_adoption(session, context, SLACK),
+        highest=dict(watermarks),
+        counts={
+            target_type: {
+                "synced": 0,
+                "added": 0,
+                "updated": 0,
+                "skipped": 0,
+                "pruned": 0,
+            }
+            for target_type in (USER, CHANNEL)
+        },
+    )
+
+
+def _write_sync_page(
+    session: Session,
+    context: str,
+    target_type: str,
+    response: Any,
+    sync: _ContextSync,
+) -> None:
+    """
+    Write one users.list or conversations.list page into the directory and
+    aliases. With a watermark, rows whose Slack `updated` stamp is not newer
+    are skipped without touching the database, and synced aliases of rows
+    that became deleted or archived are pruned directly.
+    """
+    counts = sync.counts[target_type]
+    watermark = sync.watermarks[target_type]
+    items = response["members" if target_type == USER else "channels"]
+
+    stamps = [item["updated"] for item in items if item.get("updated") is not None]
+    highest = sync.highest[target_type]
+    if stamps and (highest is None or max(stamps) > highest):
+        sync.highest[target_type] = max(stamps)
+    if watermark is not None:
+        changed = [
+            item
+            for item in items
+            if item.get("updated") is None or item["updated"] > watermark
+        ]
+        counts["skipped"] += len(items) - len(changed)
+        items = changed
+
+    if target_type == USER:
+        upsert_user_directory(session, context, items)
+    else:
+        upsert_channel_directory(session, context, items)
+
+    # Deleted users and archived channels get no alias.
+    gone = {
+        item["id"] for item in items if item.get("deleted") or item.get("is_archived")
+    }
+    targets = [
+        (item["name"], item["id"])
+        for item in items
+        if item.get("name") and item["id"] not in gone
+    ]
+    added, updated = upsert_synced_aliases(
+        session,
+        context,
+        target_type,
+        SLACK,
+        targets,
+        sync.generation,
+        adopt_unsynced=sync.adopt_unsynced,
+    )
+    counts["synced"] += len(targets)
+    counts["added"] += added
+    counts["updated"] += updated
+    if watermark is not None:
+        counts["pruned"] += _prune_synced_aliases_for_targets(
+            session, context, target_type, list(gone)
+        )
+
+
+def _finish_context_sync(
+    session: Session,
+    context: str,
+    sync: _ContextSync,
+) -> dict[str, Any]:
+    """Sweep old generations, record watermarks and build the sync result."""
+    users = sync.counts[USER]
+    channels = sync.counts[CHANNEL]
+    pruned = users["pruned"] + channels["pruned"]
+    if not sync.incremental:
+        started = time.perf_counter()
+        pruned += _prune_synced_aliases(session, context, SLACK, sync.generation)
+        sync.timings["prune"] += time.perf_counter() - started
+
+    synced_at = utcnow()
+    for target_type in (USER, CHANNEL):
+        _set_directory_sync_state(
+            session,
+            context,
+            target_type,
+            cursor=None,
+            refreshed_at=synced_at,
+            watermark=sync.highest[target_type],
+        )
+    session.flush()
+    forget_memoized_resolutions(context)
+
+    timings = {phase: round(seconds, 3) for phase, seconds in sync.timings.items()}
+    timings["total"] = round(time.perf_counter() - sync.started, 3)
+    return {
+        "users": users["synced"],
+        "channels": channels["synced"],
+        "added": users["added"] + channels["added"],
+        "updated": users["updated"] + channels["updated"],
+        "skipped": users["skipped"] + channels["skipped"],
+        "pruned": pruned,
+        "incremental": sync.incremental,
+        "timings": timings,
+    }
+
+
+def _put_until_stopped(
+    pages: "queue.Queue[Any]",
+    item: Any,
+    stop: threading.Event,
+) -> None:
+    """Put on a bounded queue, giving up once the writer has stopped."""
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _fetch_sync_pages(
+    client: WebClient,
+    context: str,
+    target_type: str,
+    pages: "queue.Queue[Any]",
+    stop: threading.Event,
+) -> None:
+    """
+    Producer for one (context, target type) stream. Puts
+    (context, target_type, response, seconds) on the queue for every page,
+    then a final item whose response is None. If a fetch fails, the
+    exception is put in place of the response and the stream ends.
+    """
+    cursor: str | None = None
+    try:
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = _fetch_directory_page(client, target_type, cursor)
+            seconds = time.perf_counter() - started
+            _put_until_stopped(pages, (context, target_type, response, seconds), stop)
+            response_metadata = response.get("response_metadata")
+            cursor = response_metadata.get("next_cursor") if response_metadata else None
+            if not cursor:
+                break
+    except Exception as e:
+        _put_until_stopped(pages, (context, target_type, e, 0.0), stop)
+        return
+    _put_until_stopped(pages, (context, target_type, None, 0.0), stop)
+
+
+def _sync_contexts(
+    session: Session,
+    clients: dict[str, WebClient],
+    since_last: bool,
+) -> tuple[dict[str, dict[str, Any]], dict[str, Exception]]:
+    """
+    Sync users and channels for every context at once.
+
+    Every (context, target type) stream is fetched by its own thread, since
+    each is an independent cursor on its own rate-limit bucket. SQLite allows
+    one writer, so all pages are written by the calling thread through the
+    given session as they arrive.
+    Returns (results, errors), keyed by context. A context whose fetch
+    failed has an error instead of a result; its pages written so far are
+    kept, but no pruning is done and its watermarks are not advanced.
+    """
+    syncs = {
+        context: _start_context_sync(session, context, since_last)
+        for context in clients
+    }
+    pages: queue.Queue[Any] = queue.Queue(maxsize=SYNC_QUEUE_SIZE * len(clients))
+    stop = threading.Event()
+    streams = {
+        (context, target_type) for context in clients for target_type in (USER, CHANNEL)
+    }
+    threads = [
+        threading.Thread(
+            target=_fetch_sync_pages,
+            args=(clients[context], context, target_type, pages, stop),
+            name=f"clacks-sync-{context}-{target_type}",
+            daemon=True,
+        )
+        for context, target_type in sorted(streams)
+    ]
+    for thread in threads:
+        thread.start()
+
+    results: dict[str, dict[str, Any]] = {}
+    errors: dict[str, Exception] = {}
+    try:
+        while streams:
+            context, target_type, response, seconds = pages.get()
+            sync = syncs[context]
+            phase = _phase_name(target_type)
+            if isinstance(response, Exception):
+                errors.setdefault(context, response)
+                streams.discard((context, target_type))
+            elif response is None:
+                streams.discard((context, target_type))
+                context_done = all(c != context for c, _ in streams)
+                if context_done and context not in errors:
+                    results[context] = _finish_context_sync(session, context, sync)
+            elif context not in errors:
+                sync.timings[f"{phase}_fetch"] += seconds
+                started = time.perf_counter()
+                _write_sync_page(session, context, target_type, response, sync)
+                sync.timings[f"{phase}_write"] += time.perf_counter() - started
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    return results, errors
+
+
+def sync_from_slack(
+    session: Session,
+    client: WebClient,
+    context: str,
+    since_last: bool = False,
+) -> dict[str, Any]:
+    """
+    Sync users and channels from Slack API to rolodex.
+    Creates aliases using username/channel_name as the alias.
+    Preserves existing aliases (does not overwrite manual entries).
+    Also refreshes the user and channel directories.
+
+    Users and channels are fetched concurrently; every page is written with
+    one multi-row statement per table, all in the caller's transaction.
+
+    A full sync tags synced aliases with a new generation number. Once both
+    streams complete, synced aliases from older generations are pruned: these
+    belong to deleted users, archived channels, or names that have since
+    changed.
+
+    With since_last, rows whose Slack `updated` stamp is no newer than the
+    previous sync's watermark are skipped, so database writes scale with
+    churn. Aliases of users and channels seen deleted or archived are pruned,
+    but the generation sweep is skipped, so aliases left behind by renames
+    wait for the next full sync. Falls back to a full sync when there is no
+    watermark yet.
+
+    Returns {"users": count, "channels": count, "added": count,
+    "updated": count, "skipped": count, "pruned": count, "incremental": bool,
+    "timings": {...}}, where timings holds seconds spent fetching from Slack
+    and writing to the database for each stream, pruning, and in total.
+    """
+    results, errors = _sync_contexts(session, {context: client}, since_last)
+    if context in errors:
+        raise errors[context]
+    return results[context]
+
+
+def sync_contexts_from_slack(
+    session: Session,
+    clients: dict[str, WebClient],
+    since_last: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """
+    Sync several contexts in parallel, as sync_from_slack does for one.
+    clients maps context name to a client authenticated for it.
+    Returns {context: result}; a context that failed has {"error": message}
+    in place of the sync_from_slack result.
+    """
+    results, errors = _sync_contexts(session, clients, since_last)
+    for context, error in errors.items():
+        results[context] = {"error": str(error)}
+    return results
@@ -0,0 +1,294 @@
+"""
+Substring, prefix and fuzzy search over alias and directory names.
+
+Names are indexed by the trigram FTS5 tables aliases_fts, user_directory_fts
+and channel_directory_fts, which triggers keep in step with their source
+tables. A fragment of three or more characters is matched as a substring;
+fuzzy candidates are the few names sharing the most of its trigrams (by
+FTS5 rank) or, for fragments short enough that one typo can break every
+trigram, its first two characters, re-scored with difflib. Shorter
+fragments, which have no trigrams, are matched as case-sensitive prefixes on
+the name indexes.
+
+Run `python benchmarks/name_search.py` to time searches over 100k names.
+"""
+
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from slack_clacks.configuration.database import get_sqlite_connection
+from slack_clacks.rolodex.data import CHANNEL, SLACK, USER
+
+SEARCH_LIMIT = 20
+SUGGESTION_LIMIT = 5
+# Candidates fetched from each index: substring matches are cheap to score,
+# fuzzy ones go through difflib, so fewer are taken.
+CANDIDATE_LIMIT = 100
+FUZZY_CANDIDATE_LIMIT = 15
+# Fuzzy matches scoring below this similarity are dropped.
+FUZZY_CUTOFF = 0.6
+# Longest fragment in which a single transposition can break every trigram
+# _trigram_query matches on; longer fragments keep one, so names sharing
+# only their first two characters are not fetched for them.
+PREFIX_FALLBACK_LENGTH = 6
+
+ALIAS_SQL = """
+SELECT a.alias, a.target_type, a.target_id, a.platform
+FROM aliases_fts JOIN aliases AS a ON a.rowid = aliases_fts.rowid
+WHERE aliases_fts MATCH :query AND a.context = :context {filters}
+ORDER BY aliases_fts.rank LIMIT :limit
+"""
+
+USER_SQL = """
+SELECT u.user_id, u.name, u.real_name, u.display_name, u.email
+FROM user_directory_fts JOIN user_directory AS u
+    ON u.rowid = user_directory_fts.rowid
+WHERE user_directory_fts MATCH :query AND u.context = :context
+    AND NOT u.is_deleted
+ORDER BY user_directory_fts.rank LIMIT :limit
+"""
+
+CHANNEL_SQL = """
+SELECT c.channel_id, c.name
+FROM channel_directory_fts JOIN channel_directory AS c
+    ON c.rowid = channel_directory_fts.rowid
+WHERE channel_directory_fts MATCH :query AND c.context = :context
+ORDER BY channel_directory_fts.rank LIMIT :limit
+"""
+
+# Prefix matches as index range scans: :low <= name < :high.
+ALIAS_PREFIX_SQL = """
+SELECT a.alias, a.target_type, a.target_id, a.platform FROM aliases AS a
+WHERE a.context = :context AND a.alias >= :low AND a.alias < :high {filters}
+LIMIT :limit
+"""
+
+USER_PREFIX_SQL = """
+SELECT user_id, name, real_name, display_name, email FROM user_directory
+WHERE NOT is_deleted AND rowid IN (
+    SELECT rowid FROM user_directory
+    WHERE context = :context AND name >= :low AND name < :high
+    UNION SELECT rowid FROM user_directory
+    WHERE context = :context AND real_name >= :low AND real_name < :high
+    UNION SELECT rowid FROM user_directory
+    WHERE context = :context AND display_name >= :low AND display_name < :high
+    UNION SELECT rowid FROM user_directory
+    WHERE context = :context AND email >= :low AND email < :high
+)
+LIMIT :limit
+"""
+
+CHANNEL_PREFIX_SQL = """
+SELECT channel_id, name FROM channel_directory
+WHERE context = :context AND name >= :low AND name < :high
+LIMIT :limit
+"""
+
+
+@dataclass(frozen=True)
+class SearchMatch:
+    """
+    A name matching a search. source is "alias" or "directory"; score is 3
+    for an exact match, 2 to 3 for a prefix, 1 to 2 for a substring and the
+    difflib similarity (0 to 1) for a fuzzy match.
+    """
+
+    name: str
+    target_type: str
+    target_id: str
+    platform: str
+    source: str
+    score: float
+
+
+def _score(matcher: SequenceMatcher, query: str, name: str) -> float:
+    """
+    Score name against query, which is lower-case and already set as the
+    matcher's second sequence (so difflib indexes it once per search).
+    """
+    candidate = name.lower()
+    if candidate == query:
+        return 3.0
+    if candidate.startswith(query):
+        return 2.0 + len(query) / len(candidate)
+    if query in candidate:
+        return 1.0 + len(query) / len(candidate)
+    matcher.set_seq1(candidate)
+    if matcher.real_quick_ratio() < FUZZY_CUTOFF:
+        return 0.0
+    if matcher.quick_ratio() < FUZZY_CUTOFF:
+        return 0.0
+    return matcher.ratio()
+
+
+def _phrase(value: str) -> str:
+    """FTS5 string literal for value."""
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _trigram_query(fragment: str) -> str:
+    """
+    FTS5 query matching names that share a trigram with fragment. Every
+    other trigram (and the last) still covers each character, and halves the
+    postings FTS5 has to merge and rank.
+    """
+    value = fragment.lower()
+    starts = [*range(0, len(value) - 2, 2), len(value) - 3]
+    trigrams = sorted({value[i : i + 3] for i in starts})
+    return " OR ".join(_phrase(trigram) for trigram in trigrams)
+
+
+def _prefix_range(fragment: str) -> tuple[str, str]:
+    """Bounds of the strings starting with fragment, as low <= s < high."""
+    return fragment, fragment[:-1] + chr(ord(fragment[-1]) + 1)
+
+
+def _candidates(
+    session: Session,
+    context: str,
+    target_type: str | None,
+    platform: str | None,
+    query: str | None,
+    prefix: str | None,
+    limit: int = CANDIDATE_LIMIT,
+) -> list[tuple[list[str], str, str, str, str]]:
+    """
+    Rows matching an FTS5 query (or, without one, a name prefix) as
+    (names, target_type, target_id, platform, source) tuples.
+    """
+    low, high = _prefix_range(prefix) if prefix else (None, None)
+    params: dict[str, Any] = {
+        "context": context,
+        "query": query,
+        "low": low,
+        "high": high,
+        "limit": limit,
+    }
+    filters = ""
+    if target_type is not None:
+        filters += " AND a.target_type = :target_type"
+        params["target_type"] = target_type
+    if platform is not None:
+        filters += " AND a.platform = :platform"
+        params["platform"] = platform
+
+    # Raw sqlite3 statements: a search runs several small queries.
+    connection = get_sqlite_connection(session)
+    rows: list[tuple[list[str], str, str, str, str]] = []
+    alias_sql = ALIAS_SQL if query is not None else ALIAS_PREFIX_SQL
+    for alias, alias_type, target_id, alias_platform in connection.execute(
+        alias_sql.format(filters=filters), params
+    ):
+        rows.append(([alias], alias_type, target_id, alias_platform, "alias"))
+
+    if platform not in (None, SLACK):
+        return rows
+    if target_type in (None, USER):
+        user_sql = USER_SQL if query is not None else USER_PREFIX_SQL
+        for user_id, *names in connection.execute(user_sql, params):
+            rows.append(([n for n in names if n], USER, user_id, SLACK, "directory"))
+    if target_type in (None, CHANNEL):
+        channel_sql = CHANNEL_SQL if query is not None else CHANNEL_PREFIX_SQL
+        for channel_id, name in connection.execute(channel_sql, params):
+            rows.append(([name], CHANNEL, channel_id, SLACK, "directory"))
+    return rows
+
+
+def search_names(
+    session: Session,
+    fragment: str,
+    context: str,
+    target_type: str | None = None,
+    platform: str | None = None,
+    limit: int = SEARCH_LIMIT,
+    fuzzy: bool = True,
+) -> list[SearchMatch]:
+    """
+    Aliases and directory names matching fragment, best first, one match per
+    target. Exact, prefix and substring matches rank above fuzzy ones; with
+    fuzzy, names similar to fragment fill the remaining places. Deactivated
+    users are not matched.
+    """
+    fragment = fragment.strip().lstrip("#@")
+    if not fragment:
+        return []
+
+    if len(fragment) < 3:
+        rows = _candidates(session, context, target_type, platform, None, fragment)
+    else:
+        rows = _candidates(
+            session, context, target_type, platform, _phrase(fragment), None
+        )
+        fuzzy = fuzzy and len(rows) < limit
+        if fuzzy:
+            rows += _candidates(
+                session,
+                context,
+                target_type,
+                platform,
+                _trigram_query(fragment),
+                None,
+                FUZZY_CANDIDATE_LIMIT,
+            )
+        if fuzzy and len(fragment) <= PREFIX_FALLBACK_LENGTH:
+            # A transposition in a short name can break every trigram, so
+            # names sharing the first two characters are candidates too.
+            rows += _candidates(
+                session,
+                context,
+                target_type,
+                platform,
+                None,
+                fragment[:2],
+                FUZZY_CANDIDATE_LIMIT,
+            )
+
+    query = fragment.lower()
+    matcher = SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(query)
+    best: dict[tuple[str, str], SearchMatch] = {}
+    for names, row_type, target_id, row_platform, source in rows:
+        # Names differing only in case (name and real_name, say) score the
+        # same, so only the first of them is scored.
+        distinct = {name.lower(): name for name in reversed(names)}
+        score, name = max(
+            (_score(matcher, query, name), name) for name in distinct.values()
+        )
+        if score < FUZZY_CUTOFF:
+            continue
+        current = best.get((row_type, target_id))
+        if current is None or score > current.score:
+            best[(row_type, target_id)] = SearchMatch(
+                name=name,
+                target_type=row_type,
+                target_id=target_id,
+                platform=row_platform,
+                source=source,
+                score=round(score, 3),
+            )
+    matches = sorted(best.values(), key=lambda m: (-m.score, m.name))
+    return matches[:limit]
+
+
+def suggest_names(
+    session: Session,
+    identifier: str,
+    context: str,
+    target_type: str,
+    platform: str = SLACK,
+    limit: int = SUGGESTION_LIMIT,
+) -> list[str]:
+    """
+    Known names similar to an identifier that failed to resolve, best
+    first, for "did you mean" hints.
+    """
+    suggestions: list[str] = []
+    for match in search_names(
+        session, identifier, context, target_type, platform, limit=limit
+    ):
+        if match.name not in suggestions:
+            suggestions.append(match.name)
+    return suggestions
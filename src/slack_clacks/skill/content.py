@@ -43,6 +43,9 @@ uvx --from slack-clacks clacks rolodex sync
 uvx --from slack-clacks clacks rolodex list
 uvx --from slack-clacks clacks rolodex list -T user
 uvx --from slack-clacks clacks rolodex list -T channel
+
+# Resolve several names to IDs in one pass
+uvx --from slack-clacks clacks rolodex resolve alice bob -T user
 ```
 
 When composing messages that mention people or target specific
@@ -101,6 +104,12 @@ Reply to thread:
 uvx --from slack-clacks clacks send -c "#general" -m "Reply text" -t "1234567890.123456"
 ```
 
+Reply using a message link (channel comes from the link):
+```bash
+uvx --from slack-clacks clacks send -m "Reply text" \\
+  -t "https://workspace.slack.com/archives/C08740LGAE6/p1234567890123456"
+```
+
 ## Scheduling Messages
 
 Schedule a message for future delivery:
@@ -187,6 +196,12 @@ Read thread:
 uvx --from slack-clacks clacks read -c "#general" -t "1234567890.123456"
 ```
 
+Read a message from its link (no channel lookup needed):
+```bash
+uvx --from slack-clacks clacks read \\
+  -m "https://workspace.slack.com/archives/C08740LGAE6/p1234567890123456"
+```
+
 ## Recent Activity
 
 View recent messages across all conversations:
@@ -248,6 +263,47 @@ Listen to thread replies:
 uvx --from slack-clacks clacks listen "#general" --thread "1234567890.123456"
 ```
 
+Listen to several channels and threads at once (one process, one merged
+stream; each message carries its `channel_id`). A message link listens to
+that message's thread:
+```bash
+uvx --from slack-clacks clacks listen "#general" "#random" "https://workspace.slack.com/archives/C123/p1234567890123456"
+```
+
+Follow every thread in a channel too (replies come with their `thread_ts`).
+Only threads with new replies are polled, so the cost follows thread activity
+rather than the number of threads. Replies to older threads are noticed within
+about a minute. Threads whose parent is older than `--reply-window` seconds
+(default: one day) are not followed:
+```bash
+uvx --from slack-clacks clacks listen "#general" --with-replies --continuous
+```
+
+Receive messages as they are posted over Socket Mode instead of polling
+(needs an app-level `xapp-` token in `SLACK_APP_TOKEN` or `--app-token`, for an
+app subscribed to message events; falls back to polling if the connection
+drops):
+```bash
+uvx --from slack-clacks clacks listen "#general" --backend socket
+```
+
+Receive Events API callbacks on a local HTTP server, for deployments where an
+ingress forwards Slack's requests (the app's Request URL should point at
+`/slack/events`; needs the signing secret in `SLACK_SIGNING_SECRET` or
+`--signing-secret`; retried deliveries are dropped by `event_id`):
+```bash
+uvx --from slack-clacks clacks listen "#general" --backend events --host 0.0.0.0
+```
+
+Resume where the last run stopped: `--checkpoint NAME` saves the last message
+handled per channel or thread, and a restart with the same name first catches
+up on everything posted since (all pages), then listens live. Nothing is
+missed across restarts (a restart in the middle of a burst spanning several
+pages may repeat part of it):
+```bash
+uvx --from slack-clacks clacks listen "#general" "#alerts" --checkpoint ops --continuous
+```
+
 Filter by sender (wait for response from specific user):
 ```bash
 uvx --from slack-clacks clacks listen "#general" --from "@username"
@@ -259,7 +315,14 @@ uvx --from slack-clacks clacks listen "#general" --timeout 300
 ```
 
 Options:
-- `--interval SECONDS` - Poll interval (default: 2.0)
+- `--interval SECONDS` - Poll interval per channel (default: 2.0)
+- `--adaptive` - Poll quiet channels less often: double the interval after
+  each empty poll, up to `--max-interval` (default: 60), and return to
+  `--interval` when messages arrive
+- `--rate-limit N` - API calls per minute shared by all channels (default: 50).
+  A poll pages through a burst of more than 200 messages until it is drained,
+  each page a call; a channel's pages arrive newest first, messages within a
+  page oldest first
 - `--include-bots` - Include bot messages (excluded by default)
 - `-o FILE` - Write to file instead of stdout
 
@@ -299,7 +362,13 @@ uvx --from slack-clacks clacks config info
 ## Output
 
 All commands output JSON to stdout.
-The `listen` command outputs NDJSON (one JSON object per line).
+The `listen` command outputs NDJSON (one JSON object per line). When it stops
+it prints a status object to stderr with `messages_received`, the `backend`
+in use when it stopped (`poll`, `socket` or `events`, plus `fallback_reason`
+if Socket Mode fell back to polling, or `duplicate_events` for retried
+deliveries dropped by the `events` backend) and the effective poll interval
+of each channel (`intervals`). The `events` backend first prints a
+`listening` status with the URL it serves.
 """
 
 OPENAI_YAML = """\
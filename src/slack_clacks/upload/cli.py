@@ -13,6 +13,7 @@ from slack_clacks.configuration.database import (
     get_session,
 )
 from slack_clacks.messaging.operations import (
+    get_resolution_memo,
     open_dm_channel,
     resolve_channel_id,
     resolve_user_id,
@@ -59,12 +60,15 @@ def handle_upload(args: argparse.Namespace) -> None:
 
         client = create_client(context.access_token, context.app_type)
 
+        memo = get_resolution_memo(context.name)
         channel_id = None
         if args.channel:
-            channel_id = resolve_channel_id(client, args.channel, session, context.name)
+            channel_id = resolve_channel_id(
+                client, args.channel, session, context.name, memo
+            )
         elif args.user:
-            user_id = resolve_user_id(client, args.user, session, context.name)
-            channel_id = open_dm_channel(client, user_id)
+            user_id = resolve_user_id(client, args.user, session, context.name, memo)
+            channel_id = open_dm_channel(client, user_id, session, context.name, memo)
             if channel_id is None:
                 raise ValueError(f"Failed to open DM with user '{args.user}'.")
 
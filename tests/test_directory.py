@@ -0,0 +1,914 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from slack_sdk.errors import SlackApiError
+from sqlalchemy.orm import Session
+
+from slack_clacks.configuration.database import (
+    add_context,
+    get_db_path,
+    get_engine,
+    run_migrations,
+)
+from slack_clacks.messaging.exceptions import (
+    ClacksChannelNotFoundError,
+    ClacksUserNotFoundError,
+)
+from slack_clacks.messaging.operations import (
+    ResolutionMemo,
+    clear_resolution_memos,
+    get_resolution_memo,
+    open_dm_channel,
+    resolve_channel_id,
+    resolve_channels_many,
+    resolve_user_id,
+    resolve_users_many,
+)
+from slack_clacks.rolodex.operations import (
+    add_alias,
+    check_message_target,
+    get_channel_directory_entries,
+    get_directory_sync_state,
+    get_dm_channel,
+    get_user_directory_entries,
+    is_directory_stale,
+    lookup_channel_directory,
+    lookup_user_directory,
+    lookup_user_directory_many,
+    recent_resolution_misses,
+    refresh_directory,
+    refresh_directory_page,
+    remove_alias,
+    start_background_directory_refresh,
+    upsert_channel_directory,
+    upsert_user_directory,
+    utcnow,
+)
+from slack_clacks.rolodex.search import search_names
+
+
+def make_page(channels: list[dict], next_cursor: str = "") -> dict:
+    return {"channels": channels, "response_metadata": {"next_cursor": next_cursor}}
+
+
+class DirectoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+
+        with Session(self.engine) as session:
+            add_context(
+                session,
+                name="test-ctx",
+                access_token="fake-token",
+                user_id="U000000001",
+                workspace_id="T000000001",
+                app_type="clacks",
+            )
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+
+class TestChannelDirectory(DirectoryTestCase):
+    def test_upsert_and_lookup(self):
+        with Session(self.engine) as session:
+            upsert_channel_directory(
+                session,
+                "test-ctx",
+                [
+                    {"id": "C001", "name": "general"},
+                    {"id": "G002", "name": "secret", "is_private": True},
+                    {"id": "C003", "name": "old", "is_archived": True},
+                ],
+            )
+            session.commit()
+
+        with Session(self.engine) as session:
+            general = lookup_channel_directory(session, "general", "test-ctx")
+            secret = lookup_channel_directory(session, "secret", "test-ctx")
+            old = lookup_channel_directory(session, "old", "test-ctx")
+            missing = lookup_channel_directory(session, "nope", "test-ctx")
+
+        assert general is not None and secret is not None and old is not None
+        self.assertEqual(general.channel_id, "C001")
+        self.assertEqual(general.channel_type, "public_channel")
+        self.assertEqual(secret.channel_type, "private_channel")
+        self.assertTrue(old.is_archived)
+        self.assertIsNone(missing)
+
+    def test_channel_attributes_are_stored(self):
+        channel = {
+            "id": "C001",
+            "name": "general",
+            "num_members": 42,
+            "topic": {"value": "Announcements"},
+            "purpose": {"value": ""},
+        }
+        with Session(self.engine) as session:
+            upsert_channel_directory(session, "test-ctx", [channel])
+            session.commit()
+
+        with Session(self.engine) as session:
+            entry = get_channel_directory_entries(session, "test-ctx", ["C001"])["C001"]
+            self.assertEqual(entry.num_members, 42)
+            self.assertEqual(entry.topic, "Announcements")
+            self.assertIsNone(entry.purpose)
+
+    def test_member_count_and_topic_update_without_new_stamp(self):
+        channel = {"id": "C001", "name": "general", "updated": 100, "num_members": 5}
+        with Session(self.engine) as session:
+            upsert_channel_directory(session, "test-ctx", [channel])
+            upsert_channel_directory(
+                session,
+                "test-ctx",
+                [{**channel, "num_members": 50, "topic": {"value": "Launch"}}],
+            )
+            session.commit()
+
+        with Session(self.engine) as session:
+            entry = get_channel_directory_entries(session, "test-ctx", ["C001"])["C001"]
+            self.assertEqual(entry.num_members, 50)
+            self.assertEqual(entry.topic, "Launch")
+
+    def test_upsert_updates_renamed_channel(self):
+        with Session(self.engine) as session:
+            upsert_channel_directory(
+                session, "test-ctx", [{"id": "C001", "name": "general"}]
+            )
+            upsert_channel_directory(
+                session, "test-ctx", [{"id": "C001", "name": "town-square"}]
+            )
+            session.commit()
+
+            self.assertIsNone(lookup_channel_directory(session, "general", "test-ctx"))
+            entry = lookup_channel_directory(session, "town-square", "test-ctx")
+            assert entry is not None
+            self.assertEqual(entry.channel_id, "C001")
+
+    def test_refresh_pages_and_marks_fresh(self):
+        client = MagicMock()
+        client.conversations_list.side_effect = [
+            make_page([{"id": "C001", "name": "general"}], next_cursor="page2"),
+            make_page([{"id": "C002", "name": "random"}]),
+        ]
+
+        with Session(self.engine) as session:
+            self.assertTrue(is_directory_stale(session, "test-ctx", "channel"))
+            refresh_directory(session, client, "test-ctx", "channel")
+            session.commit()
+
+            self.assertFalse(is_directory_stale(session, "test-ctx", "channel"))
+            self.assertIsNotNone(
+                lookup_channel_directory(session, "random", "test-ctx")
+            )
+
+        self.assertEqual(client.conversations_list.call_count, 2)
+        self.assertEqual(
+            client.conversations_list.call_args_list[1].kwargs["cursor"], "page2"
+        )
+
+    def test_refresh_resumes_from_stored_cursor(self):
+        client = MagicMock()
+        client.conversations_list.side_effect = [
+            make_page([{"id": "C001", "name": "general"}], next_cursor="page2"),
+            make_page([{"id": "C002", "name": "random"}]),
+        ]
+
+        with Session(self.engine) as session:
+            done = refresh_directory_page(session, client, "test-ctx", "channel")
+            session.commit()
+        self.assertFalse(done)
+
+        with Session(self.engine) as session:
+            state = get_directory_sync_state(session, "test-ctx", "channel")
+            assert state is not None
+            self.assertEqual(state.cursor, "page2")
+            self.assertTrue(is_directory_stale(session, "test-ctx", "channel"))
+
+            done = refresh_directory_page(session, client, "test-ctx", "channel")
+            session.commit()
+        self.assertTrue(done)
+        self.assertEqual(
+            client.conversations_list.call_args_list[1].kwargs["cursor"], "page2"
+        )
+
+    def test_staleness_respects_ttl(self):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page([])
+
+        with Session(self.engine) as session:
+            refresh_directory(session, client, "test-ctx", "channel")
+            state = get_directory_sync_state(session, "test-ctx", "channel")
+            assert state is not None
+            state.refreshed_at = utcnow() - timedelta(days=2)
+            session.flush()
+
+            self.assertTrue(is_directory_stale(session, "test-ctx", "channel"))
+            self.assertFalse(
+                is_directory_stale(
+                    session, "test-ctx", "channel", ttl=timedelta(days=3)
+                )
+            )
+
+
+class TestBackgroundDirectoryRefresh(unittest.TestCase):
+    def test_background_refresh_fills_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = get_engine(config_dir=tmpdir)
+            with engine.connect() as connection:
+                run_migrations(connection)
+                connection.commit()
+
+            client = MagicMock()
+            client.conversations_list.return_value = make_page(
+                [{"id": "C001", "name": "general"}]
+            )
+
+            with Session(engine) as session:
+                add_context(
+                    session,
+                    name="test-ctx",
+                    access_token="fake-token",
+                    user_id="U000000001",
+                    workspace_id="T000000001",
+                    app_type="clacks",
+                )
+                session.commit()
+
+                thread = start_background_directory_refresh(
+                    session, client, "test-ctx", "channel"
+                )
+                assert thread is not None
+                thread.join(timeout=5)
+
+            with Session(engine) as session:
+                entry = lookup_channel_directory(session, "general", "test-ctx")
+                assert entry is not None
+                self.assertEqual(entry.channel_id, "C001")
+                self.assertFalse(is_directory_stale(session, "test-ctx", "channel"))
+
+            engine.dispose()
+
+
+class TestResolveChannelIdDirectory(DirectoryTestCase):
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_fresh_directory_answers_without_api(self, mock_refresh):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page(
+            [{"id": "C001", "name": "general"}]
+        )
+        with Session(self.engine) as session:
+            refresh_directory(session, client, "test-ctx", "channel")
+            client.reset_mock()
+
+            channel_id = resolve_channel_id(client, "#general", session, "test-ctx")
+
+        self.assertEqual(channel_id, "C001")
+        client.conversations_list.assert_not_called()
+        mock_refresh.assert_not_called()
+
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_stale_directory_still_answers_and_refreshes(self, mock_refresh):
+        client = MagicMock()
+        with Session(self.engine) as session:
+            upsert_channel_directory(
+                session, "test-ctx", [{"id": "C001", "name": "general"}]
+            )
+
+            channel_id = resolve_channel_id(client, "general", session, "test-ctx")
+
+            self.assertEqual(channel_id, "C001")
+            client.conversations_list.assert_not_called()
+            mock_refresh.assert_called_once_with(session, client, "test-ctx", "channel")
+
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_directory_miss_falls_back_to_api(self, mock_refresh):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page(
+            [{"id": "C009", "name": "brand-new"}]
+        )
+        with Session(self.engine) as session:
+            channel_id = resolve_channel_id(client, "brand-new", session, "test-ctx")
+
+        self.assertEqual(channel_id, "C009")
+        client.conversations_list.assert_called_once()
+
+
+class TestFallbackWriteThrough(DirectoryTestCase):
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_channel_scan_warms_directory(self, mock_refresh):
+        client = MagicMock()
+        client.conversations_list.side_effect = [
+            make_page(
+                [{"id": "C001", "name": "general"}, {"id": "C002", "name": "random"}],
+                next_cursor="page2",
+            ),
+            make_page([{"id": "C003", "name": "target"}]),
+        ]
+        with Session(self.engine) as session:
+            self.assertEqual(
+                resolve_channel_id(client, "target", session, "test-ctx"), "C003"
+            )
+            client.reset_mock()
+
+            self.assertEqual(
+                resolve_channel_id(client, "random", session, "test-ctx"), "C002"
+            )
+        client.conversations_list.assert_not_called()
+
+    def test_failed_channel_scan_is_kept_and_marks_directory_fresh(self):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page(
+            [{"id": "C001", "name": "general"}]
+        )
+        with Session(self.engine) as session:
+            with self.assertRaises(ClacksChannelNotFoundError):
+                resolve_channel_id(client, "nope", session, "test-ctx")
+            session.rollback()
+
+        with Session(self.engine) as session:
+            self.assertIsNotNone(
+                lookup_channel_directory(session, "general", "test-ctx")
+            )
+            self.assertFalse(is_directory_stale(session, "test-ctx", "channel"))
+
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_user_scan_warms_directory(self, mock_refresh):
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [ALICE, {"id": "U003", "name": "carol"}],
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            self.assertEqual(
+                resolve_user_id(client, "carol", session, "test-ctx"), "U003"
+            )
+            client.reset_mock()
+
+            self.assertEqual(
+                resolve_user_id(client, "ally", session, "test-ctx"), "U001"
+            )
+        client.users_list.assert_not_called()
+
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_other_writers_are_not_locked_out_during_a_scan(self, mock_refresh):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = get_engine(config_dir=tmpdir)
+            with engine.connect() as connection:
+                run_migrations(connection)
+                connection.commit()
+            with Session(engine) as session:
+                add_context(
+                    session,
+                    name="test-ctx",
+                    access_token="fake-token",
+                    user_id="U000000001",
+                    workspace_id="T000000001",
+                    app_type="clacks",
+                )
+                session.commit()
+
+            writes: list[str] = []
+            pages = [
+                make_page([{"id": "C001", "name": "general"}], next_cursor="page2"),
+                make_page([{"id": "C002", "name": "target"}]),
+            ]
+
+            def conversations_list(**kwargs):
+                other = sqlite3.connect(get_db_path(config_dir=tmpdir), timeout=0)
+                try:
+                    other.execute("BEGIN IMMEDIATE")
+                    other.rollback()
+                    writes.append("ok")
+                except sqlite3.OperationalError as e:
+                    writes.append(str(e))
+                finally:
+                    other.close()
+                return pages.pop(0)
+
+            client = MagicMock()
+            client.conversations_list.side_effect = conversations_list
+            with Session(engine) as session:
+                channel_id = resolve_channel_id(client, "target", session, "test-ctx")
+                self.assertIsNotNone(
+                    lookup_channel_directory(session, "general", "test-ctx")
+                )
+            engine.dispose()
+
+        self.assertEqual(channel_id, "C002")
+        self.assertEqual(writes, ["ok", "ok"])
+
+
+ALICE = {
+    "id": "U001",
+    "name": "alice",
+    "real_name": "Alice Liddell",
+    "profile": {"display_name": "ally", "email": "Alice@Example.com"},
+}
+BOB = {"id": "U002", "name": "bob", "deleted": True, "profile": {}}
+
+
+class TestUserDirectory(DirectoryTestCase):
+    def test_lookup_by_every_supported_form(self):
+        with Session(self.engine) as session:
+            written = upsert_user_directory(session, "test-ctx", [ALICE, BOB])
+            session.commit()
+        self.assertEqual(written, 2)
+
+        with Session(self.engine) as session:
+            for identifier in (
+                "alice",
+                "Alice Liddell",
+                "ally",
+                "alice@example.com",
+                "ALICE@EXAMPLE.COM",
+            ):
+                entry = lookup_user_directory(session, identifier, "test-ctx")
+                assert entry is not None, identifier
+                self.assertEqual(entry.user_id, "U001")
+
+            self.assertIsNone(lookup_user_directory(session, "bob", "test-ctx"))
+            self.assertIsNone(lookup_user_directory(session, "carol", "test-ctx"))
+
+    def test_deactivated_user_is_stored_but_not_resolved(self):
+        with Session(self.engine) as session:
+            upsert_user_directory(session, "test-ctx", [ALICE, BOB])
+            session.commit()
+
+            bob = get_user_directory_entries(session, "test-ctx", ["U002"])["U002"]
+            self.assertTrue(bob.is_deleted)
+            self.assertEqual(
+                lookup_user_directory_many(
+                    session, ["alice", "bob"], "test-ctx"
+                ).keys(),
+                {"alice"},
+            )
+
+    def test_profile_fields_are_stored(self):
+        member = {
+            **ALICE,
+            "is_bot": True,
+            "tz": "Europe/London",
+            "profile": {**ALICE["profile"], "title": "Rabbit chaser"},
+        }
+        with Session(self.engine) as session:
+            upsert_user_directory(session, "test-ctx", [member])
+            session.commit()
+
+        with Session(self.engine) as session:
+            entry = get_user_directory_entries(session, "test-ctx", ["U001"])["U001"]
+            self.assertTrue(entry.is_bot)
+            self.assertFalse(entry.is_deleted)
+            self.assertEqual(entry.title, "Rabbit chaser")
+            self.assertEqual(entry.timezone, "Europe/London")
+
+    def test_unchanged_updated_stamp_is_not_rewritten(self):
+        first = utcnow() - timedelta(hours=1)
+        member = {**ALICE, "updated": 100}
+        with Session(self.engine) as session:
+            upsert_user_directory(session, "test-ctx", [member], fetched_at=first)
+            upsert_user_directory(session, "test-ctx", [{**member, "name": "renamed"}])
+            session.commit()
+            entry = lookup_user_directory(session, "alice", "test-ctx")
+            assert entry is not None
+            self.assertEqual(entry.fetched_at, first)
+
+            upsert_user_directory(
+                session, "test-ctx", [{**member, "name": "renamed", "updated": 200}]
+            )
+            session.commit()
+
+        with Session(self.engine) as session:
+            entry = lookup_user_directory(session, "renamed", "test-ctx")
+            assert entry is not None
+            self.assertEqual(entry.updated, 200)
+
+    def test_refresh_user_directory(self):
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [ALICE],
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            refresh_directory(session, client, "test-ctx", "user")
+            self.assertFalse(is_directory_stale(session, "test-ctx", "user"))
+            self.assertIsNotNone(lookup_user_directory(session, "ally", "test-ctx"))
+
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_resolve_user_id_uses_directory(self, mock_refresh):
+        client = MagicMock()
+        with Session(self.engine) as session:
+            upsert_user_directory(session, "test-ctx", [ALICE])
+
+            self.assertEqual(
+                resolve_user_id(client, "@alice", session, "test-ctx"), "U001"
+            )
+            self.assertEqual(
+                resolve_user_id(client, "alice@example.com", session, "test-ctx"),
+                "U001",
+            )
+            self.assertEqual(
+                resolve_user_id(client, "Alice Liddell", session, "test-ctx"), "U001"
+            )
+
+        client.users_list.assert_not_called()
+
+
+class TestResolveMany(DirectoryTestCase):
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_channels_many_uses_one_scan_for_all_misses(self, mock_refresh):
+        client = MagicMock()
+        client.conversations_list.side_effect = [
+            make_page([{"id": "C010", "name": "late-one"}], next_cursor="page2"),
+            make_page([{"id": "C011", "name": "late-two"}], next_cursor="page3"),
+            make_page([{"id": "C012", "name": "never-needed"}]),
+        ]
+        with Session(self.engine) as session:
+            add_alias(session, "ops", "test-ctx", "channel", "slack", "C001")
+            upsert_channel_directory(
+                session, "test-ctx", [{"id": "C002", "name": "general"}]
+            )
+
+            resolved = resolve_channels_many(
+                client,
+                ["#ops", "general", "C999", "late-one", "#late-two", "late-two"],
+                session,
+                "test-ctx",
+            )
+
+        self.assertEqual(
+            resolved,
+            {
+                "#ops": "C001",
+                "general": "C002",
+                "C999": "C999",
+                "late-one": "C010",
+                "#late-two": "C011",
+                "late-two": "C011",
+            },
+        )
+        # Scan stops as soon as every miss is found.
+        self.assertEqual(client.conversations_list.call_count, 2)
+
+    def test_users_many_reports_unresolved_as_none(self):
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [ALICE],
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            resolved = resolve_users_many(
+                client, ["@alice", "U123", "ghost"], session, "test-ctx"
+            )
+
+        self.assertEqual(resolved, {"@alice": "U001", "U123": "U123", "ghost": None})
+        client.users_list.assert_called_once()
+
+    def test_without_session_only_scans_api(self):
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [ALICE],
+            "response_metadata": {"next_cursor": ""},
+        }
+        resolved = resolve_users_many(client, ["alice@example.com", "ally"])
+        # Display names are only indexed locally; the API scan does not match them.
+        self.assertEqual(resolved, {"alice@example.com": "U001", "ally": None})
+
+
+class TestNegativeCache(DirectoryTestCase):
+    def test_repeated_bad_lookup_skips_scan(self):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page(
+            [{"id": "C001", "name": "general"}]
+        )
+        with Session(self.engine) as session:
+            with self.assertRaises(ClacksChannelNotFoundError):
+                resolve_channel_id(client, "#genral", session, "test-ctx")
+            session.rollback()
+
+            with self.assertRaises(ClacksChannelNotFoundError):
+                resolve_channel_id(client, "#genral", session, "test-ctx")
+
+        client.conversations_list.assert_called_once()
+
+    def test_directory_fill_invalidates_miss(self):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page([])
+        with Session(self.engine) as session:
+            with self.assertRaises(ClacksChannelNotFoundError):
+                resolve_channel_id(client, "new-channel", session, "test-ctx")
+            self.assertEqual(
+                recent_resolution_misses(
+                    session, ["new-channel"], "test-ctx", "channel"
+                ),
+                {"new-channel"},
+            )
+
+            upsert_channel_directory(
+                session, "test-ctx", [{"id": "C002", "name": "new-channel"}]
+            )
+            self.assertEqual(
+                recent_resolution_misses(
+                    session, ["new-channel"], "test-ctx", "channel"
+                ),
+                set(),
+            )
+
+    def test_user_email_miss_invalidated_case_insensitively(self):
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [],
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            with self.assertRaises(ClacksUserNotFoundError):
+                resolve_user_id(client, "Alice@Example.com", session, "test-ctx")
+
+            upsert_user_directory(session, "test-ctx", [ALICE])
+            self.assertEqual(
+                recent_resolution_misses(
+                    session, ["Alice@Example.com"], "test-ctx", "user"
+                ),
+                set(),
+            )
+
+    def test_alias_invalidates_miss(self):
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [],
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            with self.assertRaises(ClacksUserNotFoundError):
+                resolve_user_id(client, "@dave", session, "test-ctx")
+
+            add_alias(session, "dave", "test-ctx", "user", "slack", "U004")
+            self.assertEqual(
+                resolve_user_id(client, "@dave", session, "test-ctx"), "U004"
+            )
+
+    def test_ttl_from_environment(self):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page([])
+        with patch.dict(os.environ, {"CLACKS_NEGATIVE_CACHE_TTL": "0"}):
+            with Session(self.engine) as session:
+                for _ in range(2):
+                    with self.assertRaises(ClacksChannelNotFoundError):
+                        resolve_channel_id(client, "nope", session, "test-ctx")
+
+        self.assertEqual(client.conversations_list.call_count, 2)
+
+
+class TestDMChannelCache(DirectoryTestCase):
+    def test_second_open_uses_cache(self):
+        client = MagicMock()
+        client.conversations_open.return_value = {"channel": {"id": "D001"}}
+        with Session(self.engine) as session:
+            first = open_dm_channel(client, "U001", session, "test-ctx")
+            second = open_dm_channel(client, "U001", session, "test-ctx")
+            session.commit()
+
+        self.assertEqual(first, "D001")
+        self.assertEqual(second, "D001")
+        client.conversations_open.assert_called_once_with(users=["U001"])
+
+        with Session(self.engine) as session:
+            self.assertEqual(get_dm_channel(session, "U001", "test-ctx"), "D001")
+
+    def test_failed_open_is_not_cached(self):
+        from slack_sdk.errors import SlackApiError
+
+        client = MagicMock()
+        client.conversations_open.side_effect = SlackApiError("nope", MagicMock())
+        with Session(self.engine) as session:
+            self.assertIsNone(open_dm_channel(client, "U001", session, "test-ctx"))
+            self.assertIsNone(get_dm_channel(session, "U001", "test-ctx"))
+
+    def test_without_session_always_calls_api(self):
+        client = MagicMock()
+        client.conversations_open.return_value = {"channel": {"id": "D001"}}
+        open_dm_channel(client, "U001")
+        open_dm_channel(client, "U001")
+        self.assertEqual(client.conversations_open.call_count, 2)
+
+
+class TestResolutionMemo(DirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_resolution_memos()
+        self.addCleanup(clear_resolution_memos)
+
+    def test_repeat_resolution_skips_lookups(self):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page(
+            [{"id": "C001", "name": "general"}]
+        )
+        client.users_list.return_value = {
+            "members": [ALICE],
+            "response_metadata": {"next_cursor": ""},
+        }
+        memo = ResolutionMemo()
+        with Session(self.engine) as session:
+            resolve_channel_id(client, "#general", session, "test-ctx", memo)
+            resolve_user_id(client, "alice", session, "test-ctx", memo)
+
+        with patch(
+            "slack_clacks.rolodex.operations.resolve_alias_targets"
+        ) as mock_aliases:
+            self.assertEqual(
+                resolve_channel_id(client, "general", None, None, memo), "C001"
+            )
+            self.assertEqual(
+                resolve_user_id(client, "@alice", None, None, memo), "U001"
+            )
+        mock_aliases.assert_not_called()
+        client.conversations_list.assert_called_once()
+        client.users_list.assert_called_once()
+
+    def test_misses_are_not_memoized(self):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page([])
+        memo = ResolutionMemo()
+        self.assertEqual(
+            resolve_channels_many(client, ["nope"], memo=memo), {"nope": None}
+        )
+        self.assertEqual(memo.channels, {})
+
+    def test_dm_channel_memoized(self):
+        client = MagicMock()
+        client.conversations_open.return_value = {"channel": {"id": "D001"}}
+        memo = ResolutionMemo()
+        open_dm_channel(client, "U001", memo=memo)
+        open_dm_channel(client, "U001", memo=memo)
+        client.conversations_open.assert_called_once_with(users=["U001"])
+
+    def test_memo_is_shared_per_context(self):
+        self.assertIs(get_resolution_memo("test-ctx"), get_resolution_memo("test-ctx"))
+        self.assertIsNot(get_resolution_memo("test-ctx"), get_resolution_memo("other"))
+
+    def test_alias_change_clears_context_memo(self):
+        memo = get_resolution_memo("test-ctx")
+        memo.channels["dev"] = "C001"
+        with Session(self.engine) as session:
+            add_alias(session, "dev", "test-ctx", "channel", "slack", "C002")
+            self.assertIsNot(get_resolution_memo("test-ctx"), memo)
+            client = MagicMock()
+            self.assertEqual(
+                resolve_channel_id(
+                    client, "dev", session, "test-ctx", get_resolution_memo("test-ctx")
+                ),
+                "C002",
+            )
+            memo = get_resolution_memo("test-ctx")
+            remove_alias(session, "dev", "test-ctx", "channel")
+            self.assertIsNot(get_resolution_memo("test-ctx"), memo)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestCheckMessageTarget(DirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        with Session(self.engine) as session:
+            upsert_user_directory(session, "test-ctx", [ALICE, BOB])
+            upsert_channel_directory(
+                session,
+                "test-ctx",
+                [
+                    {"id": "C001", "name": "general"},
+                    {"id": "C003", "name": "old", "is_archived": True},
+                ],
+            )
+            session.commit()
+        self.client = MagicMock()
+        self.client.conversations_info.return_value = {
+            "channel": {"id": "C003", "name": "old", "is_archived": True}
+        }
+        self.client.users_info.return_value = {"user": BOB}
+
+    def check(self, **kwargs) -> None:
+        with Session(self.engine) as session:
+            check_message_target(session, self.client, "test-ctx", **kwargs)
+            session.commit()
+
+    def test_live_and_unknown_targets_pass_without_api_calls(self):
+        self.check(channel_id="C001")
+        self.check(user_id="U001")
+        self.check(channel_id="C999")
+        self.check(user_id="U999")
+        self.client.conversations_info.assert_not_called()
+        self.client.users_info.assert_not_called()
+
+    def test_archived_channel_is_rejected_after_recheck(self):
+        with self.assertRaisesRegex(ValueError, "#old .* archived"):
+            self.check(channel_id="C003")
+        self.client.conversations_info.assert_called_once_with(channel="C003")
+
+    def test_deactivated_user_is_rejected_after_recheck(self):
+        with self.assertRaisesRegex(ValueError, "bob .* deactivated"):
+            self.check(user_id="U002")
+        self.client.users_info.assert_called_once_with(user="U002")
+
+    def test_unarchived_channel_and_reactivated_user_pass_and_are_updated(self):
+        self.client.conversations_info.return_value = {
+            "channel": {"id": "C003", "name": "old"}
+        }
+        self.client.users_info.return_value = {"user": {**BOB, "deleted": False}}
+
+        self.check(channel_id="C003")
+        self.check(user_id="U002")
+
+        with Session(self.engine) as session:
+            channel = get_channel_directory_entries(session, "test-ctx", ["C003"])
+            user = get_user_directory_entries(session, "test-ctx", ["U002"])
+            self.assertFalse(channel["C003"].is_archived)
+            self.assertFalse(user["U002"].is_deleted)
+
+    def test_failed_recheck_leaves_it_to_slack(self):
+        self.client.conversations_info.side_effect = SlackApiError(
+            "error", {"ok": False, "error": "ratelimited"}
+        )
+        self.check(channel_id="C003")
+
+
+class TestNameSearch(DirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        with Session(self.engine) as session:
+            upsert_user_directory(session, "test-ctx", [ALICE, BOB])
+            upsert_channel_directory(
+                session,
+                "test-ctx",
+                [
+                    {"id": "C001", "name": "general"},
+                    {"id": "C002", "name": "general-chatter"},
+                    {"id": "C003", "name": "random"},
+                ],
+            )
+            add_alias(session, "gen", "test-ctx", "channel", "slack", "C001")
+            add_alias(session, "dev-team", "test-ctx", "channel", "slack", "C009")
+            session.commit()
+
+    def names(self, fragment: str, **kwargs) -> list[str]:
+        with Session(self.engine) as session:
+            return [
+                match.name
+                for match in search_names(session, fragment, "test-ctx", **kwargs)
+            ]
+
+    def test_substring_matches_rank_exact_then_prefix(self):
+        self.assertEqual(self.names("#general"), ["general", "general-chatter"])
+        self.assertEqual(self.names("team"), ["dev-team"])
+
+    def test_short_fragment_matches_prefix(self):
+        self.assertEqual(self.names("ra"), ["random"])
+        self.assertEqual(
+            self.names("ge", target_type="channel"), ["gen", "general-chatter"]
+        )
+
+    def test_fuzzy_match_and_no_fuzzy(self):
+        self.assertEqual(self.names("genral")[0], "general")
+        self.assertEqual(self.names("genral", fuzzy=False), [])
+        self.assertEqual(self.names("Alise Liddel"), ["Alice Liddell"])
+
+    def test_deactivated_users_are_not_matched(self):
+        self.assertEqual(self.names("bob"), [])
+
+    def test_index_follows_renames_and_deletes(self):
+        with Session(self.engine) as session:
+            upsert_channel_directory(
+                session, "test-ctx", [{"id": "C003", "name": "watercooler"}]
+            )
+            remove_alias(session, "dev-team", "test-ctx", "channel")
+            session.commit()
+
+        self.assertEqual(self.names("random"), [])
+        self.assertEqual(self.names("water"), ["watercooler"])
+        self.assertEqual(self.names("team"), [])
+
+    @patch("slack_clacks.rolodex.operations.start_background_directory_refresh")
+    def test_not_found_errors_suggest_similar_names(self, mock_refresh):
+        client = MagicMock()
+        client.conversations_list.return_value = make_page([])
+        client.users_list.return_value = {
+            "members": [],
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            with self.assertRaises(ClacksChannelNotFoundError) as channel_error:
+                resolve_channel_id(client, "#genral", session, "test-ctx")
+            with self.assertRaises(ClacksUserNotFoundError) as user_error:
+                resolve_user_id(client, "@alcie", session, "test-ctx")
+
+        self.assertEqual(channel_error.exception.suggestions[0], "general")
+        self.assertIn("did you mean: general", str(channel_error.exception))
+        self.assertEqual(user_error.exception.suggestions, ["alice"])
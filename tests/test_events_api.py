@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from typing import Any
+from unittest.mock import MagicMock
+
+from slack_sdk.signature import SignatureVerifier
+
+from slack_clacks.listen.events_api import EventsAPIServer, listen_events_api
+from slack_clacks.listen.operations import ListenTarget
+
+SIGNING_SECRET = "test-signing-secret"
+
+
+def make_ts(offset: float = 0) -> str:
+    return f"{time.time() + offset:.6f}"
+
+
+class TestListenEventsAPI(unittest.TestCase):
+    def setUp(self):
+        self.server = EventsAPIServer(SIGNING_SECRET, "127.0.0.1", 0)
+        self.client = MagicMock()
+        self.status: dict[str, Any] = {}
+        self.messages: list[dict] = []
+        self.thread: threading.Thread | None = None
+
+    def tearDown(self):
+        if self.thread is not None:
+            self.thread.join(5)
+        self.server.server_close()
+
+    def listen(self, targets: list[ListenTarget], **kwargs: Any) -> None:
+        options = {"timeout": 1.0, "continuous": True, **kwargs}
+
+        def run() -> None:
+            self.messages.extend(
+                listen_events_api(
+                    self.client, self.server, targets, status=self.status, **options
+                )
+            )
+
+        self.thread = threading.Thread(target=run)
+        self.thread.start()
+
+    def post(
+        self, payload: dict[str, Any], secret: str = SIGNING_SECRET
+    ) -> tuple[int, bytes]:
+        body = json.dumps(payload).encode()
+        timestamp = str(int(time.time()))
+        signature = SignatureVerifier(secret).generate_signature(
+            timestamp=timestamp, body=body
+        )
+        request = urllib.request.Request(
+            self.server.url,
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "X-Slack-Request-Timestamp": timestamp,
+                "X-Slack-Signature": signature or "",
+            },
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def message_event(
+        self, event_id: str, channel: str, ts: str, **fields: Any
+    ) -> dict[str, Any]:
+        return {
+            "type": "event_callback",
+            "event_id": event_id,
+            "event": {"type": "message", "channel": channel, "ts": ts, **fields},
+        }
+
+    def test_answers_url_verification(self):
+        self.listen([ListenTarget("C1")], timeout=0.5)
+
+        status, body = self.post({"type": "url_verification", "challenge": "abc"})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {"challenge": "abc"})
+
+    def test_rejects_bad_signature(self):
+        self.listen([ListenTarget("C1")], timeout=0.5)
+
+        status, _ = self.post(
+            self.message_event("Ev1", "C1", make_ts(), text="forged"),
+            secret="wrong-secret",
+        )
+        assert self.thread is not None
+        self.thread.join(5)
+
+        self.assertEqual(status, 401)
+        self.assertEqual(self.messages, [])
+
+    def test_streams_matching_messages_and_drops_retries(self):
+        self.listen([ListenTarget("C1")])
+
+        event = self.message_event(
+            "Ev1", "C1", make_ts(), text="hi", user="U1", channel_type="channel"
+        )
+        self.assertEqual(self.post(event)[0], 200)
+        # Slack delivers again if the first acknowledgement was too slow
+        self.assertEqual(self.post(event)[0], 200)
+        self.post(self.message_event("Ev2", "C2", make_ts(), text="elsewhere"))
+        assert self.thread is not None
+        self.thread.join(5)
+
+        self.assertEqual([m["text"] for m in self.messages], ["hi"])
+        message = self.messages[0]
+        self.assertEqual(message["channel_id"], "C1")
+        self.assertIn("received_at", message)
+        for field in ("channel", "channel_type", "event_ts"):
+            self.assertNotIn(field, message)
+        self.assertEqual(self.status["backend"], "events")
+        self.assertEqual(self.status["duplicate_events"], 1)
+
+    def test_out_of_order_callbacks_after_catch_up_are_yielded(self):
+        missed_ts = make_ts(-5)
+        self.client.conversations_history.return_value = {
+            "messages": [{"ts": missed_ts, "text": "missed"}]
+        }
+        positions: dict[ListenTarget, str] = {}
+        self.listen(
+            [ListenTarget("C1")],
+            since={ListenTarget("C1"): make_ts(-10)},
+            positions=positions,
+        )
+
+        earlier_ts, later_ts = make_ts(), make_ts(1)
+        self.post(self.message_event("Ev1", "C1", missed_ts, text="missed"))
+        self.post(self.message_event("Ev2", "C1", later_ts, text="later"))
+        self.post(self.message_event("Ev3", "C1", earlier_ts, text="earlier"))
+        assert self.thread is not None
+        self.thread.join(5)
+
+        self.assertEqual(
+            [m["text"] for m in self.messages], ["missed", "later", "earlier"]
+        )
+        self.assertEqual(positions[ListenTarget("C1")], later_ts)
+
+    def test_yields_within_a_second_and_exits_unless_continuous(self):
+        self.listen([ListenTarget("C1")], timeout=10.0, continuous=False)
+
+        started = time.monotonic()
+        self.post(self.message_event("Ev1", "C1", make_ts(), text="first"))
+        assert self.thread is not None
+        self.thread.join(5)
+
+        self.assertFalse(self.thread.is_alive())
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual([m["text"] for m in self.messages], ["first"])
+
+    def test_unknown_path_is_not_found(self):
+        self.listen([ListenTarget("C1")], timeout=0.5)
+        request = urllib.request.Request(
+            self.server.url.replace("/slack/events", "/other"), data=b"{}"
+        )
+
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(request, timeout=5)
+        raised.exception.close()
+
+        self.assertEqual(raised.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from slack_clacks.configuration.database import add_context, get_engine, run_migrations
+from slack_clacks.rolodex.exceptions import ClacksGitHubAPIError
+from slack_clacks.rolodex.github import _next_link, sync_from_github
+from slack_clacks.rolodex.operations import (
+    _prune_synced_aliases,
+    add_alias,
+    get_alias,
+    list_aliases,
+)
+
+
+class FakeGitHub(ThreadingHTTPServer):
+    """
+    Local stand-in for the GitHub REST API. Serves pages from `pages`, keyed
+    by request path (query string included), with an ETag derived from the
+    content, and answers If-None-Match with 304.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeGitHubHandler)
+        self.pages: dict[str, tuple[Any, str | None]] = {}
+        self.requests: list[tuple[str, int]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def set_listing(self, path: str, items: list[Any], page_size: int) -> None:
+        """Serve items as pages of page_size linked with rel="next"."""
+        for key in [key for key in self.pages if key.startswith(path)]:
+            del self.pages[key]
+        chunks = [items[i : i + page_size] for i in range(0, len(items), page_size)]
+        for number, chunk in enumerate(chunks or [[]], start=1):
+            key = path if number == 1 else f"{path}&page={number}"
+            next_key = f"{path}&page={number + 1}" if number < len(chunks) else None
+            self.pages[key] = (chunk, next_key)
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    server: FakeGitHub
+
+    def do_GET(self) -> None:
+        if self.path not in self.server.pages:
+            self._reply(404, {"message": "Not Found"})
+            return
+        body, next_key = self.server.pages[self.path]
+        payload = json.dumps(body).encode()
+        etag = f'"{abs(hash(payload))}"'
+        headers = {"ETag": etag}
+        if next_key is not None:
+            headers["Link"] = f'<{self.server.url}{next_key}>; rel="next"'
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, None, headers)
+        else:
+            self._reply(200, body, headers)
+
+    def _reply(
+        self, status: int, body: Any, headers: dict[str, str] | None = None
+    ) -> None:
+        self.server.requests.append((self.path, status))
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        payload = b"" if body is None else json.dumps(body).encode()
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+MEMBERS = "/orgs/acme/members?per_page=100"
+REPOS = "/orgs/acme/repos?per_page=100&type=all"
+
+
+class TestSyncFromGitHub(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeGitHub()
+        self.server.pages["/orgs/acme"] = ({"login": "acme"}, None)
+        self.server.set_listing(
+            MEMBERS, [{"login": login} for login in ("ann", "ben", "cal")], 2
+        )
+        self.server.set_listing(REPOS, [{"name": "api", "full_name": "acme/api"}], 100)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+        with Session(self.engine) as session:
+            add_context(
+                session,
+                name="test-ctx",
+                access_token="fake-token",
+                user_id="U000000001",
+                workspace_id="T000000001",
+                app_type="clacks",
+            )
+            session.commit()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.engine.dispose()
+
+    def sync(self, org: str = "acme") -> dict[str, Any]:
+        with Session(self.engine) as session:
+            result = sync_from_github(session, "test-ctx", org, api_url=self.server.url)
+            session.commit()
+        return result
+
+    def aliases(self) -> dict[tuple[str, str], str]:
+        with Session(self.engine) as session:
+            return {
+                (alias.alias, alias.target_type): alias.target_id
+                for alias in list_aliases(session, "test-ctx", platform="github")
+            }
+
+    def test_first_sync_pages_members_and_repos(self):
+        result = self.sync()
+
+        self.assertEqual(result["users"], 3)
+        self.assertEqual(result["repos"], 1)
+        self.assertEqual(result["added"], 5)
+        self.assertEqual(result["requests"], 4)
+        self.assertEqual(result["not_modified"], 0)
+        self.assertEqual(
+            self.aliases(),
+            {
+                ("acme", "org"): "acme",
+                ("ann", "user"): "ann",
+                ("ben", "user"): "ben",
+                ("cal", "user"): "cal",
+                ("api", "repo"): "acme/api",
+            },
+        )
+
+    def test_repeat_sync_is_all_not_modified(self):
+        self.sync()
+        self.server.requests.clear()
+
+        result = self.sync()
+
+        self.assertEqual(result["requests"], 4)
+        self.assertEqual(result["not_modified"], 4)
+        self.assertEqual({status for _, status in self.server.requests}, {304})
+        self.assertEqual(result["added"], 0)
+        self.assertEqual(result["pruned"], 0)
+        self.assertEqual(len(self.aliases()), 5)
+
+    def test_changed_page_is_refetched_and_departures_pruned(self):
+        self.sync()
+        self.server.set_listing(
+            MEMBERS, [{"login": login} for login in ("ann", "dee")], 2
+        )
+
+        result = self.sync()
+
+        self.assertEqual(result["users"], 2)
+        self.assertEqual(result["pruned"], 2)
+        self.assertEqual(
+            {alias for alias, target_type in self.aliases() if target_type == "user"},
+            {"ann", "dee"},
+        )
+
+    def test_member_of_another_synced_org_is_kept(self):
+        self.server.pages["/orgs/other"] = ({"login": "other"}, None)
+        self.server.set_listing(
+            "/orgs/other/members?per_page=100", [{"login": "cal"}], 100
+        )
+        self.server.set_listing("/orgs/other/repos?per_page=100&type=all", [], 100)
+        self.sync()
+        self.sync("other")
+        self.server.set_listing(MEMBERS, [{"login": "ann"}], 2)
+
+        self.sync()
+
+        users = {alias for alias, kind in self.aliases() if kind == "user"}
+        self.assertEqual(users, {"ann", "cal"})
+
+    def test_manual_and_slack_aliases_are_untouched(self):
+        with Session(self.engine) as session:
+            add_alias(session, "ann", "test-ctx", "user", "slack", "U001")
+            add_alias(session, "ben", "test-ctx", "user", "github", "benjamin")
+            session.commit()
+
+        self.sync()
+        self.server.set_listing(MEMBERS, [], 2)
+        self.sync()
+
+        with Session(self.engine) as session:
+            ann = get_alias(session, "ann", "test-ctx", "user")
+            ben = get_alias(session, "ben", "test-ctx", "user")
+            assert ann is not None and ben is not None
+            self.assertEqual((ann.platform, ann.target_id), ("slack", "U001"))
+            self.assertEqual((ben.platform, ben.target_id), ("github", "benjamin"))
+
+    def test_manual_alias_matching_the_first_sync_is_not_adopted(self):
+        with Session(self.engine) as session:
+            add_alias(session, "cal", "test-ctx", "user", "github", "cal")
+            session.commit()
+
+        self.sync()
+        self.server.set_listing(MEMBERS, [{"login": "ann"}], 2)
+        self.sync()
+
+        with Session(self.engine) as session:
+            cal = get_alias(session, "cal", "test-ctx", "user")
+            assert cal is not None
+            self.assertIsNone(cal.sync_generation)
+
+    def test_names_held_by_other_aliases_are_reported(self):
+        with Session(self.engine) as session:
+            add_alias(session, "ann", "test-ctx", "user", "slack", "U001")
+            add_alias(session, "ben", "test-ctx", "user", "github", "benjamin")
+            add_alias(session, "cal", "test-ctx", "user", "github", "cal")
+            session.commit()
+
+        result = self.sync()
+
+        self.assertEqual(result["added"], 2)
+        self.assertEqual(
+            result["collisions"],
+            [
+                {
+                    "alias": "ann",
+                    "target_type": "user",
+                    "target_id": "ann",
+                    "held_by": "slack",
+                },
+                {
+                    "alias": "ben",
+                    "target_type": "user",
+                    "target_id": "ben",
+                    "held_by": "manual",
+                },
+            ],
+        )
+
+    def test_slack_prune_keeps_github_aliases(self):
+        self.sync()
+        with Session(self.engine) as session:
+            pruned = _prune_synced_aliases(session, "test-ctx", "slack", 10**6)
+            session.commit()
+        self.assertEqual(pruned, 0)
+        self.assertEqual(len(self.aliases()), 5)
+
+    def test_unknown_org_raises(self):
+        with self.assertRaisesRegex(ClacksGitHubAPIError, "404"):
+            self.sync("missing")
+
+
+class TestNextLink(unittest.TestCase):
+    def test_parses_next_among_other_relations(self):
+        header = (
+            '<https://api.github.com/x?page=1>; rel="prev", '
+            '<https://api.github.com/x?page=3>; rel="next", '
+            '<https://api.github.com/x?page=9>; rel="last"'
+        )
+        self.assertEqual(_next_link(header), "https://api.github.com/x?page=3")
+        self.assertIsNone(_next_link('<https://api.github.com/x>; rel="last"'))
+        self.assertIsNone(_next_link(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
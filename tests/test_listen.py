@@ -1,9 +1,36 @@
+import contextlib
+import io
+import json
+import sqlite3
+import tempfile
 import time
 import unittest
 from datetime import datetime
-from unittest.mock import MagicMock
-
-from slack_clacks.listen.operations import listen_channel
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.orm import Session
+
+from slack_clacks.configuration.database import (
+    add_context,
+    get_db_path,
+    get_engine,
+    run_migrations,
+    set_current_context,
+)
+from slack_clacks.listen.cli import generate_listen_parser, handle_listen
+from slack_clacks.listen.models import ListenCheckpoint
+from slack_clacks.listen.operations import (
+    ListenTarget,
+    RateBudget,
+    _fetch_since,
+    _next_interval,
+    delete_old_thread_checkpoints,
+    listen_channel,
+    listen_many,
+    load_checkpoints,
+    save_checkpoints,
+)
 
 
 def make_ts(offset: float = 0) -> str:
@@ -316,5 +343,645 @@ class TestRateLimitHandling(unittest.TestCase):
             _call_with_backoff(mock_func, max_retries=2, base_delay=0.01)
 
 
+def history_by_channel(pages: dict[str, list[dict]]):
+    """conversations_history stand-in returning the next page per channel."""
+
+    def history(channel: str, **kwargs):
+        queue = pages.get(channel, [])
+        return queue.pop(0) if queue else {"messages": []}
+
+    return history
+
+
+class TestListenMany(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+
+    def test_merges_channels_and_tags_channel_id(self):
+        self.client.conversations_history.side_effect = history_by_channel(
+            {
+                "C1": [{"messages": [{"ts": make_ts(100), "text": "one"}]}],
+                "C2": [{"messages": [{"ts": make_ts(200), "text": "two"}]}],
+            }
+        )
+
+        messages = list(
+            listen_many(
+                self.client,
+                [ListenTarget("C1"), ListenTarget("C2")],
+                interval=0.01,
+                timeout=0.1,
+                continuous=True,
+                requests_per_minute=6000,
+            )
+        )
+
+        self.assertEqual(
+            [(m["channel_id"], m["text"]) for m in messages],
+            [("C1", "one"), ("C2", "two")],
+        )
+
+    def test_history_is_merged_oldest_first(self):
+        self.client.conversations_history.side_effect = history_by_channel(
+            {
+                "C1": [{"messages": [{"ts": make_ts(3)}, {"ts": make_ts(1)}]}],
+                "C2": [{"messages": [{"ts": make_ts(2)}]}],
+            }
+        )
+
+        messages = list(
+            listen_many(
+                self.client,
+                [ListenTarget("C1"), ListenTarget("C2")],
+                interval=0.01,
+                timeout=0.02,
+                include_history=5,
+                requests_per_minute=6000,
+            )
+        )
+
+        self.assertEqual([m["channel_id"] for m in messages], ["C1", "C2", "C1"])
+
+    def test_threads_and_duplicate_targets(self):
+        parent_ts = make_ts(0)
+        reply_ts = make_ts(100)
+        self.client.conversations_replies.return_value = {
+            "messages": [{"ts": parent_ts}, {"ts": reply_ts, "text": "reply"}]
+        }
+        self.client.conversations_history.return_value = {"messages": []}
+
+        messages = list(
+            listen_many(
+                self.client,
+                [ListenTarget("C1", parent_ts), ListenTarget("C1", parent_ts)],
+                interval=0.01,
+                timeout=0.1,
+                requests_per_minute=6000,
+            )
+        )
+
+        self.assertEqual([m["text"] for m in messages], ["reply"])
+        self.client.conversations_replies.assert_called_once()
+
+    def test_shared_budget_spaces_calls_across_channels(self):
+        self.client.conversations_history.return_value = {"messages": []}
+
+        list(
+            listen_many(
+                self.client,
+                [ListenTarget(f"C{i}") for i in range(5)],
+                interval=0,
+                timeout=0.25,
+                requests_per_minute=600,
+            )
+        )
+
+        # One call per 0.1s, shared by all five channels
+        self.assertLessEqual(self.client.conversations_history.call_count, 3)
+
+
+class TestRateBudget(unittest.TestCase):
+    def test_reserve_spaces_slots(self):
+        budget = RateBudget(requests_per_minute=60)
+        self.assertEqual(budget.reserve(10.0), 10.0)
+        self.assertEqual(budget.reserve(10.0), 11.0)
+        self.assertEqual(budget.reserve(15.0), 15.0)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            RateBudget(requests_per_minute=0)
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    def test_fixed_without_ceiling(self):
+        self.assertEqual(_next_interval(2.0, 2.0, None, received=False), 2.0)
+
+    def test_backs_off_to_ceiling_and_snaps_back(self):
+        current = 2.0
+        seen = []
+        for _ in range(5):
+            current = _next_interval(current, 2.0, 10.0, received=False)
+            seen.append(current)
+        self.assertEqual(seen, [4.0, 8.0, 10.0, 10.0, 10.0])
+        self.assertEqual(_next_interval(current, 2.0, 10.0, received=True), 2.0)
+
+    def test_listen_channel_reports_effective_interval(self):
+        client = MagicMock()
+        client.conversations_history.return_value = {"messages": []}
+        intervals: dict[ListenTarget, float] = {}
+
+        list(
+            listen_channel(
+                client,
+                channel_id="C123",
+                interval=0.01,
+                timeout=0.1,
+                max_interval=0.04,
+                intervals=intervals,
+            )
+        )
+
+        self.assertEqual(intervals, {ListenTarget("C123"): 0.04})
+        # 0.01 + 0.02 + 0.04 + 0.04 ... instead of ten fixed polls
+        self.assertLessEqual(client.conversations_history.call_count, 5)
+
+    def test_listen_many_backs_off_quiet_channels_only(self):
+        client = MagicMock()
+
+        def history(channel: str, **kwargs):
+            if channel == "BUSY":
+                return {"messages": [{"ts": make_ts(100 + time.monotonic())}]}
+            return {"messages": []}
+
+        client.conversations_history.side_effect = history
+        intervals: dict[ListenTarget, float] = {}
+
+        list(
+            listen_many(
+                client,
+                [ListenTarget("BUSY"), ListenTarget("QUIET")],
+                interval=0.01,
+                timeout=0.2,
+                continuous=True,
+                requests_per_minute=60000,
+                max_interval=0.08,
+                intervals=intervals,
+            )
+        )
+
+        self.assertEqual(intervals[ListenTarget("BUSY")], 0.01)
+        self.assertEqual(intervals[ListenTarget("QUIET")], 0.08)
+        calls = [c.kwargs["channel"] for c in client.conversations_history.mock_calls]
+        self.assertGreater(calls.count("BUSY"), 2 * calls.count("QUIET"))
+
+
+def page(messages: list[dict], next_cursor: str = "") -> dict:
+    return {"messages": messages, "response_metadata": {"next_cursor": next_cursor}}
+
+
+class TestBacklog(unittest.TestCase):
+    def test_fetch_since_follows_cursors_and_sorts_oldest_first(self):
+        client = MagicMock()
+        base = make_ts()
+        ts = [str(Decimal(base) + i) for i in range(1, 5)]
+        client.conversations_history.side_effect = [
+            page([{"ts": ts[3]}, {"ts": ts[2]}], "next"),
+            page([{"ts": ts[1]}, {"ts": ts[0]}]),
+        ]
+
+        messages = _fetch_since(client, ListenTarget("C1"), base, RateBudget(6000))
+
+        self.assertEqual([m["ts"] for m in messages], ts)
+        first, second = client.conversations_history.call_args_list
+        self.assertGreater(Decimal(first.kwargs["oldest"]), Decimal(base))
+        self.assertNotIn("cursor", first.kwargs)
+        self.assertEqual(second.kwargs["cursor"], "next")
+
+    def test_listen_many_catches_up_before_polling(self):
+        client = MagicMock()
+        base = make_ts(-100)
+        ts = [str(Decimal(base) + i) for i in range(1, 4)]
+        backlog = {
+            "C1": [page([{"ts": ts[2]}, {"ts": ts[0]}])],
+            "C2": [page([{"ts": ts[1]}])],
+        }
+        client.conversations_history.side_effect = history_by_channel(backlog)
+        positions: dict[ListenTarget, str] = {}
+        seen_positions = []
+
+        for message in listen_many(
+            client,
+            [ListenTarget("C1"), ListenTarget("C2")],
+            interval=0.01,
+            timeout=0.05,
+            continuous=True,
+            requests_per_minute=60000,
+            since={ListenTarget("C1"): base, ListenTarget("C2"): base},
+            positions=positions,
+        ):
+            target = ListenTarget(message["channel_id"])
+            seen_positions.append(positions[target] == message["ts"])
+
+        self.assertEqual(seen_positions, [True, True, True])
+        self.assertEqual(positions[ListenTarget("C1")], ts[2])
+
+
+class TestPagedPolls(unittest.TestCase):
+    def test_channel_burst_streams_every_page_before_moving_position(self):
+        client = MagicMock()
+        ts = [make_ts(100 + i) for i in range(5)]
+        client.conversations_history.side_effect = history_by_channel(
+            {"C1": [page([{"ts": ts[4]}], "next"), page([{"ts": ts[3]}])]}
+        )
+        replies = [page([{"ts": ts[0]}, {"ts": ts[1]}], "next"), page([{"ts": ts[2]}])]
+        client.conversations_replies.side_effect = lambda **kwargs: (
+            replies.pop(0) if replies else {"messages": []}
+        )
+        channel, thread = ListenTarget("C1"), ListenTarget("C1", "1.000000")
+        positions: dict[ListenTarget, str] = {}
+        seen = []
+
+        for message in listen_many(
+            client,
+            [channel, thread],
+            interval=0.01,
+            timeout=0.1,
+            continuous=True,
+            requests_per_minute=60000,
+            positions=positions,
+        ):
+            target = thread if message["ts"] in ts[:3] else channel
+            seen.append((message["ts"], positions[target] == message["ts"]))
+
+        # Replies page forward, so each moves the thread's position; the
+        # newest channel page comes first, with an older one still to fetch.
+        self.assertEqual(sorted(seen), [(t, True) for t in ts[:4]] + [(ts[4], False)])
+        self.assertEqual(positions, {channel: ts[4], thread: ts[2]})
+        cursors = [
+            c.kwargs.get("cursor") for c in client.conversations_history.mock_calls
+        ]
+        self.assertEqual(cursors[:2], [None, "next"])
+        self.assertEqual(
+            client.conversations_history.mock_calls[0].kwargs["limit"], 200
+        )
+
+    def test_exits_with_oldest_message_of_a_paged_burst(self):
+        client = MagicMock()
+        ts = [make_ts(100 + i) for i in range(3)]
+        client.conversations_history.side_effect = [
+            page([{"ts": ts[2]}, {"ts": ts[1]}], "next"),
+            page([{"ts": ts[0]}]),
+        ]
+
+        messages = list(listen_channel(client, "C1", interval=0.01, timeout=1.0))
+
+        self.assertEqual([m["ts"] for m in messages], [ts[0]])
+
+
+def paged_history(messages: list[dict], page_size: int = 2):
+    """
+    conversations_history stand-in returning the messages after oldest,
+    newest first, page_size at a time.
+    """
+
+    def history(oldest: str, cursor: str | None = None, **kwargs):
+        after = sorted(
+            (m for m in messages if Decimal(m["ts"]) >= Decimal(oldest)),
+            key=lambda m: Decimal(m["ts"]),
+            reverse=True,
+        )
+        start = int(cursor or 0)
+        end = start + page_size
+        return page(after[start:end], str(end) if end < len(after) else "")
+
+    return history
+
+
+class TestWithReplies(unittest.TestCase):
+    def setUp(self):
+        self.quiet = {
+            "ts": make_ts(-1000),
+            "reply_count": 3,
+            "latest_reply": make_ts(-500),
+        }
+        self.active = {
+            "ts": make_ts(-900),
+            "reply_count": 1,
+            "latest_reply": make_ts(60),
+        }
+        self.reply = {"ts": self.active["latest_reply"], "thread_ts": self.active["ts"]}
+
+    def listen(self, client: MagicMock, **kwargs) -> list[dict]:
+        return list(
+            listen_many(
+                client,
+                [ListenTarget("C1")],
+                interval=0.01,
+                requests_per_minute=60000,
+                with_replies=True,
+                **kwargs,
+            )
+        )
+
+    def test_polls_only_threads_with_new_replies(self):
+        client = MagicMock()
+        active, reply = self.active, self.reply
+        posted = {"ts": make_ts(50), "text": "new"}
+        broadcast = {
+            "ts": make_ts(40),
+            "thread_ts": active["ts"],
+            "subtype": "thread_broadcast",
+        }
+        client.conversations_history.side_effect = lambda **kwargs: page(
+            [posted, active, self.quiet]
+        )
+        client.conversations_replies.side_effect = lambda **kwargs: page(
+            [dict(active), dict(broadcast), dict(reply)]
+        )
+        positions: dict[ListenTarget, str] = {}
+
+        messages = self.listen(
+            client, timeout=0.1, continuous=True, positions=positions
+        )
+
+        self.assertEqual([m["ts"] for m in messages], [posted["ts"], reply["ts"]])
+        thread = ListenTarget("C1", active["ts"])
+        client.conversations_replies.assert_called_once()
+        self.assertEqual(
+            client.conversations_replies.call_args.kwargs["ts"], active["ts"]
+        )
+        self.assertEqual(positions[thread], reply["ts"])
+        # Only the first poll scans the reply window; the others start from
+        # the channel's position.
+        window = Decimal(make_ts(-86000))
+        oldest = [
+            Decimal(c.kwargs["oldest"])
+            for c in client.conversations_history.call_args_list
+        ]
+        self.assertGreater(len(oldest), 2)
+        self.assertEqual(sum(ts < window for ts in oldest), 1)
+
+    def test_without_continuous_new_message_on_a_paged_window(self):
+        client = MagicMock()
+        posted = {"ts": make_ts(50), "text": "new"}
+        older = {"ts": make_ts(-1100)}
+        client.conversations_history.side_effect = paged_history(
+            [posted, self.active, self.quiet, older]
+        )
+
+        messages = self.listen(client, timeout=1.0)
+
+        self.assertEqual([m["ts"] for m in messages], [posted["ts"]])
+        client.conversations_replies.assert_not_called()
+
+    def test_without_continuous_reply_in_a_quiet_channel(self):
+        client = MagicMock()
+        client.conversations_history.side_effect = paged_history(
+            [self.active, self.quiet, {"ts": make_ts(-1100)}]
+        )
+        client.conversations_replies.side_effect = lambda **kwargs: page(
+            [dict(self.active), dict(self.reply)]
+        )
+
+        messages = self.listen(client, timeout=1.0)
+
+        self.assertEqual([m["ts"] for m in messages], [self.reply["ts"]])
+
+    def test_threads_older_than_the_reply_window_are_forgotten(self):
+        client = MagicMock()
+        client.conversations_history.side_effect = lambda **kwargs: page(
+            [self.active, self.quiet]
+        )
+        client.conversations_replies.side_effect = lambda **kwargs: page(
+            [dict(self.active), dict(self.reply)]
+        )
+        old = ListenTarget("C1", make_ts(-90000))
+        recent = ListenTarget("C1", self.quiet["ts"])
+        elsewhere = ListenTarget("C2", make_ts(-90000))
+        positions = {
+            old: make_ts(-89000),
+            recent: self.quiet["latest_reply"],
+            elsewhere: make_ts(-89000),
+        }
+
+        self.listen(
+            client,
+            timeout=0.1,
+            continuous=True,
+            positions=positions,
+            reply_window=86400,
+        )
+
+        self.assertNotIn(old, positions)
+        self.assertIn(recent, positions)
+        self.assertIn(elsewhere, positions)
+        self.assertIn(ListenTarget("C1", self.active["ts"]), positions)
+
+
+class TestCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+        with Session(self.engine) as session:
+            add_context(
+                session,
+                name="test-ctx",
+                access_token="fake-token",
+                user_id="U000000001",
+                workspace_id="T000000001",
+                app_type="clacks",
+            )
+            set_current_context(session, "test-ctx")
+            session.commit()
+        self.client = MagicMock()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_save_and_load_only_move_forward(self):
+        channel, thread = ListenTarget("C1"), ListenTarget("C1", "100.000001")
+        with Session(self.engine) as session:
+            save_checkpoints(
+                session, "test-ctx", "ops", {channel: "200.000000", thread: "150.0"}
+            )
+            save_checkpoints(session, "test-ctx", "ops", {channel: "199.000000"})
+            save_checkpoints(session, "test-ctx", "other", {channel: "300.000000"})
+            session.commit()
+
+            self.assertEqual(
+                load_checkpoints(session, "test-ctx", "ops", [channel, thread]),
+                {channel: "200.000000", thread: "150.0"},
+            )
+            self.assertEqual(
+                load_checkpoints(session, "test-ctx", "ops", [thread]),
+                {thread: "150.0"},
+            )
+
+    def test_load_with_replies_includes_threads_of_channels(self):
+        channel, thread = ListenTarget("C1"), ListenTarget("C1", "100.000001")
+        elsewhere = ListenTarget("C2", "100.000002")
+        with Session(self.engine) as session:
+            save_checkpoints(
+                session,
+                "test-ctx",
+                "ops",
+                {channel: "200.0", thread: "150.0", elsewhere: "160.0"},
+            )
+            session.commit()
+
+            self.assertEqual(
+                load_checkpoints(session, "test-ctx", "ops", [channel]),
+                {channel: "200.0"},
+            )
+            self.assertEqual(
+                load_checkpoints(session, "test-ctx", "ops", [channel], True),
+                {channel: "200.0", thread: "150.0"},
+            )
+            # Threads whose parent is older than the reply window are left out
+            self.assertEqual(
+                load_checkpoints(
+                    session, "test-ctx", "ops", [channel], True, "100.000002"
+                ),
+                {channel: "200.0"},
+            )
+
+    def test_delete_old_thread_checkpoints(self):
+        channel = ListenTarget("C1")
+        old, recent = ListenTarget("C1", "100.000001"), ListenTarget("C1", "300.0")
+        followed = ListenTarget("C1", "100.000003")
+        elsewhere = ListenTarget("C2", "100.000004")
+        positions = {
+            target: "400.0" for target in (channel, old, recent, followed, elsewhere)
+        }
+        with Session(self.engine) as session:
+            save_checkpoints(session, "test-ctx", "ops", positions)
+            save_checkpoints(session, "test-ctx", "other", {old: "400.0"})
+
+            deleted = delete_old_thread_checkpoints(
+                session, "test-ctx", "ops", [channel, followed], "200.0"
+            )
+            session.commit()
+
+            self.assertEqual(deleted, 1)
+            every = [channel, old, recent, followed, elsewhere]
+            self.assertEqual(
+                set(load_checkpoints(session, "test-ctx", "ops", every)),
+                {channel, recent, followed, elsewhere},
+            )
+            self.assertEqual(
+                load_checkpoints(session, "test-ctx", "other", [old]), {old: "400.0"}
+            )
+
+    def listen(self, *argv: str) -> list[dict]:
+        outfile = io.StringIO()
+        args = generate_listen_parser().parse_args(
+            ["C0123456789", "--checkpoint", "ops", "--continuous", *argv]
+        )
+        args.outfile = outfile
+        with (
+            patch("slack_clacks.listen.cli.ensure_db_updated"),
+            patch(
+                "slack_clacks.listen.cli.get_session",
+                side_effect=lambda _: Session(self.engine),
+            ),
+            patch("slack_clacks.listen.cli.create_client", return_value=self.client),
+            contextlib.redirect_stderr(io.StringIO()),
+        ):
+            handle_listen(args)
+        return [json.loads(line) for line in outfile.getvalue().splitlines()]
+
+    def test_restart_catches_up_without_gaps_or_duplicates(self):
+        target = [ListenTarget("C0123456789")]
+        self.client.conversations_history.return_value = page([])
+        self.listen("--timeout", "0.05", "--interval", "0.01")
+        with Session(self.engine) as session:
+            start = load_checkpoints(session, "test-ctx", "ops", target)[target[0]]
+
+        # Posted while down: more than one page
+        posted = [str(Decimal(start) + i) for i in range(1, 4)]
+        self.client.conversations_history.reset_mock()
+        self.client.conversations_history.side_effect = [
+            page(
+                [{"ts": posted[2], "text": "c"}, {"ts": posted[1], "text": "b"}], "p2"
+            ),
+            page([{"ts": posted[0], "text": "a", "bot_id": "B1"}]),
+        ] + [page([])] * 100
+        messages = self.listen("--timeout", "0.05", "--interval", "0.01")
+
+        # The bot message is filtered out but still checkpointed
+        self.assertEqual([m["text"] for m in messages], ["b", "c"])
+        first = self.client.conversations_history.call_args_list[0]
+        self.assertGreater(Decimal(first.kwargs["oldest"]), Decimal(start))
+        with Session(self.engine) as session:
+            saved = load_checkpoints(session, "test-ctx", "ops", target)
+        self.assertEqual(saved, {target[0]: posted[2]})
+
+        # A second restart has nothing left to deliver
+        self.client.conversations_history.side_effect = None
+        self.client.conversations_history.return_value = page([])
+        self.assertEqual(self.listen("--timeout", "0.05", "--interval", "0.01"), [])
+
+    def test_restart_with_replies_forgets_threads_out_of_the_window(self):
+        channel = ListenTarget("C0123456789")
+        old = ListenTarget(channel.channel_id, make_ts(-90000))
+        recent = ListenTarget(channel.channel_id, make_ts(-1000))
+        with Session(self.engine) as session:
+            save_checkpoints(
+                session,
+                "test-ctx",
+                "ops",
+                {channel: make_ts(-10), old: make_ts(-100), recent: make_ts(-100)},
+            )
+            session.commit()
+        self.client.conversations_history.return_value = page([])
+
+        self.listen("--with-replies", "--reply-window", "86400", "--timeout", "0.05")
+
+        with Session(self.engine) as session:
+            rows = session.query(ListenCheckpoint.thread_ts).all()
+        self.assertEqual({thread_ts for (thread_ts,) in rows}, {"", recent.thread_ts})
+
+
+class TestListenDatabaseLock(unittest.TestCase):
+    def test_other_writers_are_not_locked_out_while_listening(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = get_engine(config_dir=tmpdir)
+            with engine.connect() as connection:
+                run_migrations(connection)
+                connection.commit()
+            with Session(engine) as session:
+                add_context(
+                    session,
+                    name="test-ctx",
+                    access_token="fake-token",
+                    user_id="U000000001",
+                    workspace_id="T000000001",
+                    app_type="clacks",
+                )
+                set_current_context(session, "test-ctx")
+                session.commit()
+
+            client = MagicMock()
+            # Resolving the name scans conversations.list, written through to
+            # the channel directory
+            client.conversations_list.return_value = {
+                "channels": [{"id": "C001", "name": "general"}],
+                "response_metadata": {"next_cursor": ""},
+            }
+            writes: list[str] = []
+
+            def history(**kwargs):
+                other = sqlite3.connect(get_db_path(config_dir=tmpdir), timeout=0)
+                try:
+                    other.execute("BEGIN IMMEDIATE")
+                    other.rollback()
+                    writes.append("ok")
+                except sqlite3.OperationalError as e:
+                    writes.append(str(e))
+                finally:
+                    other.close()
+                return {"messages": []}
+
+            client.conversations_history.side_effect = history
+            args = generate_listen_parser().parse_args(
+                ["#general", "--interval", "0.01", "--timeout", "0.05"]
+            )
+            with (
+                patch("slack_clacks.listen.cli.ensure_db_updated"),
+                patch(
+                    "slack_clacks.listen.cli.get_session",
+                    side_effect=lambda _: Session(engine),
+                ),
+                patch("slack_clacks.listen.cli.create_client", return_value=client),
+                contextlib.redirect_stderr(io.StringIO()),
+            ):
+                handle_listen(args)
+            engine.dispose()
+
+        self.assertTrue(writes)
+        self.assertEqual(set(writes), {"ok"})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,23 @@
+import argparse
+import json
+import os
+import tempfile
 import unittest
 from datetime import datetime as real_datetime
 from datetime import timedelta, timezone
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+from slack_sdk.web import SlackResponse
+
+from slack_clacks.messaging.cli import (
+    _resolve_target_channel,
+    _thread_ts_from_arg,
+    generate_read_parser,
+    handle_read,
+)
 from slack_clacks.messaging.operations import (
+    MessageLink,
+    parse_message_link,
     parse_schedule_time,
     parse_timestamp,
     resolve_message_timestamp,
@@ -72,6 +86,140 @@ class TestResolveMessageTimestamp(unittest.TestCase):
         self.assertIn("Invalid timestamp in link", str(ctx.exception))
 
 
+class TestParseMessageLink(unittest.TestCase):
+    def test_channel_message(self):
+        link = "https://workspace.slack.com/archives/C08740LGAE6/p1767795445338939"
+        self.assertEqual(
+            parse_message_link(link),
+            MessageLink(channel_id="C08740LGAE6", ts="1767795445.338939"),
+        )
+
+    def test_thread_reply(self):
+        link = "https://workspace.slack.com/archives/C08740LGAE6/p1767795500000100?thread_ts=1767795445.338939&cid=C08740LGAE6"
+        self.assertEqual(
+            parse_message_link(link),
+            MessageLink(
+                channel_id="C08740LGAE6",
+                ts="1767795500.000100",
+                thread_ts="1767795445.338939",
+            ),
+        )
+
+    def test_dm_link(self):
+        link = "https://workspace.slack.com/archives/D0123ABCD/p1767795445338939"
+        self.assertEqual(parse_message_link(link).channel_id, "D0123ABCD")
+
+    def test_missing_channel(self):
+        with self.assertRaises(ValueError) as ctx:
+            parse_message_link("https://workspace.slack.com/p1767795445338939")
+        self.assertIn("Invalid Slack message link", str(ctx.exception))
+
+    def test_short_timestamp(self):
+        with self.assertRaises(ValueError) as ctx:
+            parse_message_link("https://workspace.slack.com/archives/C123/p12345")
+        self.assertIn("Invalid timestamp in link", str(ctx.exception))
+
+
+class TestLinkTargeting(unittest.TestCase):
+    LINK = MessageLink(channel_id="C08740LGAE6", ts="1767795445.338939")
+
+    @patch("slack_clacks.messaging.cli.resolve_channel_id")
+    def test_link_skips_channel_resolution(self, mock_resolve):
+        args = argparse.Namespace(channel=None, user=None)
+        channel_id = _resolve_target_channel(
+            MagicMock(), args, None, "ctx", link=self.LINK
+        )
+        self.assertEqual(channel_id, "C08740LGAE6")
+        mock_resolve.assert_not_called()
+
+    @patch("slack_clacks.messaging.cli.resolve_channel_id", return_value="C999")
+    def test_channel_other_than_links_is_rejected(self, mock_resolve):
+        args = argparse.Namespace(channel="#general", user=None)
+        with self.assertRaises(ValueError) as ctx:
+            _resolve_target_channel(MagicMock(), args, None, "ctx", link=self.LINK)
+        self.assertIn("C08740LGAE6", str(ctx.exception))
+
+    @patch("slack_clacks.messaging.cli.resolve_channel_id", return_value="C08740LGAE6")
+    def test_channel_matching_link_is_accepted(self, mock_resolve):
+        args = argparse.Namespace(channel="#general", user=None)
+        channel_id = _resolve_target_channel(
+            MagicMock(), args, None, "ctx", link=self.LINK
+        )
+        self.assertEqual(channel_id, "C08740LGAE6")
+
+    @patch("slack_clacks.messaging.cli.open_dm_channel", return_value="D001")
+    @patch("slack_clacks.messaging.cli.resolve_user_id", return_value="U001")
+    def test_dm_other_than_links_is_rejected(self, mock_user, mock_dm):
+        args = argparse.Namespace(channel=None, user="@alice")
+        with self.assertRaises(ValueError):
+            _resolve_target_channel(MagicMock(), args, None, "ctx", link=self.LINK)
+
+    def test_no_target(self):
+        args = argparse.Namespace(channel=None, user=None)
+        with self.assertRaises(ValueError):
+            _resolve_target_channel(MagicMock(), args, None, "ctx")
+
+    def test_thread_ts_from_raw_timestamp(self):
+        self.assertEqual(_thread_ts_from_arg("1767795445.338939"), "1767795445.338939")
+        self.assertIsNone(_thread_ts_from_arg(None))
+
+    def test_thread_ts_from_parent_link(self):
+        link = "https://workspace.slack.com/archives/C08740LGAE6/p1767795445338939"
+        self.assertEqual(_thread_ts_from_arg(link), "1767795445.338939")
+
+    def test_thread_ts_from_reply_link(self):
+        link = "https://workspace.slack.com/archives/C08740LGAE6/p1767795500000100?thread_ts=1767795445.338939"
+        self.assertEqual(_thread_ts_from_arg(link), "1767795445.338939")
+
+
+class TestReadReplyLink(unittest.TestCase):
+    LINK = (
+        "https://workspace.slack.com/archives/C08740LGAE6/p1767795500000100"
+        "?thread_ts=1767795445.338939"
+    )
+
+    def test_reply_link_prints_the_reply(self):
+        client = MagicMock()
+        client.conversations_replies.return_value = SlackResponse(
+            client=client,
+            http_verb="GET",
+            api_url="https://slack.com/api/conversations.replies",
+            req_args={},
+            data={
+                "ok": True,
+                "messages": [
+                    {"ts": "1767795445.338939", "text": "parent"},
+                    {"ts": "1767795500.000100", "text": "reply"},
+                ],
+            },
+            headers={},
+            status_code=200,
+        )
+        context = MagicMock(app_type="clacks")
+        context.name = "test-ctx"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outfile = os.path.join(tmpdir, "out.json")
+            args = generate_read_parser().parse_args(["-m", self.LINK, "-o", outfile])
+            with (
+                patch("slack_clacks.messaging.cli.ensure_db_updated"),
+                patch("slack_clacks.messaging.cli.get_session"),
+                patch(
+                    "slack_clacks.messaging.cli.get_current_context",
+                    return_value=context,
+                ),
+                patch("slack_clacks.messaging.cli.create_client", return_value=client),
+            ):
+                handle_read(args)
+            with open(outfile) as f:
+                output = json.load(f)
+
+        self.assertEqual([m["text"] for m in output["messages"]], ["reply"])
+        kwargs = client.conversations_replies.call_args.kwargs
+        self.assertEqual(kwargs["ts"], "1767795445.338939")
+        self.assertEqual(kwargs["limit"], 2)
+
+
 class TestParseTimestamp(unittest.TestCase):
     # Slack message links (delegates to resolve_message_timestamp)
     def test_slack_link(self):
@@ -1,7 +1,11 @@
 import unittest
+from pathlib import Path
 
-from sqlalchemy import inspect
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
 
+import slack_clacks
 from slack_clacks.configuration.database import get_engine, run_migrations
 
 
@@ -45,6 +49,165 @@ class TestMigrations(unittest.TestCase):
             self.assertEqual(fk["referred_columns"], ["name"])
             self.assertEqual(fk["options"]["ondelete"], "CASCADE")
 
+    def test_channel_directory_migration(self):
+        engine = get_engine(config_dir=":memory:")
+
+        with engine.connect() as connection:
+            run_migrations(connection)
+
+            inspector = inspect(connection)
+
+            table_names = inspector.get_table_names()
+            self.assertIn("channel_directory", table_names)
+            self.assertIn("directory_sync_state", table_names)
+
+            directory_pk = inspector.get_pk_constraint("channel_directory")
+            self.assertEqual(
+                directory_pk["constrained_columns"], ["context", "channel_id"]
+            )
+
+            index_names = {
+                index["name"] for index in inspector.get_indexes("channel_directory")
+            }
+            self.assertIn("ix_channel_directory_context_name", index_names)
+
+    def test_aliases_sync_generation_migration(self):
+        engine = get_engine(config_dir=":memory:")
+
+        with engine.connect() as connection:
+            run_migrations(connection)
+
+            columns = {
+                column["name"]: column
+                for column in inspect(connection).get_columns("aliases")
+            }
+            self.assertIn("sync_generation", columns)
+            self.assertTrue(columns["sync_generation"]["nullable"])
+
+    def test_directory_watermark_migration(self):
+        engine = get_engine(config_dir=":memory:")
+
+        with engine.connect() as connection:
+            run_migrations(connection)
+
+            inspector = inspect(connection)
+            for table, column in (
+                ("user_directory", "updated"),
+                ("channel_directory", "updated"),
+                ("directory_sync_state", "watermark"),
+            ):
+                column_names = {c["name"] for c in inspector.get_columns(table)}
+                self.assertIn(column, column_names)
+
+    def test_directory_profile_columns_migration(self):
+        engine = get_engine(config_dir=":memory:")
+
+        with engine.connect() as connection:
+            run_migrations(connection)
+
+            inspector = inspect(connection)
+            user_columns = {
+                c["name"]: c for c in inspector.get_columns("user_directory")
+            }
+            for column in ("is_deleted", "is_bot", "title", "timezone"):
+                self.assertIn(column, user_columns)
+            self.assertFalse(user_columns["is_deleted"]["nullable"])
+
+            channel_columns = {
+                c["name"] for c in inspector.get_columns("channel_directory")
+            }
+            for column in ("num_members", "topic", "purpose"):
+                self.assertIn(column, channel_columns)
+
+    def test_directory_profile_columns_migration_resets_stamps(self):
+        engine = get_engine(config_dir=":memory:")
+        config = Config()
+        config.set_main_option(
+            "script_location", str(Path(slack_clacks.__file__).parent / "alembic")
+        )
+
+        with engine.connect() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "4f2a8c6d9e1b")
+            connection.execute(text("PRAGMA foreign_keys=OFF"))
+            connection.execute(
+                text(
+                    "INSERT INTO user_directory (context, user_id, name, updated, "
+                    "fetched_at) VALUES ('ctx', 'U1', 'alice', 100, '2026-01-01')"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO channel_directory (context, channel_id, name, "
+                    "channel_type, is_archived, updated, fetched_at) VALUES "
+                    "('ctx', 'C1', 'general', 'public_channel', 0, 100, "
+                    "'2026-01-01')"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO directory_sync_state (context, target_type, "
+                    "watermark) VALUES ('ctx', 'user', 100)"
+                )
+            )
+
+            run_migrations(connection)
+
+            for query in (
+                "SELECT updated FROM user_directory",
+                "SELECT updated FROM channel_directory",
+                "SELECT watermark FROM directory_sync_state",
+            ):
+                self.assertEqual(connection.execute(text(query)).all(), [(None,)])
+
+    def test_github_etags_migration(self):
+        engine = get_engine(config_dir=":memory:")
+
+        with engine.connect() as connection:
+            run_migrations(connection)
+
+            inspector = inspect(connection)
+            self.assertIn("github_etags", inspector.get_table_names())
+            pk = inspector.get_pk_constraint("github_etags")
+            self.assertEqual(pk["constrained_columns"], ["context", "url"])
+
+    def test_listen_checkpoints_migration(self):
+        engine = get_engine(config_dir=":memory:")
+
+        with engine.connect() as connection:
+            run_migrations(connection)
+
+            inspector = inspect(connection)
+            self.assertIn("listen_checkpoints", inspector.get_table_names())
+            pk = inspector.get_pk_constraint("listen_checkpoints")
+            self.assertEqual(
+                pk["constrained_columns"],
+                ["context", "name", "channel_id", "thread_ts"],
+            )
+
+    def test_name_search_migration(self):
+        engine = get_engine(config_dir=":memory:")
+
+        with engine.connect() as connection:
+            run_migrations(connection)
+
+            table_names = inspect(connection).get_table_names()
+            for table in ("aliases", "user_directory", "channel_directory"):
+                self.assertIn(f"{table}_fts", table_names)
+
+            connection.exec_driver_sql(
+                "INSERT INTO contexts (name, access_token, user_id, workspace_id, "
+                "app_type) VALUES ('ctx', 't', 'U1', 'T1', 'clacks')"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO aliases (alias, context, target_type, platform, "
+                "target_id) VALUES ('general', 'ctx', 'channel', 'slack', 'C1')"
+            )
+            matches = connection.exec_driver_sql(
+                "SELECT rowid FROM aliases_fts WHERE aliases_fts MATCH 'ener'"
+            ).all()
+            self.assertEqual(len(matches), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
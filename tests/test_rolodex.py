@@ -1,12 +1,41 @@
+import argparse
+import io
+import json
+import threading
 import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session
 
-from slack_clacks.configuration.database import add_context, get_engine, run_migrations
+from slack_clacks.configuration.database import (
+    add_context,
+    get_engine,
+    get_sqlite_connection,
+    run_migrations,
+    set_current_context,
+)
 from slack_clacks.configuration.models import Context
+from slack_clacks.rolodex.cli import handle_export, handle_import, handle_list
 from slack_clacks.rolodex.models import Alias
-from slack_clacks.rolodex.operations import add_alias, list_aliases
+from slack_clacks.rolodex.operations import (
+    add_alias,
+    decode_alias_cursor,
+    get_alias,
+    import_aliases,
+    iter_aliases,
+    list_aliases,
+    next_alias_cursor,
+    next_sync_generation,
+    resolve_alias,
+    resolve_alias_targets,
+    sync_contexts_from_slack,
+    sync_from_slack,
+    upsert_channel_directory,
+    upsert_synced_aliases,
+    upsert_user_directory,
+)
 
 
 class TestRolodexCascadeDelete(unittest.TestCase):
@@ -147,5 +176,742 @@ class TestRolodexListLimits(unittest.TestCase):
         self.assertEqual(len(aliases), 2)
 
 
+class TestResolveAliases(unittest.TestCase):
+    def setUp(self):
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+
+        with Session(self.engine) as session:
+            add_context(
+                session,
+                name="test-ctx",
+                access_token="fake-token",
+                user_id="U000000001",
+                workspace_id="T000000001",
+                app_type="clacks",
+            )
+            add_alias(session, "alice", "test-ctx", "user", "slack", "U001")
+            add_alias(session, "octocat", "test-ctx", "user", "github", "octocat")
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_resolve_alias_targets_in_one_sqlite3_statement(self):
+        statements: list[str] = []
+        orm_statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            orm_statements.append(statement)
+
+        with Session(self.engine) as session:
+            # Flushed but uncommitted, so only the session's connection sees it
+            add_alias(session, "bob", "test-ctx", "user", "slack", "U002")
+            connection = get_sqlite_connection(session)
+            connection.set_trace_callback(statements.append)
+            event.listen(self.engine, "before_cursor_execute", record)
+            self.assertEqual(
+                resolve_alias_targets(
+                    session,
+                    ["alice", "bob", "carol", "octocat", "alice"],
+                    "test-ctx",
+                    "user",
+                    "slack",
+                ),
+                {"alice": "U001", "bob": "U002"},
+            )
+            event.remove(self.engine, "before_cursor_execute", record)
+            connection.set_trace_callback(None)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(orm_statements, [])
+
+    def test_resolve_alias_checks_platform(self):
+        with Session(self.engine) as session:
+            alice = resolve_alias(session, "alice", "test-ctx", "user")
+            assert alice is not None
+            self.assertEqual(alice.target_id, "U001")
+            self.assertIsNone(resolve_alias(session, "carol", "test-ctx", "user"))
+            self.assertIsNone(
+                resolve_alias(session, "octocat", "test-ctx", "user", "slack")
+            )
+
+
+class CapturedOutput(io.StringIO):
+    """StringIO that keeps its text after the handler closes it."""
+
+    def close(self):
+        self.text = self.getvalue()
+        super().close()
+
+
+class TestRolodexKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+
+        with Session(self.engine) as session:
+            add_context(
+                session,
+                name="test-ctx",
+                access_token="fake-token",
+                user_id="U000000001",
+                workspace_id="T000000001",
+                app_type="clacks",
+            )
+            for index in range(7):
+                add_alias(
+                    session, f"name-{index}", "test-ctx", "user", "slack", f"U{index}"
+                )
+            set_current_context(session, "test-ctx")
+            # Same alias for a user and a channel must not be skipped at a
+            # page boundary.
+            add_alias(session, "name-3", "test-ctx", "channel", "slack", "C3")
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_pages_cover_every_alias_once(self):
+        seen = []
+        cursor = None
+        with Session(self.engine) as session:
+            while True:
+                page = list_aliases(session, "test-ctx", limit=3, cursor=cursor)
+                seen.extend((a.alias, a.target_type) for a in page)
+                cursor = next_alias_cursor(page, 3)
+                if cursor is None:
+                    break
+
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(seen, sorted(seen))
+        self.assertIn(("name-3", "channel"), seen)
+        self.assertIn(("name-3", "user"), seen)
+
+    def test_last_short_page_has_no_cursor(self):
+        with Session(self.engine) as session:
+            page = list_aliases(session, "test-ctx", limit=10)
+        self.assertIsNone(next_alias_cursor(page, 10))
+        self.assertIsNone(next_alias_cursor(page, None))
+
+    def test_invalid_cursor(self):
+        for cursor in ("not-base64!", "bnVsbA==", "WzFd"):
+            with self.assertRaises(ValueError):
+                decode_alias_cursor(cursor)
+
+    def test_iter_aliases_matches_list(self):
+        with Session(self.engine) as session:
+            listed = [
+                (a.alias, a.target_type) for a in list_aliases(session, "test-ctx")
+            ]
+            streamed = [
+                (row.alias, row.target_type)
+                for row in iter_aliases(session, "test-ctx", batch_size=2)
+            ]
+        self.assertEqual(streamed, listed)
+
+    def test_handle_list_ndjson(self):
+        outfile = CapturedOutput()
+        args = argparse.Namespace(
+            config_dir=None,
+            platform=None,
+            target_type="user",
+            target_id=None,
+            limit=None,
+            offset=0,
+            cursor=None,
+            format="ndjson",
+            details=False,
+            outfile=outfile,
+        )
+        with (
+            patch("slack_clacks.rolodex.cli.ensure_db_updated"),
+            patch(
+                "slack_clacks.rolodex.cli.get_session",
+                side_effect=lambda _: Session(self.engine),
+            ),
+        ):
+            handle_list(args)
+
+        lines = [json.loads(line) for line in outfile.text.splitlines()]
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(
+            lines[0],
+            {
+                "alias": "name-0",
+                "platform": "slack",
+                "target_type": "user",
+                "target_id": "U0",
+            },
+        )
+
+    def test_handle_list_details(self):
+        with Session(self.engine) as session:
+            upsert_user_directory(
+                session,
+                "test-ctx",
+                [{"id": "U0", "name": "zero", "profile": {"title": "First"}}],
+            )
+            upsert_channel_directory(
+                session,
+                "test-ctx",
+                [{"id": "C3", "name": "three", "num_members": 3, "is_archived": True}],
+            )
+            session.commit()
+
+        for fmt in ("json", "ndjson"):
+            outfile = CapturedOutput()
+            args = argparse.Namespace(
+                config_dir=None,
+                platform=None,
+                target_type=None,
+                target_id=None,
+                limit=None,
+                offset=0,
+                cursor=None,
+                format=fmt,
+                details=True,
+                outfile=outfile,
+            )
+            with (
+                patch("slack_clacks.rolodex.cli.ensure_db_updated"),
+                patch(
+                    "slack_clacks.rolodex.cli.get_session",
+                    side_effect=lambda _: Session(self.engine),
+                ),
+            ):
+                handle_list(args)
+
+            if fmt == "json":
+                items = json.loads(outfile.text)["aliases"]
+            else:
+                items = [json.loads(line) for line in outfile.text.splitlines()]
+            details = {
+                (item["alias"], item["target_type"]): item["details"] for item in items
+            }
+            self.assertEqual(details[("name-0", "user")]["title"], "First")
+            self.assertFalse(details[("name-0", "user")]["is_deleted"])
+            self.assertEqual(details[("name-3", "channel")]["num_members"], 3)
+            self.assertTrue(details[("name-3", "channel")]["is_archived"])
+            self.assertIsNone(details[("name-1", "user")])
+
+
+class TestRolodexImportExport(unittest.TestCase):
+    def setUp(self):
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+
+        with Session(self.engine) as session:
+            add_context(
+                session,
+                name="test-ctx",
+                access_token="fake-token",
+                user_id="U000000001",
+                workspace_id="T000000001",
+                app_type="clacks",
+            )
+            set_current_context(session, "test-ctx")
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def run_handler(self, handler, **kwargs) -> str:
+        outfile = CapturedOutput()
+        args = argparse.Namespace(config_dir=None, outfile=outfile, **kwargs)
+        with (
+            patch("slack_clacks.rolodex.cli.ensure_db_updated"),
+            patch(
+                "slack_clacks.rolodex.cli.get_session",
+                side_effect=lambda _: self.session_scope(),
+            ),
+        ):
+            handler(args)
+        return outfile.text
+
+    @contextmanager
+    def session_scope(self):
+        with Session(self.engine) as session:
+            yield session
+            session.commit()
+
+    def test_import_in_batches(self):
+        records = [
+            {"alias": f"user-{i}", "target_type": "user", "target_id": f"U{i}"}
+            for i in range(5)
+        ]
+        records.append(
+            {
+                "alias": "dev",
+                "target_type": "channel",
+                "target_id": "C1",
+                "platform": "slack",
+            }
+        )
+        with Session(self.engine) as session:
+            count = import_aliases(session, "test-ctx", records, batch_size=2)
+            session.commit()
+
+        self.assertEqual(count, 6)
+        with Session(self.engine) as session:
+            self.assertEqual(len(list_aliases(session, "test-ctx")), 6)
+            dev = get_alias(session, "dev", "test-ctx", "channel")
+            assert dev is not None
+            self.assertEqual(dev.target_id, "C1")
+
+    def test_import_updates_existing_alias(self):
+        with Session(self.engine) as session:
+            add_alias(session, "alice", "test-ctx", "user", "slack", "U1")
+            import_aliases(
+                session,
+                "test-ctx",
+                [{"alias": "alice", "target_type": "user", "target_id": "U2"}],
+            )
+            session.commit()
+
+        with Session(self.engine) as session:
+            alice = get_alias(session, "alice", "test-ctx", "user")
+            assert alice is not None
+            self.assertEqual(alice.target_id, "U2")
+
+    def test_import_rejects_invalid_record(self):
+        records = [
+            {"alias": "alice", "target_type": "user", "target_id": "U1"},
+            {"alias": "bob", "target_type": "group", "target_id": "G1"},
+        ]
+        with Session(self.engine) as session:
+            with self.assertRaises(ValueError) as ctx:
+                import_aliases(session, "test-ctx", records)
+        self.assertIn("Record 2", str(ctx.exception))
+        self.assertIn("Invalid target_type", str(ctx.exception))
+
+        with Session(self.engine) as session:
+            with self.assertRaises(ValueError) as ctx:
+                import_aliases(session, "test-ctx", [{"alias": "carol"}])
+        self.assertIn("Record 1", str(ctx.exception))
+
+    def test_csv_round_trip(self):
+        with Session(self.engine) as session:
+            add_alias(session, "alice", "test-ctx", "user", "slack", "U1")
+            add_alias(session, "dev", "test-ctx", "channel", "slack", "C1")
+            session.commit()
+
+        exported = self.run_handler(
+            handle_export, platform=None, target_type=None, format="csv"
+        )
+        self.assertEqual(
+            exported.splitlines(),
+            [
+                "alias,platform,target_type,target_id",
+                "alice,slack,user,U1",
+                "dev,slack,channel,C1",
+            ],
+        )
+
+        with Session(self.engine) as session:
+            session.query(Alias).delete()
+            session.commit()
+
+        output = self.run_handler(
+            handle_import, infile=io.StringIO(exported), format="csv"
+        )
+        self.assertEqual(json.loads(output), {"status": "imported", "count": 2})
+        with Session(self.engine) as session:
+            self.assertEqual(len(list_aliases(session, "test-ctx")), 2)
+
+    def test_ndjson_import_and_export(self):
+        infile = io.StringIO(
+            '{"alias": "alice", "target_type": "user", "target_id": "U1"}\n'
+            "\n"
+            '{"alias": "dev", "target_type": "channel", "target_id": "C1"}\n'
+        )
+        self.run_handler(handle_import, infile=infile, format="ndjson")
+
+        exported = self.run_handler(
+            handle_export, platform=None, target_type="channel", format="ndjson"
+        )
+        self.assertEqual(
+            [json.loads(line) for line in exported.splitlines()],
+            [
+                {
+                    "alias": "dev",
+                    "platform": "slack",
+                    "target_type": "channel",
+                    "target_id": "C1",
+                }
+            ],
+        )
+
+    def test_ndjson_import_reports_bad_line(self):
+        with self.assertRaises(ValueError) as ctx:
+            self.run_handler(
+                handle_import, infile=io.StringIO("{not json}\n"), format="ndjson"
+            )
+        self.assertIn("Line 1", str(ctx.exception))
+
+
+class TestSyncFromSlack(unittest.TestCase):
+    def setUp(self):
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+
+        with Session(self.engine) as session:
+            add_context(
+                session,
+                name="test-ctx",
+                access_token="fake-token",
+                user_id="U000000001",
+                workspace_id="T000000001",
+                app_type="clacks",
+            )
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def make_client(self, pages: int, page_size: int) -> MagicMock:
+        def page(index: int, items: list[dict], key: str) -> dict:
+            next_cursor = f"cursor-{index + 1}" if index + 1 < pages else ""
+            return {key: items, "response_metadata": {"next_cursor": next_cursor}}
+
+        client = MagicMock()
+        client.users_list.side_effect = [
+            page(
+                p,
+                [
+                    {"id": f"U{p:03d}{i:05d}", "name": f"user-{p}-{i}"}
+                    for i in range(page_size)
+                ],
+                "members",
+            )
+            for p in range(pages)
+        ]
+        client.conversations_list.side_effect = [
+            page(
+                p,
+                [
+                    {"id": f"C{p:03d}{i:05d}", "name": f"chan-{p}-{i}"}
+                    for i in range(page_size)
+                ],
+                "channels",
+            )
+            for p in range(pages)
+        ]
+        return client
+
+    def test_one_alias_insert_per_page(self):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO aliases"):
+                statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        with Session(self.engine) as session:
+            result = sync_from_slack(session, self.make_client(3, 50), "test-ctx")
+            session.commit()
+
+        self.assertEqual(result["users"], 150)
+        self.assertEqual(result["channels"], 150)
+        self.assertEqual(len(statements), 6)
+        self.assertEqual(
+            set(result["timings"]),
+            {
+                "users_fetch",
+                "users_write",
+                "channels_fetch",
+                "channels_write",
+                "prune",
+                "total",
+            },
+        )
+        with Session(self.engine) as session:
+            self.assertEqual(len(list_aliases(session, "test-ctx")), 300)
+
+    def test_preserves_manual_aliases_and_skips_deleted(self):
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [
+                {"id": "U001", "name": "alice"},
+                {"id": "U002", "name": "bob", "deleted": True},
+            ],
+            "response_metadata": {"next_cursor": ""},
+        }
+        client.conversations_list.return_value = {
+            "channels": [],
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            add_alias(session, "alice", "test-ctx", "user", "slack", "U999")
+            result = sync_from_slack(session, client, "test-ctx")
+            session.commit()
+
+        self.assertEqual(result["users"], 1)
+        with Session(self.engine) as session:
+            alice = get_alias(session, "alice", "test-ctx", "user")
+            assert alice is not None
+            self.assertEqual(alice.target_id, "U999")
+            self.assertIsNone(get_alias(session, "bob", "test-ctx", "user"))
+
+    def run_sync(
+        self, members: list[dict], channels: list[dict], since_last: bool = False
+    ) -> dict:
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": members,
+            "response_metadata": {"next_cursor": ""},
+        }
+        client.conversations_list.return_value = {
+            "channels": channels,
+            "response_metadata": {"next_cursor": ""},
+        }
+        with Session(self.engine) as session:
+            result = sync_from_slack(session, client, "test-ctx", since_last=since_last)
+            session.commit()
+        return result
+
+    def test_second_sync_prunes_stale_aliases(self):
+        first = self.run_sync(
+            [{"id": "U001", "name": "alice"}, {"id": "U002", "name": "bob"}],
+            [{"id": "C001", "name": "general"}, {"id": "C002", "name": "old-name"}],
+        )
+        self.assertEqual((first["added"], first["updated"], first["pruned"]), (4, 0, 0))
+
+        with Session(self.engine) as session:
+            add_alias(session, "boss", "test-ctx", "user", "slack", "U002")
+            session.commit()
+
+        second = self.run_sync(
+            [
+                {"id": "U001", "name": "alice"},
+                {"id": "U002", "name": "bob", "deleted": True},
+            ],
+            [
+                {"id": "C003", "name": "general"},
+                {"id": "C002", "name": "new-name", "is_archived": True},
+            ],
+        )
+        self.assertEqual(
+            (second["added"], second["updated"], second["pruned"]), (0, 1, 2)
+        )
+
+        with Session(self.engine) as session:
+            aliases = {
+                (alias.alias, alias.target_id)
+                for alias in list_aliases(session, "test-ctx")
+            }
+        self.assertEqual(
+            aliases, {("alice", "U001"), ("general", "C003"), ("boss", "U002")}
+        )
+
+    def test_manual_alias_over_synced_alias_is_kept(self):
+        self.run_sync([{"id": "U001", "name": "alice"}], [])
+        with Session(self.engine) as session:
+            add_alias(session, "alice", "test-ctx", "user", "slack", "U999")
+            session.commit()
+
+        result = self.run_sync([], [])
+        self.assertEqual(result["pruned"], 0)
+        with Session(self.engine) as session:
+            alice = get_alias(session, "alice", "test-ctx", "user")
+            assert alice is not None
+            self.assertEqual(alice.target_id, "U999")
+            self.assertIsNone(alice.sync_generation)
+
+    def test_first_sync_adopts_aliases_synced_before_generations(self):
+        # Written by a sync that predates sync generations, so NULL like a
+        # manual alias
+        with Session(self.engine) as session:
+            add_alias(session, "alice", "test-ctx", "user", "slack", "U001")
+            add_alias(session, "bob", "test-ctx", "user", "slack", "U002")
+            add_alias(session, "boss", "test-ctx", "user", "slack", "U002")
+            session.commit()
+
+        first = self.run_sync(
+            [{"id": "U001", "name": "alice"}, {"id": "U002", "name": "bob"}], []
+        )
+        self.assertEqual((first["added"], first["updated"]), (0, 0))
+        second = self.run_sync([{"id": "U001", "name": "alice"}], [])
+
+        self.assertEqual(second["pruned"], 1)
+        with Session(self.engine) as session:
+            aliases = {
+                (alias.alias, alias.target_id)
+                for alias in list_aliases(session, "test-ctx")
+            }
+        self.assertEqual(aliases, {("alice", "U001"), ("boss", "U002")})
+
+    def test_first_slack_sync_adopts_after_another_platforms_sync(self):
+        with Session(self.engine) as session:
+            add_alias(session, "bob", "test-ctx", "user", "slack", "U002")
+            # A GitHub sync took the context's first generation
+            upsert_synced_aliases(
+                session,
+                "test-ctx",
+                "user",
+                "github",
+                [("octocat", "octocat")],
+                next_sync_generation(session, "test-ctx"),
+            )
+            session.commit()
+
+        self.run_sync([{"id": "U002", "name": "bob"}], [])
+        second = self.run_sync([], [])
+
+        self.assertEqual(second["pruned"], 1)
+        with Session(self.engine) as session:
+            self.assertIsNone(get_alias(session, "bob", "test-ctx", "user"))
+            self.assertIsNotNone(get_alias(session, "octocat", "test-ctx", "user"))
+
+    def test_since_last_without_watermark_is_full_sync(self):
+        result = self.run_sync(
+            [{"id": "U001", "name": "alice", "updated": 100}], [], since_last=True
+        )
+        self.assertFalse(result["incremental"])
+        self.assertEqual(result["added"], 1)
+
+    def test_since_last_writes_only_changed_rows(self):
+        members = [
+            {"id": "U001", "name": "alice", "updated": 100},
+            {"id": "U002", "name": "bob", "updated": 100},
+        ]
+        channels = [{"id": "C001", "name": "general", "updated": 5000}]
+        self.run_sync(members, channels)
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith(("INSERT", "UPDATE", "DELETE")):
+                statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        result = self.run_sync(members, channels, since_last=True)
+        event.remove(self.engine, "before_cursor_execute", record)
+
+        self.assertTrue(result["incremental"])
+        self.assertEqual(result["skipped"], 3)
+        self.assertEqual(
+            (result["added"], result["updated"], result["pruned"]), (0, 0, 0)
+        )
+        self.assertTrue(
+            all(s.startswith("INSERT INTO directory_sync_state") for s in statements),
+            statements,
+        )
+
+        result = self.run_sync(
+            [
+                {"id": "U001", "name": "alice", "updated": 100},
+                {"id": "U002", "name": "bob", "updated": 200, "deleted": True},
+                {"id": "U003", "name": "carol", "updated": 150},
+            ],
+            channels,
+            since_last=True,
+        )
+        self.assertEqual(result["skipped"], 2)
+        self.assertEqual((result["added"], result["pruned"]), (1, 1))
+        with Session(self.engine) as session:
+            self.assertEqual(
+                {alias.alias for alias in list_aliases(session, "test-ctx")},
+                {"alice", "carol", "general"},
+            )
+
+    def test_users_and_channels_fetched_concurrently(self):
+        channels_fetched = threading.Event()
+        client = MagicMock()
+
+        def users_list(**kwargs):
+            # Only returns once the channel stream has made its request.
+            self.assertTrue(channels_fetched.wait(timeout=5))
+            return {
+                "members": [{"id": "U001", "name": "alice"}],
+                "response_metadata": {"next_cursor": ""},
+            }
+
+        def conversations_list(**kwargs):
+            channels_fetched.set()
+            return {
+                "channels": [{"id": "C001", "name": "general"}],
+                "response_metadata": {"next_cursor": ""},
+            }
+
+        client.users_list.side_effect = users_list
+        client.conversations_list.side_effect = conversations_list
+        with Session(self.engine) as session:
+            result = sync_from_slack(session, client, "test-ctx")
+            session.commit()
+        self.assertEqual((result["users"], result["channels"]), (1, 1))
+
+    def test_fetch_error_is_raised(self):
+        from slack_sdk.errors import SlackApiError
+
+        client = self.make_client(1, 1)
+        client.conversations_list.side_effect = SlackApiError("boom", MagicMock())
+        with Session(self.engine) as session:
+            with self.assertRaises(SlackApiError):
+                sync_from_slack(session, client, "test-ctx")
+
+
+class TestSyncContextsFromSlack(unittest.TestCase):
+    def setUp(self):
+        self.engine = get_engine(config_dir=":memory:")
+        with self.engine.connect() as connection:
+            run_migrations(connection)
+
+        with Session(self.engine) as session:
+            for name in ("ctx-a", "ctx-b", "ctx-c"):
+                add_context(
+                    session,
+                    name=name,
+                    access_token=f"fake-token-{name}",
+                    user_id="U000000001",
+                    workspace_id=f"T-{name}",
+                    app_type="clacks",
+                )
+            session.commit()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def make_client(self, user_name: str, channel_name: str) -> MagicMock:
+        client = MagicMock()
+        client.users_list.return_value = {
+            "members": [{"id": "U001", "name": user_name}],
+            "response_metadata": {"next_cursor": ""},
+        }
+        client.conversations_list.return_value = {
+            "channels": [{"id": "C001", "name": channel_name}],
+            "response_metadata": {"next_cursor": ""},
+        }
+        return client
+
+    def test_syncs_each_context_separately(self):
+        from slack_sdk.errors import SlackApiError
+
+        failing = self.make_client("carol", "random")
+        failing.users_list.side_effect = SlackApiError("invalid_auth", MagicMock())
+        clients = {
+            "ctx-a": self.make_client("alice", "general"),
+            "ctx-b": self.make_client("bob", "dev"),
+            "ctx-c": failing,
+        }
+        with Session(self.engine) as session:
+            results = sync_contexts_from_slack(session, clients)
+            session.commit()
+
+        self.assertEqual(results["ctx-a"]["added"], 2)
+        self.assertEqual(results["ctx-b"]["added"], 2)
+        self.assertIn("invalid_auth", results["ctx-c"]["error"])
+        with Session(self.engine) as session:
+            self.assertEqual(
+                {a.alias for a in list_aliases(session, "ctx-a")}, {"alice", "general"}
+            )
+            self.assertEqual(
+                {a.alias for a in list_aliases(session, "ctx-b")}, {"bob", "dev"}
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,307 @@
+import base64
+import hashlib
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from slack_clacks.listen.operations import ListenTarget, event_target
+from slack_clacks.listen.socket_mode import listen_socket_mode
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class FakeSocketMode(socketserver.ThreadingTCPServer):
+    """
+    Local stand-in for Slack's Socket Mode websocket. Accepts one client at
+    a time, records the envelope IDs it acknowledges, and pushes events or a
+    close frame on demand.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeSocketModeHandler)
+        self.connected = threading.Event()
+        self.connection: socket.socket | None = None
+        self.acks: list[str] = []
+        self.envelopes = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.server_address[1]}/link?ticket=test"
+
+    def send_frame(self, opcode: int, payload: bytes) -> None:
+        assert self.connection is not None
+        header = bytes([0x80 | opcode])
+        if len(payload) < 126:
+            header += bytes([len(payload)])
+        else:
+            header += bytes([126]) + struct.pack("!H", len(payload))
+        self.connection.sendall(header + payload)
+
+    def push_message(self, channel: str, ts: str, **fields: Any) -> None:
+        """Push a message event in an events_api envelope."""
+        self.envelopes += 1
+        event = {"type": "message", "channel": channel, "ts": ts, **fields}
+        envelope = {
+            "envelope_id": f"env-{self.envelopes}",
+            "type": "events_api",
+            "accepts_response_payload": False,
+            "payload": {"type": "event_callback", "event": event},
+        }
+        self.send_frame(0x1, json.dumps(envelope).encode())
+
+    def drop(self) -> None:
+        """Close the connection as Slack does, with a close frame."""
+        self.send_frame(0x8, struct.pack("!H", 1001) + b"going away")
+        assert self.connection is not None
+        self.connection.close()
+
+
+class FakeSocketModeHandler(socketserver.BaseRequestHandler):
+    server: FakeSocketMode
+
+    def handle(self) -> None:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = self.request.recv(1024)
+            if not chunk:
+                return
+            request += chunk
+        headers = dict(
+            line.split(": ", 1)
+            for line in request.decode().split("\r\n")[1:]
+            if ": " in line
+        )
+        accept = base64.b64encode(
+            hashlib.sha1(
+                (headers["Sec-WebSocket-Key"] + WEBSOCKET_GUID).encode()
+            ).digest()
+        ).decode()
+        self.request.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+        self.server.connection = self.request
+        self.server.connected.set()
+        try:
+            while frame := self.read_frame():
+                opcode, payload = frame
+                if opcode == 0x1:
+                    self.server.acks.append(json.loads(payload)["envelope_id"])
+        except OSError:
+            pass
+
+    def read_frame(self) -> tuple[int, bytes] | None:
+        """Read one masked client frame, or None at end of stream."""
+        head = self.recv_exactly(2)
+        if head is None:
+            return None
+        opcode, length = head[0] & 0x0F, head[1] & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self.recv_exactly(2) or b"\0\0")
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self.recv_exactly(8) or bytes(8))
+        mask = self.recv_exactly(4) or bytes(4)
+        data = self.recv_exactly(length) if length else b""
+        if data is None:
+            return None
+        return opcode, bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+    def recv_exactly(self, size: int) -> bytes | None:
+        data = b""
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+
+def make_ts(offset: float = 0) -> str:
+    return f"{time.time() + offset:.6f}"
+
+
+class TestListenSocketMode(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSocketMode()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.client = MagicMock()
+        self.client.ssl = None
+        self.client.apps_connections_open.return_value = {"url": self.server.url}
+        self.client.conversations_history.return_value = {"messages": []}
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def listen(self, targets: list[ListenTarget], **kwargs: Any):
+        """Run listen_socket_mode in a thread, collecting messages."""
+        messages: list[dict] = []
+        status: dict[str, Any] = {}
+        options = {"interval": 0.01, "continuous": True, **kwargs}
+
+        def run() -> None:
+            messages.extend(
+                listen_socket_mode(
+                    self.client, "xapp-test", targets, status=status, **options
+                )
+            )
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.assertTrue(self.server.connected.wait(5))
+        return thread, messages, status
+
+    def test_pushed_messages_match_polling_shape_and_are_acked(self):
+        thread, messages, status = self.listen([ListenTarget("C1")], timeout=1.0)
+        self.server.push_message(
+            "C1", make_ts(), user="U1", text="hi", channel_type="channel"
+        )
+        self.server.push_message("C2", make_ts(), user="U1", text="elsewhere")
+        thread.join(5)
+
+        self.assertEqual(len(messages), 1)
+        message = messages[0]
+        self.assertEqual(message["text"], "hi")
+        self.assertEqual(message["channel_id"], "C1")
+        self.assertIn("received_at", message)
+        for field in ("channel", "channel_type", "event_ts"):
+            self.assertNotIn(field, message)
+        self.assertEqual(self.server.acks, ["env-1", "env-2"])
+        self.assertEqual(status["backend"], "socket")
+        self.client.conversations_history.assert_not_called()
+
+    def test_exits_after_first_message_unless_continuous(self):
+        thread, messages, _ = self.listen(
+            [ListenTarget("C1")], timeout=5.0, continuous=False
+        )
+        self.server.push_message("C1", make_ts(), text="first")
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([m["text"] for m in messages], ["first"])
+
+    def test_catches_up_from_since_then_skips_repeated_events(self):
+        since = make_ts(-10)
+        missed_ts = make_ts(-5)
+        self.client.conversations_history.return_value = {
+            "messages": [{"ts": missed_ts, "text": "missed"}]
+        }
+        positions: dict[ListenTarget, str] = {}
+        thread, messages, _ = self.listen(
+            [ListenTarget("C1")],
+            timeout=1.0,
+            since={ListenTarget("C1"): since},
+            positions=positions,
+        )
+        self.server.push_message("C1", missed_ts, text="missed")
+        self.server.push_message("C1", make_ts(), text="live")
+        thread.join(5)
+
+        self.assertEqual([m["text"] for m in messages], ["missed", "live"])
+        self.assertEqual(positions[ListenTarget("C1")], messages[-1]["ts"])
+
+    def test_out_of_order_events_are_yielded_and_repeats_skipped(self):
+        positions: dict[ListenTarget, str] = {}
+        thread, messages, _ = self.listen(
+            [ListenTarget("C1")], timeout=1.0, positions=positions
+        )
+        earlier_ts, later_ts = make_ts(), make_ts(1)
+        self.server.push_message("C1", later_ts, text="later")
+        self.server.push_message("C1", earlier_ts, text="earlier")
+        self.server.push_message("C1", later_ts, text="later")
+        thread.join(5)
+
+        self.assertEqual(sorted(m["text"] for m in messages), ["earlier", "later"])
+        self.assertEqual(positions[ListenTarget("C1")], later_ts)
+
+    @patch("slack_clacks.listen.socket_mode.SEEN_MESSAGE_LIMIT", 1)
+    def test_only_the_most_recent_messages_are_remembered(self):
+        thread, messages, _ = self.listen([ListenTarget("C1")], timeout=1.0)
+        first_ts, second_ts = make_ts(), make_ts(1)
+        # Spaced out, as the client's listener threads may reorder events
+        for ts, text in [
+            (first_ts, "first"),
+            (second_ts, "second"),
+            (second_ts, "second"),
+            (first_ts, "first"),
+        ]:
+            self.server.push_message("C1", ts, text=text)
+            time.sleep(0.1)
+        thread.join(5)
+
+        self.assertEqual([m["text"] for m in messages], ["first", "second", "first"])
+
+    def test_falls_back_to_polling_on_disconnect(self):
+        thread, messages, status = self.listen([ListenTarget("C1")], timeout=1.0)
+        pushed_ts = make_ts()
+        missed_ts = make_ts(1)
+        self.client.conversations_history.return_value = {
+            "messages": [{"ts": missed_ts, "text": "while disconnected"}]
+        }
+        self.server.push_message("C1", pushed_ts, text="pushed")
+        time.sleep(0.2)
+        self.server.drop()
+        thread.join(5)
+
+        self.assertEqual(
+            [m["text"] for m in messages], ["pushed", "while disconnected"]
+        )
+        self.assertEqual(status["backend"], "poll")
+        self.assertEqual(status["fallback_reason"], "disconnected")
+        # Polling resumes after the last pushed message
+        oldest = self.client.conversations_history.call_args_list[0].kwargs["oldest"]
+        self.assertGreater(float(oldest), float(pushed_ts))
+
+    def test_falls_back_to_polling_when_connection_fails(self):
+        self.client.apps_connections_open.return_value = {
+            "url": "ws://127.0.0.1:1/unreachable"
+        }
+        self.client.conversations_history.return_value = {
+            "messages": [{"ts": make_ts(1), "text": "polled"}]
+        }
+        status: dict[str, Any] = {}
+
+        messages = list(
+            listen_socket_mode(
+                self.client,
+                "xapp-test",
+                [ListenTarget("C1")],
+                interval=0.01,
+                timeout=5.0,
+                status=status,
+            )
+        )
+
+        self.assertEqual(status["backend"], "poll")
+        self.assertEqual([m["text"] for m in messages], ["polled"])
+
+
+class TestEventTarget(unittest.TestCase):
+    def test_replies_go_to_their_thread_and_broadcasts_to_the_channel(self):
+        channel, thread = ListenTarget("C1"), ListenTarget("C1", "1.000000")
+        targets = {channel, thread}
+        reply = {"channel": "C1", "ts": "2.000000", "thread_ts": "1.000000"}
+        broadcast = {**reply, "subtype": "thread_broadcast"}
+        parent = {"channel": "C1", "ts": "1.000000", "thread_ts": "1.000000"}
+
+        self.assertEqual(event_target(reply, targets), thread)
+        self.assertIsNone(event_target(reply, {channel}))
+        self.assertEqual(event_target(broadcast, {channel}), channel)
+        self.assertEqual(event_target(parent, targets), channel)
+        self.assertIsNone(event_target({"channel": "C9", "ts": "3.0"}, targets))
+
+
+if __name__ == "__main__":
+    unittest.main()